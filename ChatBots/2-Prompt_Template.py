@@ -1,22 +1,13 @@
-import os
-from dotenv import load_dotenv
+import sys
+from pathlib import Path
+# Make the shared learning_ai package importable when running this file directly
+sys.path.append(str(Path(__file__).resolve().parents[1]))
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import HumanMessage
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.messages import AIMessage
-from langchain_groq import ChatGroq
 from langchain_core.runnables.history import RunnableWithMessageHistory
 from langchain_community.chat_message_histories import ChatMessageHistory
 from langchain_core.chat_history import BaseChatMessageHistory
-
-# Load environment variables from a .env file
-load_dotenv()  # Loading all the environment variables
-
-# Set the GROQ API key from environment variables
-os.environ["GROQ_API_KEY"] = os.getenv("GROQ_API_KEY")
-
-# Initialize the ChatGroq model with a specified model
-model = ChatGroq(model="Gemma2-9b-It")
+from learning_ai.llm_clients import get_chat_model
 
 # Dictionary to store chat session histories
 store = {}
@@ -35,24 +26,33 @@ prompt = ChatPromptTemplate.from_messages(
     ]
 )
 
-# Create a chain by combining the prompt and the model
-Chain = prompt | model
 
-# Create a runnable with message history using the chain and session history function
-with_message_history = RunnableWithMessageHistory(Chain, get_session_history , input_messages_key="messages", output_messages_key="response")
+def main():
+    # Initialize the shared, rate-limited Groq model (loads GROQ_API_KEY from .env)
+    model = get_chat_model("groq", "Gemma2-9b-It")
 
-# Configuration for a session with a specific session ID
-config = {"configurable": {"session_id": "chat4"}}
+    # Create a chain by combining the prompt and the model
+    Chain = prompt | model
+
+    # Create a runnable with message history using the chain and session history function
+    with_message_history = RunnableWithMessageHistory(Chain, get_session_history , input_messages_key="messages", output_messages_key="response")
+
+    # Configuration for a session with a specific session ID
+    config = {"configurable": {"session_id": "chat4"}}
+
+    # Invoke the model with a message and session configuration
+    print("Invoking model with a message in English...")
+    rresponse = with_message_history.invoke(
+        {"messages": [HumanMessage(content="Hi, my name is Neel and I am a Chief AI Engineer")], "language": "English"},
+        config=config
+    )
+    print(rresponse.content)
+
+    # Invoke the model with a message in a different language
+    print("Invoking model with a message in Hindi...")
+    rresponse = Chain.invoke({"messages": [HumanMessage(content="Hi, my name is Neel")], "language": "Hindi"})
+    print(rresponse.content)
 
-# Invoke the model with a message and session configuration
-print("Invoking model with a message in English...")
-rresponse = with_message_history.invoke(
-    {"messages": [HumanMessage(content="Hi, my name is Neel and I am a Chief AI Engineer")], "language": "English"},
-    config=config
-)
-print(rresponse.content)
 
-# Invoke the model with a message in a different language
-print("Invoking model with a message in Hindi...")
-rresponse = Chain.invoke({"messages": [HumanMessage(content="Hi, my name is Neel")], "language": "Hindi"})
-print(rresponse.content)
+if __name__ == "__main__":
+    main()
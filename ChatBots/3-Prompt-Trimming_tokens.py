@@ -1,37 +1,12 @@
-import os
-from dotenv import load_dotenv
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.messages import HumanMessage
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.messages import AIMessage
-from langchain_groq import ChatGroq
-from langchain_core.runnables.history import RunnableWithMessageHistory, RunnablePassthrough
-from langchain_community.chat_message_histories import ChatMessageHistory
-from langchain_core.chat_history import BaseChatMessageHistory
-from langchain_core.messages import SystemMessage, trim_messages
+import sys
+from pathlib import Path
+# Make the shared learning_ai package importable when running this file directly
+sys.path.append(str(Path(__file__).resolve().parents[1]))
 from operator import itemgetter
-
-# Load environment variables from a .env file
-load_dotenv()  # Loading all the environment variables
-
-# Set the GROQ API key from environment variables
-os.environ["GROQ_API_KEY"] = os.getenv("GROQ_API_KEY")
-
-# Initialize the ChatGroq model with a specified model
-model = ChatGroq(model="Gemma2-9b-It")
-
-# Dictionary to store chat session histories
-store = {}
-
-# Initialize a message trimmer to manage message length
-trimmer = trim_messages(
-    max_tokens=60,  # Maximum number of tokens allowed
-    strategy="last",  # Strategy to trim messages, keeping the last messages
-    token_counter=model,  # Model used to count tokens
-    include_system=True,  # Include system messages in trimming
-    allow_partial=False,  # Do not allow partial messages
-    start_on="human"  # Start trimming on human messages
-)
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, trim_messages
+from langchain_core.runnables import RunnablePassthrough
+from learning_ai.llm_clients import get_chat_model
 
 # Define a chat prompt template with a system message and a placeholder for messages
 prompt = ChatPromptTemplate.from_messages(
@@ -59,14 +34,33 @@ messages = [
     AIMessage(content="yes!"),
 ]
 
-# Trim the messages to fit within the token limit
-trimmer.invoke(messages)
 
-# Create a chain to process messages through the prompt and model
-chain = (RunnablePassthrough.assign(messages=itemgetter("messages")) | prompt | model)
+def main():
+    # Initialize the shared, rate-limited Groq model (loads GROQ_API_KEY from .env)
+    model = get_chat_model("groq", "Gemma2-9b-It")
+
+    # Initialize a message trimmer to manage message length
+    trimmer = trim_messages(
+        max_tokens=60,  # Maximum number of tokens allowed
+        strategy="last",  # Strategy to trim messages, keeping the last messages
+        token_counter=model,  # Model used to count tokens
+        include_system=True,  # Include system messages in trimming
+        allow_partial=False,  # Do not allow partial messages
+        start_on="human"  # Start trimming on human messages
+    )
+
+    # Trim the messages to fit within the token limit
+    trimmer.invoke(messages)
+
+    # Create a chain to process messages through the prompt and model
+    chain = (RunnablePassthrough.assign(messages=itemgetter("messages")) | prompt | model)
+
+    # Invoke the chain with additional messages and language specification
+    response = chain.invoke({"messages": messages + [HumanMessage(content="whats icecream i like?")], "language": "English"})
+
+    # Print the response content
+    print(response.content)
 
-# Invoke the chain with additional messages and language specification
-response = chain.invoke({"messages": messages + [HumanMessage(content="whats icecream i like?")], "language": "English"})
 
-# Print the response content
-print(response.content)
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,58 @@
 
-import os
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
+import sys
+import time
 from pprint import pprint
-# Load environment variables
-load_dotenv()
-
-# Set environment variables
-os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
-os.environ["LANGCHAIN_API_KEY"] = os.getenv("LANGCHAIN_API_KEY")
-os.environ["LANGCHAIN_TRACING_V2"] = "true"
-os.environ["LANGCHAIN_PROJECT"] = os.getenv("LANGCHAIN_PROJECT")
-
-# Initialize the ChatOpenAI model
-llm = ChatOpenAI(model="gpt-4")
-
-# Create JSON output parser
-output_parser = JsonOutputParser()
-
-# Create a chat prompt template with JSON formatting instructions
-prompt = ChatPromptTemplate.from_messages([
-    ("system", "You are an expert AI Engineer. Provide response in JSON format.\n{format_instructions}"),
-    ("user", "{input}")
-])
-
-# Create the chain with format instructions
-chain = prompt | llm | output_parser
-
-# Example usage
-response = chain.invoke({
-    "input": "Can you tell me about Best options trading strategy?",
-    "format_instructions": output_parser.get_format_instructions()
-})
-pprint(response)
+from pathlib import Path
+# Make the shared learning_ai package importable when running this file directly
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+# The prompt | llm | JSON parser chain is defined in learning_ai/chains/json_prompt.py
+from learning_ai.chains.json_prompt import build_json_chain
+from learning_ai.env import load_env
+from learning_ai.instrumentation import Instrumentation
+
+
+def main():
+    # Load environment variables
+    load_env()
+
+    # Latency / token metrics are recorded locally by a callback handler. Hosted LangSmith
+    # tracing is opt-in: it is only used if LANGCHAIN_TRACING_V2=true is already set
+    metrics = Instrumentation()
+    config = {"callbacks": [metrics]}
+
+    inputs = {"input": "Can you tell me about Best options trading strategy?"}
+
+    if "--stream" in sys.argv:
+        # Streaming mode: the parser consumes each token once and yields the object as
+        # soon as a top-level field is complete, so the first fields can be shown while
+        # the rest is still being generated
+        streaming_chain = build_json_chain(streaming=True)
+
+        start = time.perf_counter()
+        shown = set()
+        response = {}
+        for response in streaming_chain.stream(inputs, config=config):
+            for field in response.keys() - shown:
+                shown.add(field)
+                print(f"[{time.perf_counter() - start:.2f}s] {field}:")
+                pprint(response[field])
+        print(f"Completed {len(shown)} fields in {time.perf_counter() - start:.2f}s")
+    else:
+        # Create the chain with format instructions
+        # temperature=0 makes the call deterministic, so repeated runs of this fixed prompt
+        # are answered from the local response cache (bypass with LLM_CACHE_BYPASS=1)
+        chain = build_json_chain()
+
+        # Example usage
+        response = chain.invoke(inputs, config=config)
+        pprint(response)
+
+    print(metrics.summary())
+    # Write Prometheus text / OTLP spans if METRICS_PROM_FILE / TRACE_SPANS_FILE /
+    # OTEL_EXPORTER_OTLP_ENDPOINT are set
+    metrics.export()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,32 @@
-import os
-from dotenv import load_dotenv
-load_dotenv()
+import sys
+from pathlib import Path
+# Make the shared learning_ai package importable when running this file directly
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from learning_ai.env import load_env
+from learning_ai.instrumentation import Instrumentation
+from learning_ai.llm_clients import get_chat_model
 
-from langchain_openai import ChatOpenAI
-os.environ["OPENAI_API_KEY"]=os.getenv("OPENAI_API_KEY")
 
-## Langsmith Tracking and tracing
+def main():
+    load_env()
 
-os.environ["LANGCHAIN_API_KEY"]=os.getenv("LANGCHAIN_API_KEY")
-os.environ["LANGCHAIN_TRACING_V2"]="true"
-os.environ["LANGCHAIN_PROJECT"]=os.getenv("LANGCHAIN_PROJECT")
+    ## Local tracing: per-call latency, tokens and rate-limiter queue wait are recorded by a
+    ## callback handler and exported as Prometheus text / OpenTelemetry spans.
+    ## Langsmith tracking is opt-in: set LANGCHAIN_TRACING_V2=true (and LANGCHAIN_API_KEY)
+    ## in the environment to also send runs to the hosted service.
+    metrics = Instrumentation()
 
+    # temperature=0 lets repeated runs of the same prompt come from the local response cache
+    llm=get_chat_model("openai", "gpt-3.5-turbo", temperature=0)
+    print(llm)
+    result=llm.invoke("What is agentic AI", config={"callbacks": [metrics]})
+    print(result.content)
 
-llm=ChatOpenAI(model="gpt-3.5-turbo")
-print(llm)
-result=llm.invoke("What is agentic AI")
-print(result.content)
+    print(metrics.summary())
+    # METRICS_PROM_FILE=metrics.prom, TRACE_SPANS_FILE=spans.jsonl or
+    # OTEL_EXPORTER_OTLP_ENDPOINT=http://localhost:4318 choose where the data goes
+    metrics.export()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,63 +1,48 @@
-import os
-from dotenv import load_dotenv
-
-# Load environment variables from a .env file
-load_dotenv()
-
-# Set USER_AGENT environment variable
-# This is used to identify the application making requests , you will set up in LANGCHAIN website when you create an account and get the API keys
-os.environ["USER_AGENT"] = os.getenv("USER_AGENT", "Neel_Learn/1.0.0")
-
-# Set other environment variables
-# These are used for authentication and configuration
-os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
-os.environ["LANGCHAIN_API_KEY"] = os.getenv("LANGCHAIN_API_KEY")
-os.environ["LANGCHAIN_TRACING_V2"] = "true"
-os.environ["LANGCHAIN_PROJECT"] = os.getenv("LANGCHAIN_PROJECT")
-
-# Import remaining dependencies
-from langchain_community.document_loaders import WebBaseLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import FAISS
-from langchain_openai import OpenAIEmbeddings
-from langchain.chains.combine_documents import create_stuff_documents_chain
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-
-# Initialize the language model
-# Using gpt-4o-mini with a temperature of 0 for deterministic responses
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-
-try:
-    # Load and split documents
-    loader = WebBaseLoader("https://cricinfo.com/")
-    documents = loader.load()
-
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-    documents = text_splitter.split_documents(documents)
-    print("Documents loaded and split successfully!")
-    print(f"Number of documents: {len(documents)}")
-
-    # Create embeddings
-    embeddings = OpenAIEmbeddings()
-    
-    # Create vector store
-    vectorstore = FAISS.from_documents(documents, embeddings)
-    print("Vector store created successfully!")
-
-    # Optional: Test a simple query
-    query = "What is the latest cricket news?"
-    docs = vectorstore.similarity_search(query, k=2)
-    print("\nTest Query Results:")
-    for doc in docs:
-        print("\nContent:", doc.page_content[:200], "...") 
-        prompt = ChatPromptTemplate.from_template(
-            "Answer the following question based on the context provided: {context}\n\nQuestion: {question}\nAnswer:"
-        )
-        document_chain = create_stuff_documents_chain(llm, prompt)
+import sys
+from pathlib import Path
+# Make the shared learning_ai package importable when running this file directly
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+# Loading, splitting, embedding and the stuff-documents chain are defined in
+# learning_ai/chains/web_rag.py; nothing is fetched until main() runs
+from learning_ai.chains import web_rag
+
+
+def main():
+    from learning_ai.env import load_env
+    load_env()
+
+    # LangSmith tracing is opt-in, as in 2-LangChain_Tracing.py: set LANGCHAIN_TRACING_V2=true
+    # (with LANGCHAIN_API_KEY and LANGCHAIN_PROJECT) in .env or the environment to send runs
+
+    try:
+        # Load and split documents
+        documents = web_rag.load_documents("https://cricinfo.com/")
+        print("Documents loaded and split successfully!")
+        print(f"Number of documents: {len(documents)}")
+
+        # Create embeddings and vector store
+        vectorstore = web_rag.build_vectorstore(documents)
+        print("Vector store created successfully!")
+
+        # Optional: Test a simple query
+        query = "What is the latest cricket news?"
+        # Retrieve a few extra chunks with their relevance scores; the packer below keeps
+        # the best ones that fit the token budget, merging chunks that overlap
+        scored = vectorstore.similarity_search_with_relevance_scores(query, k=4)
+        from learning_ai.context_packer import ContextPacker
+        docs = ContextPacker(max_tokens=1500).pack(scored)
+        print("\nTest Query Results:")
+        for doc in docs:
+            print("\nContent:", doc.page_content[:200], "...")
+
+        # Using gpt-4o-mini with a temperature of 0 for deterministic responses
+        # Deterministic calls are served from the local response cache on repeat runs
+        document_chain = web_rag.build_document_chain()
         print(document_chain.invoke({"context": docs, "question": query}))
-except Exception as e:
-    print(f"Error occurred: {str(e)}")
-
+    except Exception as e:
+        print(f"Error occurred: {str(e)}")
 
 
+if __name__ == "__main__":
+    main()
@@ -2,56 +2,82 @@
 #PDF loader: https://python.langchain.com/docs/modules/data_connection/document_loaders/pdf
 #Text loader: https://python.langchain.com/docs/modules/data_connection/document_loaders/text
 
-import os
-from dotenv import load_dotenv
 from pprint import pprint
-from langchain_community.document_loaders import TextLoader
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_community.document_loaders import WebBaseLoader 
-from langchain_community.document_loaders import ArxivLoader
-from langchain_community.document_loaders import WikipediaLoader
-
-import bs4 #BeautifulSoup
-#Load the environment variables
-load_dotenv()
-
-print("--------------Text Loader------------------")        
-#Text Loader
-loader=TextLoader('speech.txt') #path to the text file
-text_documents=loader.load()
-text_documents
-pprint(text_documents)
-print("---------------END Text Loader -----------------")
-
-print("--------------PDF Loader------------------")
-#PDF Loader
-loader=PyPDFLoader('syllabus.pdf') #path to the pdf file
-pdf_documents=loader.load()
-pdf_documents
-pprint(pdf_documents)
-print("---------------END PDF Loader -----------------")
-
-print("--------------Web Loader------------------")
-#Web Loader
-loader=WebBaseLoader('https://www.cricinfo.com') #url of the website    
-web_documents=loader.load()
-web_documents
-pprint(web_documents)   
-print("---------------END Web Loader -----------------")
-
-print("--------------Arxiv Loader------------------")
-#Arxiv
-loader = ArxivLoader(query="1706.03762", load_max_docs=2) #query is the arxiv id of the paper
-arxiv_documents=loader.load()
-arxiv_documents
-pprint(arxiv_documents)
-print("---------------END Arxiv Loader -----------------")
-
-print("--------------Wikipedia Loader------------------")
-#Wikipedia
-loader = WikipediaLoader(query="LangChain", load_max_docs=2) #query is the title of the wikipedia page
-wikipedia_documents=loader.load()
-wikipedia_documents
-pprint(wikipedia_documents)
-print("---------------END Wikipedia Loader -----------------")
 
+
+def main():
+    # Loaders are imported here so importing this module stays cheap
+    from dotenv import load_dotenv
+    from langchain_community.document_loaders import TextLoader
+    from langchain_community.document_loaders import PyPDFLoader
+    from langchain_community.document_loaders import WebBaseLoader
+    from langchain_community.document_loaders import ArxivLoader
+    from langchain_community.document_loaders import WikipediaLoader
+
+    #Load the environment variables
+    load_dotenv()
+
+    print("--------------Text Loader------------------")        
+    #Text Loader
+    loader=TextLoader('speech.txt') #path to the text file
+    text_documents=loader.load()
+    text_documents
+    pprint(text_documents)
+    print("---------------END Text Loader -----------------")
+
+    print("--------------PDF Loader------------------")
+    #PDF Loader
+    loader=PyPDFLoader('syllabus.pdf') #path to the pdf file
+    pdf_documents=loader.load()
+    pdf_documents
+    pprint(pdf_documents)
+    print("---------------END PDF Loader -----------------")
+
+    print("--------------Web Loader------------------")
+    #Web Loader
+    loader=WebBaseLoader('https://www.cricinfo.com') #url of the website    
+    web_documents=loader.load()
+    web_documents
+    pprint(web_documents)   
+    print("---------------END Web Loader -----------------")
+
+    print("--------------Async crawler------------------")
+    #Many pages at once over pooled connections; run it twice and the second crawl is mostly 304s
+    import sys
+    from pathlib import Path
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+    from learning_ai.web_crawler import AsyncWebCrawler
+    crawler=AsyncWebCrawler(['https://www.cricinfo.com', 'https://www.espncricinfo.com/live-cricket-score'], per_host=4)
+    crawled_documents=crawler.load()
+    print(crawler.stats)
+    print("---------------END Async crawler -----------------")
+
+    print("--------------Near-duplicate chunks------------------")
+    #Web pages repeat navigation and footer text; drop near-duplicate chunks before embedding them
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    from learning_ai.dedupe import NearDuplicateFilter
+    chunks=RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200).split_documents(web_documents)
+    dedupe=NearDuplicateFilter(threshold=0.85)
+    unique_chunks=dedupe.transform_documents(chunks)
+    print(dedupe.stats())
+    print("---------------END Near-duplicate chunks -----------------")
+
+    print("--------------Arxiv Loader------------------")
+    #Arxiv
+    loader = ArxivLoader(query="1706.03762", load_max_docs=2) #query is the arxiv id of the paper
+    arxiv_documents=loader.load()
+    arxiv_documents
+    pprint(arxiv_documents)
+    print("---------------END Arxiv Loader -----------------")
+
+    print("--------------Wikipedia Loader------------------")
+    #Wikipedia
+    loader = WikipediaLoader(query="LangChain", load_max_docs=2) #query is the title of the wikipedia page
+    wikipedia_documents=loader.load()
+    wikipedia_documents
+    pprint(wikipedia_documents)
+    print("---------------END Wikipedia Loader -----------------")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,98 +1,143 @@
-from typing import List
-from typing_extensions import TypedDict
-from langgraph.graph import StateGraph, START, END
-from langchain_core.messages import HumanMessage
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langchain_groq import ChatGroq
+import asyncio
+import json
 import os
-from dotenv import load_dotenv
-from IPython.display import Image, display
-from PIL import Image as PILImage
-import io
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+# Make the shared learning_ai package importable when running this file directly
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from learning_ai.graphs.chatbot import build_chatbot_graph
 
 # Import necessary modules and classes
-# - List and TypedDict for type annotations
-# - StateGraph, START, END for graph building
-# - HumanMessage for message handling
-# - ChatPromptTemplate, StrOutputParser for prompt and output parsing
-# - ChatGroq for the language model
-# - os and dotenv for environment variable management
-# - Image and display for displaying images
-
-load_dotenv()
-
-groq_api_key = os.getenv("GROQ_API_KEY")
-if not groq_api_key:
-    raise ValueError("GROQ_API_KEY environment variable is not set.")
-
-# Retrieve the GROQ API key from environment variables
-# Raise an error if the API key is not set
-
-llm = ChatGroq(
-    model_name="gemma2-9b-it",
-    api_key=groq_api_key,
-    temperature=0.7
-)
-
-# Initialize the language model with specified parameters
-
-class State(TypedDict):
-    messages: List[HumanMessage]
-
-# Define a State class for type annotations
-
-graph_builder = StateGraph(State)
-
-# Initialize a StateGraph with the State type
-
-def chatbot(state: State) -> State:
-    response = llm.invoke(state["messages"])
-    return {"messages": [response]}
-
-# Define the chatbot function that takes a state and returns a new state with the response from the language model
-
-graph_builder.add_node("chatbot", chatbot)
-
-# Add a node to the graph for the chatbot function
-
-graph_builder.add_edge(START, "chatbot")    
-graph_builder.add_edge("chatbot", END)
-
-# Add edges to the graph to define the flow from START to chatbot and from chatbot to END
-
-graph = graph_builder.compile()
-
-# Compile the graph
-
-# Save the graph image to a file named 'chatbot_graph.png'
-graph_image_data = graph.get_graph().draw_mermaid_png()
-image = PILImage.open(io.BytesIO(graph_image_data))
-image.save('chatbot_graph.png')
-
-def stream_graph_updates(user_input: str):
-    for event in graph.stream({"messages": [{"role": "user", "content": user_input}]}):
-        for value in event.values():
-            print("Assistant:", value["messages"][-1].content)
-
-# Define a function to stream graph updates based on user input
-
-while True:
-    try: 
-        user_input = input("User: ")
-        if user_input.lower() in ["exit", "quit", "q"]:
-            print("Exiting...")
+# - build_chatbot_graph for the chatbot graph (defined in learning_ai/graphs/chatbot.py):
+#   a single "chatbot" node whose history is kept per thread_id by a MemorySaver
+#   checkpointer and trimmed to MAX_HISTORY_TOKENS before each model call
+# - asyncio and json for the optional streaming server
+# - time for per-turn latency statistics
+
+@lru_cache(maxsize=None)
+def get_graph():
+    graph = build_chatbot_graph()
+    # Save the graph diagram to 'chatbot_graph.svg' (only with RENDER_GRAPHS=1 or --draw; rendered locally)
+    from learning_ai.graph_render import render_graph
+    render_graph(graph, "chatbot_graph")
+    return graph
+
+# Build (and optionally draw) the graph on first use rather than at import time
+
+class TurnStats:
+    """Time-to-first-token and tokens/sec for one assistant turn."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.first_token_at = None
+        self.end = None
+        self.chunks = 0
+        self.output_tokens = None
+
+    def on_chunk(self, chunk):
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.chunks += 1
+        # Providers that report usage send it on the last chunk; otherwise count chunks
+        if getattr(chunk, "usage_metadata", None):
+            self.output_tokens = chunk.usage_metadata.get("output_tokens")
+
+    def finish(self):
+        self.end = time.perf_counter()
+        return self.summary()
+
+    def summary(self):
+        tokens = self.output_tokens or self.chunks
+        ttft = (self.first_token_at or self.end) - self.start
+        generation_time = self.end - (self.first_token_at or self.end)
+        return {
+            "ttft_s": round(ttft, 3),
+            "tokens": tokens,
+            "tokens_per_s": round(tokens / generation_time, 1) if generation_time > 0 else None,
+            "total_s": round(self.end - self.start, 3),
+        }
+
+# Collect per-turn latency statistics
+
+def stream_graph_updates(user_input: str, thread_id: str = "cli"):
+    config = {"configurable": {"thread_id": thread_id}}
+    stats = TurnStats()
+    print("Assistant: ", end="", flush=True)
+    for chunk, metadata in get_graph().stream(
+        {"messages": [{"role": "user", "content": user_input}]},
+        config,
+        stream_mode="messages",
+    ):
+        if metadata.get("langgraph_node") != "chatbot":
+            continue
+        stats.on_chunk(chunk)
+        print(chunk.content, end="", flush=True)
+    summary = stats.finish()
+    print(f"\n  [ttft {summary['ttft_s']}s, {summary['tokens']} tokens, {summary['tokens_per_s']} tokens/s]")
+
+# Define a function to stream the assistant's reply token by token based on user input
+
+async def handle_chat_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        request_line = await reader.readline()
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            key, _, value = line.decode().partition(":")
+            headers[key.strip().lower()] = value.strip()
+        if not request_line.startswith(b"POST /chat"):
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+            return
+        body = json.loads(await reader.readexactly(int(headers.get("content-length", 0))) or b"{}")
+        config = {"configurable": {"thread_id": body.get("session_id", "default")}}
+
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n\r\n")
+        stats = TurnStats()
+        async for chunk, metadata in get_graph().astream(
+            {"messages": [{"role": "user", "content": body["message"]}]},
+            config,
+            stream_mode="messages",
+        ):
+            if metadata.get("langgraph_node") != "chatbot":
+                continue
+            stats.on_chunk(chunk)
+            writer.write(f"data: {json.dumps({'token': chunk.content})}\n\n".encode())
+            await writer.drain()
+        writer.write(f"data: {json.dumps({'done': True, **stats.finish()})}\n\n".encode())
+    finally:
+        await writer.drain()
+        writer.close()
+
+async def serve(host: str = "127.0.0.1", port: int = 8000):
+    server = await asyncio.start_server(handle_chat_request, host, port)
+    print(f"Streaming chatbot on http://{host}:{port}/chat (POST {{\"message\": ..., \"session_id\": ...}})")
+    async with server:
+        await server.serve_forever()
+
+# Optional async server entry point: POST /chat streams the reply as server-sent events
+# e.g. curl -N -X POST localhost:8000/chat -d '{"message": "hi", "session_id": "abc"}'
+
+def main():
+    if "--serve" in sys.argv:
+        asyncio.run(serve(port=int(os.getenv("CHATBOT_PORT", "8000"))))
+        return
+
+    while True:
+        try:
+            user_input = input("User: ")
+            if user_input.lower() in ["exit", "quit", "q"]:
+                print("Exiting...")
+                break
+            stream_graph_updates(user_input)
+        except KeyboardInterrupt:
+            user_input = "what do you think about langchain"
+            print("User:", user_input)
+            stream_graph_updates(user_input)
             break
-        stream_graph_updates(user_input)    
-    except KeyboardInterrupt:
-        user_input = "what do you think about langchain"
-        print("User:", user_input)
-        stream_graph_updates(user_input)
-        break
 
 # Continuously prompt the user for input and stream updates until the user exits or interrupts
+# Run with --serve to start the streaming HTTP server instead of the REPL
 
-
-
-
-
+if __name__ == "__main__":
+    main()
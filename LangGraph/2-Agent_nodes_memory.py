@@ -17,158 +17,38 @@ The script includes:
 4. Visualization of the agent graph structure
 """
 
-import os
-import tempfile
-from dotenv import load_dotenv
-from IPython.display import Image, display
-
-# Load environment variables for API keys
-load_dotenv()
-
-# Set API keys
-os.environ["GROQ_API_KEY"] = os.getenv("GROQ_API_KEY")
-os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
-
-# Import required libraries
-from langchain_openai import ChatOpenAI
-from typing_extensions import TypedDict
-from typing import Annotated, Dict, List, Any
-from langchain_core.messages import AnyMessage, HumanMessage, SystemMessage
-from langgraph.graph import START, StateGraph
-from langgraph.graph.message import add_messages
-from langgraph.prebuilt import tools_condition, ToolNode
+import sys
+from functools import lru_cache
+from pathlib import Path
+# Make the shared learning_ai package importable when running this file directly
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+# The mathematical tools (add, multiply, divide), the assistant node and the
+# assistant <-> tools graph are defined in learning_ai/graphs/react_math.py
+from learning_ai.graphs.react_math import build_react_graph
+from learning_ai.graph_render import render_graph
+from langchain_core.messages import HumanMessage
 # Instead of using MemorySaver, we'll use a simple dictionary to maintain conversation state
 # from langgraph.saver import MemorySaver
 
-# Define mathematical tools that will be used by the agent
-def multiply(a: int, b: int) -> int:
-    """Multiply a and b.
-
-    Args:
-        a: first int
-        b: second int
-    """
-    return a * b
-
-def add(a: int, b: int) -> int:
-    """Adds a and b.
-
-    Args:
-        a: first int
-        b: second int
-    """
-    return a + b
-
-def divide(a: int, b: int) -> float:
-    """Divide a and b.
-
-    Args:
-        a: first int
-        b: second int
-    """
-    return a / b
-
-# Create a list of tools to be used by the agent
-tools = [add, multiply, divide]
-
-# Initialize the language model with tools
-llm = ChatOpenAI(model="gpt-4o")
-llm_with_tools = llm.bind_tools(tools, parallel_tool_calls=False)
-
-# Define the state structure for our graph
-# This uses TypedDict to enforce the structure of our state
-class MessagesState(TypedDict):
-    """State consisting of messages."""
-    messages: Annotated[list[AnyMessage], add_messages]
-
-# Create the assistant function that processes messages and generates responses
-def assistant(state: MessagesState) -> Dict[str, List[AnyMessage]]:
-    """
-    This function processes the current state (messages) and generates a response
-    using the language model with tools.
-    
-    Args:
-        state: The current state containing messages
-        
-    Returns:
-        A dictionary with updated messages
-    """
-    # Create a system message to instruct the assistant
-    sys_msg = SystemMessage(content="You are a helpful assistant tasked with performing arithmetic on a set of inputs.")
-    
-    # Invoke the LLM with the system message and current conversation history
-    return {"messages": [llm_with_tools.invoke([sys_msg] + state["messages"])]}
-
-# Now we'll build our graph
-def build_graph():
-    """
-    Build the LangGraph for our agent.
-    
-    Returns:
-        A compiled graph that can process messages
-    """
-    # Initialize the state graph with our MessagesState
-    builder = StateGraph(MessagesState)
-    
-    # Define the nodes in our graph
-    builder.add_node("assistant", assistant)  # The LLM that can use tools
-    builder.add_node("tools", ToolNode(tools))  # Node for executing tools
-    
-    # Define the edges that connect our nodes
-    
-    # Start -> Assistant: Start by sending the user's message to the assistant
-    builder.add_edge(START, "assistant")
-    
-    # Assistant -> Next node (conditional):
-    # If assistant calls a tool -> go to tools node
-    # If assistant replies directly -> exit the graph
-    builder.add_conditional_edges(
-        "assistant",
-        tools_condition,
-    )
-    
-    # Tools -> Assistant: After tools execute, send results back to assistant
-    builder.add_edge("tools", "assistant")
-    
-    # Compile the graph
-    react_graph = builder.compile()
-    
-    return react_graph
-
-# Build our agent graph without memory (default implementation)
-react_graph = build_graph()
+# Build our agent graph without memory (default implementation) on first use,
+# so importing this module doesn't create any clients
+@lru_cache(maxsize=None)
+def get_react_graph():
+    """Return the compiled agent graph, building it on the first call."""
+    return build_react_graph()
 
 # Visualize the graph structure
 def print_graph():
     """
-    Generate and display a visualization of the agent graph.
-    Saves the graph image to 'langgraph_agent_diagram.png' in the current directory.
+    Generate a visualization of the agent graph.
+    Saves the diagram to 'langgraph_agent_diagram.svg' in the current directory.
+
+    Rendering is opt-in (RENDER_GRAPHS=1 or --draw) and happens locally, so it
+    needs no network access and is skipped entirely by default.
     """
-    # Generate the graph image
-    graph_image = react_graph.get_graph().draw_mermaid_png()
-    
-    # Save the image to a file in the current directory
-    output_path = "langgraph_agent_diagram.png"
-    try:
-        with open(output_path, "wb") as f:
-            f.write(graph_image)
-        print(f"Graph visualization saved to: {output_path}")
-    except Exception as e:
-        print(f"Error saving graph image: {e}")
-        
-        # Fallback to a temporary file
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-            tmp_path = tmp.name
-            with open(tmp_path, "wb") as f:
-                f.write(graph_image)
-            print(f"Graph visualization saved to temporary file: {tmp_path}")
-    
-    # In environments that support display (like notebooks), show the image
-    try:
-        display(Image(graph_image))
-        print("Graph visualization displayed.")
-    except Exception as e:
-        print(f"Note: Graph image was saved but cannot be displayed in current environment: {e}")
+    if render_graph(get_react_graph(), "langgraph_agent_diagram") is None:
+        print("Graph rendering skipped (set RENDER_GRAPHS=1 or pass --draw to enable).")
 
 # Helper function to print messages in a consistent way
 def print_messages(messages, title=None):
@@ -223,7 +103,7 @@ def run_agent_example():
     messages = [HumanMessage(content="Add 10 and 14. Multiply the output by 2. Divide the output by 5")]
     
     # Process the message through our agent graph
-    result = react_graph.invoke({"messages": messages})
+    result = get_react_graph().invoke({"messages": messages})
     
     # Print each message in the conversation using our helper function
     print_messages(result['messages'], "Full conversation")
@@ -240,14 +120,14 @@ def demonstrate_memory_limitation():
     
     # First message
     messages1 = [HumanMessage(content="Add 14 and 15.")]
-    result1 = react_graph.invoke({"messages": messages1})
+    result1 = get_react_graph().invoke({"messages": messages1})
     
     # Print the first interaction
     print_messages(result1['messages'], "First interaction")
     
     # Second message asking to use previous result - will fail without memory
     messages2 = [HumanMessage(content="Multiply that by 2.")]
-    result2 = react_graph.invoke({"messages": messages2})
+    result2 = get_react_graph().invoke({"messages": messages2})
     
     # Print the second interaction
     print_messages(result2['messages'], "Second interaction (without memory)")
@@ -275,7 +155,7 @@ def demonstrate_memory_implementation():
     conversation_memory[thread_id].append(initial_message)
     
     # Process the message through our agent graph
-    result1 = react_graph.invoke({"messages": conversation_memory[thread_id]})
+    result1 = get_react_graph().invoke({"messages": conversation_memory[thread_id]})
     
     # Update our conversation memory with the new messages (excluding the initial ones)
     new_messages1 = result1["messages"][len(conversation_memory[thread_id]):]
@@ -291,7 +171,7 @@ def demonstrate_memory_implementation():
     conversation_memory[thread_id].append(follow_up_message)
     
     # Process with the full conversation history
-    result2 = react_graph.invoke({"messages": conversation_memory[thread_id]})
+    result2 = get_react_graph().invoke({"messages": conversation_memory[thread_id]})
     
     # Update our conversation memory with just the new messages
     new_messages2 = result2["messages"][len(conversation_memory[thread_id]):]
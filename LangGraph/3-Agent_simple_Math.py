@@ -1,111 +1,37 @@
-import os
-from dotenv import load_dotenv
-from PIL import Image as PILImage
-import io
+import sys
+from pathlib import Path
+# Make the shared learning_ai package importable when running this file directly
+sys.path.append(str(Path(__file__).resolve().parents[1]))
 
-# Load environment variables from a .env file
-load_dotenv()
+# The arithmetic tools (add, multiply, divide) and the assistant <-> tools graph
+# are defined in learning_ai/graphs/react_math.py
+from learning_ai.graphs.react_math import build_react_graph
+from learning_ai.instrumentation import Instrumentation
+from langchain_core.messages import HumanMessage
 
-# Set environment variables for API keys
-os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
-os.environ["GROQ_API_KEY"] = os.getenv("GROQ_API_KEY")
 
-# Import necessary modules and classes
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
-from langgraph.graph import StateGraph
-from langgraph.graph import MessagesState
-from langchain_openai import ChatOpenAI
-from typing_extensions import TypedDict
-from langchain_core.messages import AnyMessage
-from typing import Annotated
-from langgraph.graph.message import add_messages
-from langgraph.graph import START, StateGraph
-from langgraph.prebuilt import tools_condition
-from langgraph.prebuilt import ToolNode
-from IPython.display import Image, display
+def main():
+    # Compile the graph
+    react_graph = build_react_graph()
 
-# Define a custom type for message state
-class MessagesState(TypedDict):
-    messages: Annotated[list[AnyMessage], add_messages]
+    # Define initial messages and invoke the graph
+    messages = [HumanMessage(content="Add 10 and 14. Multiply the output by 2. Divide the output by 5")]
+    # Instrumentation records the time spent in each node, LLM call and tool call
+    metrics = Instrumentation()
+    messages = react_graph.invoke({"messages": messages}, config={"callbacks": [metrics]})
 
-# Define arithmetic functions to be used as tools
-def multiply(a: int, b: int) -> int:
-    """Multiply a and b.
+    # Print the messages
+    for m in messages['messages']:
+        m.pretty_print()
 
-    Args:
-        a: first int
-        b: second int
-    """
-    return a * b
+    # Per-node latency and token counts; also exported if METRICS_PROM_FILE / TRACE_SPANS_FILE are set
+    print(metrics.summary())
+    metrics.export()
 
-def add(a: int, b: int) -> int:
-    """Adds a and b.
+    # Save the graph diagram (only with RENDER_GRAPHS=1 or --draw; rendered locally, no network call)
+    from learning_ai.graph_render import render_graph
+    render_graph(react_graph, "react_math_graph")
 
-    Args:
-        a: first int
-        b: second int
-    """
-    return a + b
 
-def divide(a: int, b: int) -> float:
-    """Divide a and b.
-
-    Args:
-        a: first int
-        b: second int
-    """
-    return a / b
-
-# List of tools (functions) to be used
-tools = [add, multiply, divide]
-
-# Initialize the language model with OpenAI's GPT-4o
-llm = ChatOpenAI(model="gpt-4o")
-
-# Bind the tools to the language model
-llm_with_tools = llm.bind_tools(tools, parallel_tool_calls=False)
-
-# Define a system message to guide the assistant's behavior
-sys_msg = SystemMessage(content="You are a helpful assistant tasked with performing arithmetic on a set of inputs.")
-
-# Define the assistant function to process messages 
-def assistant(state: MessagesState):
-    return {"messages": [llm_with_tools.invoke([sys_msg] + state["messages"])]}
-
-# Initialize a state graph for managing message flow
-builder = StateGraph(MessagesState)
-
-# Define nodes in the graph
-builder.add_node("assistant", assistant)
-builder.add_node("tools", ToolNode(tools))
-
-# Define edges in the graph
-builder.add_edge(START, "assistant")
-builder.add_conditional_edges(
-    "assistant",
-    # If the latest message (result) from assistant is a tool call -> tools_condition routes to tools
-    # If the latest message (result) from assistant is a not a tool call -> tools_condition routes to END
-    tools_condition,
-)
-
-builder.add_edge("tools", "assistant")
-
-# Compile the graph
-react_graph = builder.compile()
-
-# Define initial messages and invoke the graph
-messages = [HumanMessage(content="Add 10 and 14. Multiply the output by 2. Divide the output by 5")]
-messages = react_graph.invoke({"messages": messages})
-
-# Print the messages
-for m in messages['messages']:
-    m.pretty_print()
-
-# Generate and display the graph image using Pillow
-# Convert the graph to an image
-graph_image = react_graph.get_graph().draw_mermaid_png()
-
-# Use Pillow to open and show the image
-image = PILImage.open(io.BytesIO(graph_image))
-image.show() 
+if __name__ == "__main__":
+    main()
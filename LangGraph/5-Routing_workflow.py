@@ -1,99 +1,52 @@
 # message_routing.py
 
-import os
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langgraph.graph import StateGraph
-from langgraph.graph import MessagesState
-from langchain_core.messages import HumanMessage, SystemMessage
-from typing_extensions import TypedDict
-from typing import Annotated
-from langgraph.graph.message import add_messages
-from langgraph.graph import START, StateGraph
-from langgraph.prebuilt import tools_condition
-from langgraph.prebuilt import ToolNode
-from PIL import Image as PILImage
-import io
-
-# Load environment variables from a .env file
-load_dotenv()
-
-# Set environment variables for API keys
-os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
-os.environ["GROQ_API_KEY"] = os.getenv("GROQ_API_KEY")
-
-# Define a custom type for message state
-class MessagesState(TypedDict):
-    messages: Annotated[list[AnyMessage], add_messages]
-
-# Define functions to be used as tools in the message routing system
-def route_message(destination: str, message: str) -> str:
-    """Route a message to a specific destination.
-
-    Args:
-        destination: The destination to route the message to
-        message: The message to be routed
-    """
-    return f"Message '{message}' routed to {destination}."
-
-def log_message(message: str) -> str:
-    """Log a message for auditing purposes.
-
-    Args:
-        message: The message to be logged
-    """
-    return f"Message '{message}' logged for auditing."
-
-# List of tools (functions) to be used
-tools = [route_message, log_message]
-
-# Initialize the language model with OpenAI's GPT-4o
-llm = ChatOpenAI(model="gpt-4o")
-
-# Bind the tools to the language model
-llm_with_tools = llm.bind_tools(tools, parallel_tool_calls=False)
-
-# Define a system message to guide the assistant's behavior
-sys_msg = SystemMessage(content="You are a system responsible for routing and logging messages.")
-
-# Define the assistant function to process messages
-def assistant(state: MessagesState):
-    return {"messages": [llm_with_tools.invoke([sys_msg] + state["messages"])]}
-
-# Initialize a state graph for managing message flow
-builder = StateGraph(MessagesState)
-
-# Define nodes in the graph
-builder.add_node("assistant", assistant)
-builder.add_node("tools", ToolNode(tools))
-
-# Define edges in the graph
-builder.add_edge(START, "assistant")
-builder.add_conditional_edges(
-    "assistant",
-    # If the latest message (result) from assistant is a tool call -> tools_condition routes to tools
-    # If the latest message (result) from assistant is a not a tool call -> tools_condition routes to END
-    tools_condition,
-)
-
-builder.add_edge("tools", "assistant")
-
-# Compile the graph
-react_graph = builder.compile()
-
-# Define initial messages and invoke the graph
-messages = [HumanMessage(content="Route the message 'Hello World' to 'Support Team'.")]
-messages = react_graph.invoke({"messages": messages})
-
-# Print the messages
-for m in messages['messages']:
-    m.pretty_print()
-
-# Generate and display the graph image using Pillow
-# Convert the graph to an image
-graph_image = react_graph.get_graph().draw_mermaid_png()
-
-# Use Pillow to open and show the image
-image = PILImage.open(io.BytesIO(graph_image))
-image.show()
-
+import logging
+import sys
+from pathlib import Path
+# Make the shared learning_ai package importable when running this file directly
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+# The route_message / log_message tools and both routing graphs are defined in
+# learning_ai/graphs/routing.py:
+# - build_embedding_routing_graph (default): an embedding nearest-centroid router picks the
+#   destination and calls the tools directly; only low-confidence messages go to the LLM
+# - build_routing_graph (--llm-only): the LLM chooses the destination through tool calls
+from learning_ai.graphs.routing import build_embedding_routing_graph, build_routing_graph
+from langchain_core.messages import HumanMessage
+
+MESSAGES = [
+    "I was charged twice for my subscription this month",
+    "Can we get a quote for 200 seats?",
+    "The dashboard shows an error 500 after the update",
+    "Route the message 'Hello World' to 'Support Team'.",
+]
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+
+    # Compile the graph
+    if "--llm-only" in sys.argv:
+        react_graph = build_routing_graph()
+    else:
+        react_graph = build_embedding_routing_graph()
+
+    # Define initial messages and invoke the graph
+    for text in MESSAGES:
+        messages = react_graph.invoke({"messages": [HumanMessage(content=text)]})
+
+        # Print the messages
+        for m in messages['messages']:
+            m.pretty_print()
+
+    # Router decisions per message, confidence rate, accuracy against the LLM fallback and latency
+    if hasattr(react_graph, "router"):
+        react_graph.router.log_stats()
+
+    # Save the graph diagram (only with RENDER_GRAPHS=1 or --draw; rendered locally, no network call)
+    from learning_ai.graph_render import render_graph
+    render_graph(react_graph, "routing_graph")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,97 +1,58 @@
 # orchestrator_worker_pattern.py
 
-import os
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langgraph.graph import StateGraph
-from langgraph.graph import MessagesState
-from langchain_core.messages import HumanMessage, SystemMessage
-from typing_extensions import TypedDict
-from typing import Annotated
-from langgraph.graph.message import add_messages
-from langgraph.graph import START, StateGraph
-from langgraph.prebuilt import tools_condition
-from langgraph.prebuilt import ToolNode
-from PIL import Image as PILImage
-import io
-
-# Load environment variables from a .env file
-load_dotenv()
-
-# Set environment variables for API keys
-os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
-os.environ["GROQ_API_KEY"] = os.getenv("GROQ_API_KEY")
-
-# Define a custom type for message state
-class MessagesState(TypedDict):
-    messages: Annotated[list[AnyMessage], add_messages]
-
-# Define functions to be used as tools in the orchestrator-worker pattern
-def process_task(task: str) -> str:
-    """Process a task by a worker.
-
-    Args:
-        task: The task to be processed
-    """
-    return f"Task '{task}' processed by worker."
-
-def report_status(status: str) -> str:
-    """Report the status of a task.
-
-    Args:
-        status: The status to be reported
-    """
-    return f"Status '{status}' reported by worker."
-
-# List of tools (functions) to be used
-tools = [process_task, report_status]
-
-# Initialize the language model with OpenAI's GPT-4o
-llm = ChatOpenAI(model="gpt-4o")
-
-# Bind the tools to the language model
-llm_with_tools = llm.bind_tools(tools, parallel_tool_calls=False)
-
-# Define a system message to guide the assistant's behavior
-sys_msg = SystemMessage(content="You are an orchestrator managing tasks and workers.")
-
-# Define the assistant function to process messages
-def assistant(state: MessagesState):
-    return {"messages": [llm_with_tools.invoke([sys_msg] + state["messages"])]}
-
-# Initialize a state graph for managing message flow
-builder = StateGraph(MessagesState)
-
-# Define nodes in the graph
-builder.add_node("assistant", assistant)
-builder.add_node("tools", ToolNode(tools))
-
-# Define edges in the graph
-builder.add_edge(START, "assistant")
-builder.add_conditional_edges(
-    "assistant",
-    # If the latest message (result) from assistant is a tool call -> tools_condition routes to tools
-    # If the latest message (result) from assistant is a not a tool call -> tools_condition routes to END
-    tools_condition,
-)
-
-builder.add_edge("tools", "assistant")
-
-# Compile the graph
-react_graph = builder.compile()
-
-# Define initial messages and invoke the graph
-messages = [HumanMessage(content="Process the task 'Data Analysis'.")]
-messages = react_graph.invoke({"messages": messages})
-
-# Print the messages
-for m in messages['messages']:
-    m.pretty_print()
-
-# Generate and display the graph image using Pillow
-# Convert the graph to an image
-graph_image = react_graph.get_graph().draw_mermaid_png()
-
-# Use Pillow to open and show the image
-image = PILImage.open(io.BytesIO(graph_image))
-image.show()
+import sys
+from pathlib import Path
+# Make the shared learning_ai package importable when running this file directly
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+# Both orchestrators are defined in learning_ai/graphs/orchestrator.py:
+# - build_worker_pool_graph (default): a planner splits the request into subtasks, Send dispatches
+#   one worker per subtask onto a bounded process pool, and a synthesizer combines the results
+# - build_orchestrator_graph (--agent): the model calls process_task / report_status as tools
+# With --queue URL (e.g. redis://host:6379/0 or sqlite:///tmp/tasks.sqlite) the subtasks go to a
+# durable task queue instead, and workers started on any machine with
+#   python -m learning_ai.task_queue worker --url URL
+# pick them up.
+from learning_ai.graphs.orchestrator import build_orchestrator_graph, build_worker_pool_graph
+from langchain_core.messages import HumanMessage
+
+
+def print_progress(done, total, result):
+    status = "done" if result["error"] is None else f"failed: {result['error']}"
+    print(f"[{done}/{total}] {result['description']} ({result['elapsed_s']}s on {result['worker']}) {status}")
+
+
+def main():
+    if "--agent" in sys.argv:
+        # Compile the graph
+        react_graph = build_orchestrator_graph()
+
+        # Define initial messages and invoke the graph
+        messages = [HumanMessage(content="Process the task 'Data Analysis'.")]
+        messages = react_graph.invoke({"messages": messages})
+
+        # Print the messages
+        for m in messages['messages']:
+            m.pretty_print()
+    else:
+        task_queue = None
+        if "--queue" in sys.argv:
+            from learning_ai.task_queue import get_task_queue
+            task_queue = get_task_queue(sys.argv[sys.argv.index("--queue") + 1])
+
+        # CPU-bound subtasks run in worker processes (local, or behind the task queue), so they use all cores
+        react_graph = build_worker_pool_graph(on_progress=print_progress, task_queue=task_queue)
+        try:
+            result = react_graph.invoke({"request": "Process the task 'Data Analysis' for the last four quarters."})
+        finally:
+            if react_graph.pool is not None:
+                react_graph.pool.shutdown()
+        print(result["summary"])
+
+    # Save the graph diagram (only with RENDER_GRAPHS=1 or --draw; rendered locally, no network call)
+    from learning_ai.graph_render import render_graph
+    render_graph(react_graph, "orchestrator_graph")
+
+
+if __name__ == "__main__":
+    main()
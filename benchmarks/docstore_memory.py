@@ -0,0 +1,79 @@
+"""
+Heap memory per chunk: InMemoryDocstore vs. MmapDocstore.
+
+Builds N synthetic chunks, then measures (with tracemalloc) the Python heap held by:
+
+- an InMemoryDocstore of Document objects plus an index_to_docstore_id dict, as
+  FAISS.from_documents keeps them
+- an MmapDocstore plus RowIdMap over the same chunks written by write_docstore()
+
+It also times a batch of id lookups on both. Text served from the mmap lives in the
+page cache, not the heap, and is shared by every process that opens the store.
+
+    python benchmarks/docstore_memory.py --chunks 200000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare docstore heap usage per chunk.")
+    parser.add_argument("--chunks", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    from langchain_core.documents import Document
+
+    from learning_ai.mmap_docstore import MmapDocstore, RowIdMap, write_docstore
+
+    def chunks():
+        for i in range(args.chunks):
+            yield Document(page_content=f"Chunk {i}: " + "lorem ipsum dolor sit amet " * 30,
+                           metadata={"source": f"https://example.com/page-{i % 500}", "start_index": (i % 40) * 800})
+
+    ids = [str(uuid.uuid4()) for _ in range(args.chunks)]
+    probe = ids[:: max(1, args.chunks // args.lookups)]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = InMemoryDocstore(dict(zip(ids, chunks())))
+    index_map = dict(enumerate(ids))
+    in_memory = tracemalloc.get_traced_memory()[0] - before
+    started = time.perf_counter()
+    for doc_id in probe:
+        store.search(doc_id)
+    in_memory_lookup = (time.perf_counter() - started) / len(probe)
+    del store, index_map
+    tracemalloc.stop()
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_docstore(directory, list(chunks()), ids)
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        mapped = MmapDocstore(directory)
+        row_map = RowIdMap(mapped)
+        mmap_heap = tracemalloc.get_traced_memory()[0] - before
+        started = time.perf_counter()
+        for doc_id in probe:
+            mapped.search(doc_id)
+        mmap_lookup = (time.perf_counter() - started) / len(probe)
+        tracemalloc.stop()
+        del mapped, row_map
+
+    print(f"{'docstore':<12} {'heap MB':>9} {'bytes/chunk':>12} {'lookup us':>10}")
+    for name, heap, lookup in (("in-memory", in_memory, in_memory_lookup), ("mmap", mmap_heap, mmap_lookup)):
+        print(f"{name:<12} {heap / 2**20:>9.1f} {heap / args.chunks:>12.0f} {lookup * 1e6:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
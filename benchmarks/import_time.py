@@ -0,0 +1,116 @@
+"""
+Import-time check for the learning_ai package.
+
+Each module is imported in a fresh interpreter with `python -X importtime`, and the
+cumulative time of the module itself is compared against a budget. The check also
+fails if importing a module pulls in one of the heavy packages (torch, chromadb,
+IPython, ...) that should only be loaded when an example actually needs them.
+
+Usage:
+    python benchmarks/import_time.py                  # all learning_ai modules
+    python benchmarks/import_time.py learning_ai.graphs.routing
+
+Budgets (milliseconds) can be overridden with IMPORT_BUDGET_ROOT_MS (the learning_ai
+package itself) and IMPORT_BUDGET_MODULE_MS (every other module). Exits non-zero if
+any module is over budget or imports a forbidden package.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Packages that must never be imported as a side effect of importing learning_ai
+FORBIDDEN = (
+    "torch",
+    "sentence_transformers",
+    "chromadb",
+    "IPython",
+    "PIL",
+    "langchain_huggingface",
+    "langchain_chroma",
+)
+
+# Lines look like: "import time:       123 |       4567 | langchain_core.runnables"
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def discover_modules() -> List[str]:
+    """Every module of the learning_ai package, root first."""
+    package = REPO_ROOT / "learning_ai"
+    modules = []
+    for path in sorted(package.rglob("*.py")):
+        parts = path.relative_to(REPO_ROOT).with_suffix("").parts
+        if parts[-1] == "__main__":
+            continue  # the `python -m learning_ai` entry point, not a library module
+        if parts[-1] == "__init__":
+            parts = parts[:-1]
+        modules.append(".".join(parts))
+    return sorted(modules, key=lambda name: (name.count("."), name))
+
+
+def measure(module: str) -> Tuple[float, List[str]]:
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+        (cumulative import time in ms, list of every module that got imported)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=False,
+    )
+    if result.returncode != 0:
+        last_line = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+        raise RuntimeError(f"import {module} failed: {last_line}")
+
+    cumulative: Dict[str, int] = {}
+    imported = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            name = match.group(4)
+            cumulative[name] = int(match.group(2))
+            imported.append(name)
+    return cumulative.get(module, 0) / 1000, imported
+
+
+def budget_for(module: str) -> float:
+    if module == "learning_ai":
+        return float(os.getenv("IMPORT_BUDGET_ROOT_MS", "50"))
+    return float(os.getenv("IMPORT_BUDGET_MODULE_MS", "1500"))
+
+
+def main(argv: List[str]) -> int:
+    modules = argv or discover_modules()
+    failures = 0
+    print(f"{'module':<40} {'ms':>9} {'budget':>9}  status")
+    for module in modules:
+        try:
+            elapsed_ms, imported = measure(module)
+        except RuntimeError as e:
+            print(f"{module:<40} {'-':>9} {'-':>9}  ERROR {e}")
+            failures += 1
+            continue
+        budget = budget_for(module)
+        heavy = sorted({name.split(".")[0] for name in imported} & set(FORBIDDEN))
+        problems = []
+        if elapsed_ms > budget:
+            problems.append("over budget")
+        if heavy:
+            problems.append("imports " + ", ".join(heavy))
+        status = "FAIL " + "; ".join(problems) if problems else "ok"
+        print(f"{module:<40} {elapsed_ms:>9.1f} {budget:>9.0f}  {status}")
+        failures += bool(problems)
+
+    if failures:
+        print(f"\n{failures} module(s) failed the import-time check")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
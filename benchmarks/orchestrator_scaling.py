@@ -0,0 +1,61 @@
+"""
+Scaling check for the worker-pool orchestrator.
+
+Runs build_worker_pool_graph on a fixed batch of CPU-bound simulated subtasks with
+1, 2, 4, ... workers (up to the CPU count) and prints throughput and speedup over one
+worker. The planner is skipped (subtasks are passed in) and the synthesizer is a
+ScriptedChatModel, so no remote calls are made.
+
+    python benchmarks/orchestrator_scaling.py
+    python benchmarks/orchestrator_scaling.py --subtasks 32 --rounds 400000 --executor thread
+"""
+
+import argparse
+import functools
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure worker-pool orchestrator throughput vs. pool size.")
+    parser.add_argument("--subtasks", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=200_000, help="Hash rounds per subtask (work size)")
+    parser.add_argument("--executor", choices=["process", "thread"], default="process")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    from learning_ai.graphs.orchestrator import build_worker_pool_graph, simulated_workload
+    from learning_ai.testing.fakes import ScriptedChatModel
+
+    worker = functools.partial(simulated_workload, rounds=args.rounds)
+    subtasks = [{"id": i, "description": f"Analyse shard {i}"} for i in range(args.subtasks)]
+    sizes = sorted({1, *(2 ** i for i in range(1, 8) if 2 ** i < args.max_workers), args.max_workers})
+
+    print(f"{'workers':>7} {'seconds':>8} {'subtasks/s':>11} {'speedup':>8}")
+    baseline = None
+    for size in sizes:
+        graph = build_worker_pool_graph(llm=ScriptedChatModel(script=["Summary."]), worker=worker,
+                                        executor=args.executor, max_workers=size)
+        try:
+            graph.invoke({"request": "warm-up", "subtasks": subtasks[:size]})  # start the pool's workers
+            started = time.perf_counter()
+            result = graph.invoke({"request": "Analyse all shards", "subtasks": subtasks},
+                                  config={"max_concurrency": max(size, 1)})
+            elapsed = time.perf_counter() - started
+        finally:
+            graph.pool.shutdown()
+        failures = [r for r in result["results"] if r["error"]]
+        if failures:
+            print(f"{size:>7} FAILED: {failures[0]['error']}")
+            return 1
+        baseline = baseline or elapsed
+        print(f"{size:>7} {elapsed:>8.2f} {args.subtasks / elapsed:>11.2f} {baseline / elapsed:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
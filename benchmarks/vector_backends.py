@@ -0,0 +1,125 @@
+"""
+NumPy vs. FAISS vs. Chroma on synthetic corpora.
+
+For each corpus size and backend (each run in its own subprocess so memory is
+measured in isolation), this reports:
+
+- build: seconds to index the corpus (embeddings are precomputed, so only indexing is timed)
+- p50 latency of similarity_search_by_vector at each --k
+- recall@max(k) against exact cosine top-k
+- memory: peak RSS growth while building and querying
+
+Vectors are unit-normalised Gaussian clusters, like sentence embeddings. The last
+column shows which backend learning_ai.vector_backends.select_backend() would pick.
+
+    python benchmarks/vector_backends.py
+    python benchmarks/vector_backends.py --sizes 5 1000 100000 --dim 768 --k 1 4 10
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+
+def _corpus(size: int, dim: int, queries: int, seed: int = 0):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(1, size // 50), dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), size)] + 0.3 * rng.normal(size=(size, dim)).astype(np.float32)
+    probes = centers[rng.integers(0, len(centers), queries)] + 0.3 * rng.normal(size=(queries, dim)).astype(np.float32)
+    normalize = lambda m: m / np.linalg.norm(m, axis=1, keepdims=True)  # noqa: E731
+    return normalize(vectors), normalize(probes)
+
+
+def _child(backend: str, size: int, dim: int, queries: int, ks) -> dict:
+    import numpy as np
+    from langchain_core.documents import Document
+    from langchain_core.embeddings import Embeddings
+
+    from learning_ai.vector_backends import build_vectorstore
+
+    vectors, probes = _corpus(size, dim, queries)
+    table = {f"v{i}": vector.tolist() for i, vector in enumerate(vectors)}
+
+    class PrecomputedEmbeddings(Embeddings):
+        def embed_documents(self, texts):
+            return [table[text] for text in texts]
+
+        def embed_query(self, text):
+            return table[text]
+
+    documents = [Document(page_content=f"v{i}", metadata={"row": i}) for i in range(size)]
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    store = build_vectorstore(documents, PrecomputedEmbeddings(), backend=backend)
+    build_s = time.perf_counter() - started
+
+    latency = {}
+    for k in ks:
+        samples = []
+        for probe in probes:
+            started = time.perf_counter()
+            store.similarity_search_by_vector(probe.tolist(), k=k)
+            samples.append(time.perf_counter() - started)
+        latency[k] = sorted(samples)[len(samples) // 2]
+
+    k = min(max(ks), size)
+    exact = np.argsort(-(probes @ vectors.T), axis=1)[:, :k]
+    hits = 0
+    for probe, truth in zip(probes, exact):
+        found = {doc.metadata["row"] for doc in store.similarity_search_by_vector(probe.tolist(), k=k)}
+        hits += len(found & set(truth.tolist()))
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"build_s": build_s, "latency_s": latency, "recall": hits / (len(probes) * k),
+            "rss_mb": (rss_after - rss_before) / 1024}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare vector store backends on synthetic corpora.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 1_000, 20_000, 100_000])
+    parser.add_argument("--backends", nargs="+", default=None, help="Default: every installed backend")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 4, 10])
+    parser.add_argument("--child", nargs=2, metavar=("BACKEND", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_child(args.child[0], int(args.child[1]), args.dim, args.queries, args.k)))
+        return 0
+
+    from learning_ai.vector_backends import BACKENDS, available_backends, select_backend
+
+    backends = args.backends or available_backends()
+    unknown = set(backends) - set(BACKENDS)
+    if unknown:
+        parser.error(f"unknown backends: {', '.join(sorted(unknown))}")
+
+    k_columns = " ".join(f"{f'p50@{k} ms':>10}" for k in args.k)
+    print(f"{'size':>8} {'backend':<8} {'build s':>8} {k_columns} {'recall':>7} {'mem MB':>8}  auto")
+    for size in args.sizes:
+        for backend in backends:
+            command = [sys.executable, __file__, "--child", backend, str(size), "--dim", str(args.dim),
+                       "--queries", str(args.queries), "--k", *map(str, args.k)]
+            result = subprocess.run(command, capture_output=True, text=True, check=False)
+            if result.returncode != 0:
+                print(f"{size:>8} {backend:<8} FAILED: {result.stderr.strip().splitlines()[-1:]}")
+                continue
+            row = json.loads(result.stdout.strip().splitlines()[-1])
+            latencies = " ".join(f"{row['latency_s'][str(k)] * 1000:>10.3f}" for k in args.k)
+            chosen = "*" if select_backend(size) == backend else ""
+            print(f"{size:>8} {backend:<8} {row['build_s']:>8.3f} {latencies} {row['recall']:>7.3f} "
+                  f"{row['rss_mb']:>8.1f}  {chosen}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""
+Load benchmark for the example workflows, with no remote calls.
+
+Every graph and chain is built through its learning_ai factory with a
+ScriptedChatModel (simulated latency and token rate, tool calls where the workflow
+needs them) and HashingEmbeddings, then driven with `--requests` inputs at
+`--concurrency` in flight. Each scenario runs in a fresh subprocess so its peak
+memory is measured on its own.
+
+    python benchmarks/workflows.py                        # all scenarios
+    python benchmarks/workflows.py react_math joke -n 500 -c 32
+    python benchmarks/workflows.py --save-baseline        # record this machine's numbers
+    python benchmarks/workflows.py --check                # fail on regressions vs. the baseline
+
+Reported per scenario: throughput (requests/s), p50 / p99 latency and peak RSS.
+Baselines are machine-specific, so none is checked in: record one with
+--save-baseline (benchmarks/baseline.json by default) on the machine that runs
+--check. A scenario regresses if throughput drops, or latency or memory grow, by
+more than --tolerance (default 20%); baseline entries recorded with different
+settings are not compared, and with --check a missing baseline, or a scenario without
+a comparable entry, fails too.
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT))
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+# Settings that must match for a baseline entry to be comparable
+_SETTINGS = ("requests", "concurrency", "llm_latency", "tokens_per_s", "documents")
+
+
+# ========================
+# Scenarios
+# ========================
+# Each scenario builds its workflow once and returns an async function running request i.
+
+def _corpus(n: int):
+    from langchain_core.documents import Document
+
+    animals = ["dog", "cat", "goldfish", "parrot", "rabbit", "hamster", "turtle", "lizard"]
+    traits = ["loyal", "independent", "quiet", "social", "curious", "playful", "calm", "clever"]
+    return [
+        Document(
+            page_content=f"The {traits[i % len(traits)]} {animals[i % len(animals)]} number {i} "
+                         f"likes {animals[(i * 3) % len(animals)]}s and needs {traits[(i * 5) % len(traits)]} care.",
+            metadata={"source": f"doc-{i}"},
+        )
+        for i in range(n)
+    ]
+
+
+def scenario_react_math(llm_kwargs, args):
+    from learning_ai.graphs.react_math import build_react_graph
+    from learning_ai.testing.fakes import ScriptedChatModel, tool_call_step
+
+    llm = ScriptedChatModel(script=[
+        tool_call_step("add", a=10, b=14),
+        tool_call_step("multiply", a=24, b=2),
+        tool_call_step("divide", a=48, b=5),
+        "The result is 9.6",
+    ], **llm_kwargs)
+    graph = build_react_graph(llm=llm)
+    return lambda i: graph.ainvoke({"messages": [("user", f"Add 10 and 14 ({i}). Multiply by 2. Divide by 5")]})
+
+
+def scenario_parallel(llm_kwargs, args):
+    from learning_ai.graphs.parallel import build_parallel_graph
+    from learning_ai.testing.fakes import ScriptedChatModel
+
+    graph = build_parallel_graph(llm=ScriptedChatModel(script=["A short piece of writing about the topic."],
+                                                       **llm_kwargs))
+    return lambda i: graph.ainvoke({"topic": f"topic {i}"})
+
+
+def scenario_routing(llm_kwargs, args):
+    from learning_ai.graphs.routing import build_routing_graph
+    from learning_ai.testing.fakes import ScriptedChatModel, tool_call_step
+
+    llm = ScriptedChatModel(script=[
+        tool_call_step("route_message", destination="Sales", message="Need a quote"),
+        tool_call_step("log_message", message="Need a quote"),
+        "Routed to Sales and logged.",
+    ], **llm_kwargs)
+    graph = build_routing_graph(llm=llm)
+    return lambda i: graph.ainvoke({"messages": [("user", f"Route request {i} to Sales and log it")]})
+
+
+def scenario_embedding_routing(llm_kwargs, args):
+    from learning_ai.graphs.routing import DESTINATION_EXEMPLARS, build_embedding_routing_graph
+    from learning_ai.testing.fakes import HashingEmbeddings, ScriptedChatModel, tool_call_step
+
+    llm = ScriptedChatModel(script=[
+        tool_call_step("route_message", destination="Support Team", message="Hello World"),
+        "Routed to Support Team.",
+    ], **llm_kwargs)
+    graph = build_embedding_routing_graph(embeddings=HashingEmbeddings(), llm=llm)
+    # Mostly exemplar-like messages (decided by the router), plus some the LLM has to handle
+    texts = [text for examples in DESTINATION_EXEMPLARS.values() for text in examples] + ["Hello World"]
+    return lambda i: graph.ainvoke({"messages": [("user", texts[i % len(texts)])]})
+
+
+def scenario_joke(llm_kwargs, args):
+    from learning_ai.graphs.joke import build_joke_graph
+    from learning_ai.testing.fakes import ScriptedChatModel
+
+    # A "?" in the first joke fails the punchline gate, so all three LLM calls run
+    graph = build_joke_graph(llm=ScriptedChatModel(script=["Why did the cat sit on the keyboard? To keep an eye on the mouse."],
+                                                   **llm_kwargs))
+    return lambda i: graph.ainvoke({"topic": f"cats {i}"})
+
+
+def scenario_joke_judge(llm_kwargs, args):
+    from learning_ai.graphs.joke import build_joke_judge_graph
+    from learning_ai.testing.fakes import ScriptedChatModel
+
+    def write(messages):
+        if messages[-1].content.startswith("Make this joke funnier"):
+            return "The cat sat on the keyboard purr-posefully, to keep an eye on the mouse."
+        return "Why did the cat sit on the keyboard? To keep an eye on the mouse."
+
+    def score(messages):
+        # Drafts fail and improvements pass, so every run takes exactly one improvement round
+        return "8\nGood wordplay." if "purr-posefully" in messages[-1].content else "4\nPredictable."
+
+    graph = build_joke_judge_graph(llm=ScriptedChatModel(script=[write], **llm_kwargs),
+                                   judge_llm=ScriptedChatModel(script=[score], **llm_kwargs),
+                                   speculative=True)
+    return lambda i: graph.ainvoke({"topic": f"cats {i}"})
+
+
+def scenario_rag(llm_kwargs, args):
+    from learning_ai.chains.web_rag import build_vectorstore, build_web_rag
+    from learning_ai.testing.fakes import HashingEmbeddings, ScriptedChatModel
+
+    vectorstore = build_vectorstore(_corpus(args.documents), embeddings=HashingEmbeddings())
+    chain = build_web_rag(vectorstore=vectorstore, llm=ScriptedChatModel(
+        script=["Based on the context, curious parrots need social care."], **llm_kwargs))
+    return lambda i: chain.ainvoke({"question": f"What care does parrot number {i} need?"})
+
+
+def scenario_retriever(llm_kwargs, args):
+    from learning_ai.chains.pet_search import build_vectorstore
+    from learning_ai.testing.fakes import HashingEmbeddings
+
+    retriever = build_vectorstore(_corpus(args.documents), embeddings=HashingEmbeddings()).as_retriever(
+        search_type="similarity", search_kwargs={"k": 4})
+    return lambda i: retriever.ainvoke(f"playful rabbit number {i}")
+
+
+SCENARIOS: Dict[str, Callable[[Dict[str, Any], argparse.Namespace], Callable[[int], Awaitable[Any]]]] = {
+    "react_math": scenario_react_math,
+    "parallel": scenario_parallel,
+    "routing": scenario_routing,
+    "embedding_routing": scenario_embedding_routing,
+    "joke": scenario_joke,
+    "joke_judge": scenario_joke_judge,
+    "rag": scenario_rag,
+    "retriever": scenario_retriever,
+}
+
+
+# ========================
+# Measurement (runs in the child process)
+# ========================
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(p * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def _drive(run: Callable[[int], Awaitable[Any]], requests: int, concurrency: int) -> Tuple[List[float], float]:
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await run(i)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies, time.perf_counter() - start
+
+
+def measure(name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    llm_kwargs = {"latency_s": args.llm_latency, "tokens_per_s": args.tokens_per_s}
+    run = SCENARIOS[name](llm_kwargs, args)
+    asyncio.run(_drive(run, min(args.requests, 10), args.concurrency))  # warm-up
+    latencies, wall = asyncio.run(_drive(run, args.requests, args.concurrency))
+    latencies.sort()
+    return {
+        "scenario": name,
+        **{key: getattr(args, key) for key in _SETTINGS},
+        "throughput_rps": round(args.requests / wall, 2),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+# ========================
+# Orchestration (parent process)
+# ========================
+
+def run_child(name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    command = [sys.executable, __file__, name, "--child",
+               "--requests", str(args.requests), "--concurrency", str(args.concurrency),
+               "--llm-latency", str(args.llm_latency), "--tokens-per-s", str(args.tokens_per_s),
+               "--documents", str(args.documents)]
+    result = subprocess.run(command, capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        return {"scenario": name, "error": (result.stderr.strip().splitlines() or ["failed"])[-1]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def regressions(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Human-readable list of metrics that got worse than baseline by more than `tolerance`."""
+    problems = []
+    if current["throughput_rps"] < baseline["throughput_rps"] * (1 - tolerance):
+        problems.append(f"throughput {current['throughput_rps']} < {baseline['throughput_rps']} rps")
+    for key in ("p50_ms", "p99_ms", "peak_rss_mb"):
+        # a small absolute slack keeps sub-millisecond jitter from failing the check
+        slack = 1.0 if key.endswith("_ms") else 0.0
+        if current[key] > baseline[key] * (1 + tolerance) + slack:
+            problems.append(f"{key} {current[key]} > {baseline[key]}")
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the example workflows with fake models.")
+    parser.add_argument("scenarios", nargs="*", help=f"Scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("-n", "--requests", type=int, default=200)
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Fake LLM time to first token (s)")
+    parser.add_argument("--tokens-per-s", type=float, default=0.0, help="Fake LLM generation speed (0 = instant)")
+    parser.add_argument("--documents", type=int, default=1000, help="Corpus size for the rag / retriever scenarios")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the baseline")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero on regressions vs. the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    if args.child:
+        print(json.dumps(measure(args.scenarios[0], args)))
+        return 0
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if args.check and not baseline and not args.save_baseline:
+        # A regression gate that compares nothing must not pass
+        print(f"No baseline at {args.baseline}; record one with --save-baseline", file=sys.stderr)
+        return 1
+
+    failed = False
+    results = {}
+    print(f"{'scenario':<18} {'rps':>9} {'p50_ms':>9} {'p99_ms':>9} {'rss_mb':>8}  status")
+    for name in args.scenarios or list(SCENARIOS):
+        result = run_child(name, args)
+        if "error" in result:
+            print(f"{name:<18} ERROR {result['error']}")
+            failed = True
+            continue
+        results[name] = result
+        status = "ok"
+        previous = baseline.get(name)
+        if previous and all(previous.get(key) == result[key] for key in _SETTINGS):
+            problems = regressions(result, previous, args.tolerance)
+            if problems:
+                status = "REGRESSION " + "; ".join(problems)
+                failed = failed or args.check
+        elif args.check:
+            reason = "baseline used different settings" if previous else "no baseline entry"
+            status = f"NOT CHECKED ({reason})"
+            failed = True
+        elif previous:
+            status = "ok (baseline used different settings)"
+        print(f"{name:<18} {result['throughput_rps']:>9} {result['p50_ms']:>9} {result['p99_ms']:>9} "
+              f"{result['peak_rss_mb']:>8}  {status}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({**baseline, **results}, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
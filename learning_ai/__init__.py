@@ -0,0 +1,28 @@
+"""
+Shared helpers for the LangChain / LangGraph examples in this repository.
+
+The example scripts under LangChain/, LangGraph/ and ChatBots/ are thin entry points;
+the graphs and chains they run live in learning_ai.graphs and learning_ai.chains as
+side-effect-free factory functions, so worker processes can import them cheaply.
+
+Importing this package does not import LangChain, LangGraph or any provider SDK; the
+names below are resolved on first access.
+"""
+
+import importlib
+
+_LAZY_ATTRS = {
+    "get_chat_model": "learning_ai.llm_clients",
+    "render_graph": "learning_ai.graph_render",
+    "load_env": "learning_ai.env",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        return getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
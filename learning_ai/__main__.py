@@ -0,0 +1,8 @@
+"""`python -m learning_ai` runs the batch CLI in learning_ai.runner."""
+
+import sys
+
+from learning_ai.runner import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""
+LangChain chains and agents as factory functions.
+
+    build_json_chain        learning_ai.chains.json_prompt   (LangChain/1-Langchain_Prompt.py)
+    build_web_rag           learning_ai.chains.web_rag       (LangChain/3-LangChain_RAG.py)
+    build_tools_agent       learning_ai.chains.tools_agent   (ChatBots/4-tools_chain)
+    build_pet_rag_chain     learning_ai.chains.pet_search    (ChatBots/5-Vector_retriever_Search.py)
+    build_history_rag_chain learning_ai.chains.history_rag   (ChatBots/5-Vector_retriever_Search.py)
+
+Embedding models, vector stores and web loaders are imported inside the factories
+that need them, never at module import.
+"""
+
+import importlib
+
+_FACTORIES = {
+    "build_json_chain": "learning_ai.chains.json_prompt",
+    "build_web_rag": "learning_ai.chains.web_rag",
+    "build_tools_agent": "learning_ai.chains.tools_agent",
+    "build_pet_rag_chain": "learning_ai.chains.pet_search",
+    "build_history_rag_chain": "learning_ai.chains.history_rag",
+}
+
+
+def __getattr__(name):
+    if name in _FACTORIES:
+        return getattr(importlib.import_module(_FACTORIES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_FACTORIES))
@@ -0,0 +1,277 @@
+"""
+History-aware RAG over the pet documents, with cheap rewrite skipping and per-session caches.
+
+A follow-up like "are they good with kids?" retrieves nothing useful on its own, so
+the question is rewritten into a standalone query ("are dogs good with kids?")
+before retrieval. Rewriting costs an LLM round trip, so HistoryAwareRetriever:
+
+- skips the rewrite when there is no history, or when the question looks
+  self-contained: no pronouns or other words pointing back into the conversation,
+  no leading "and"/"what about", and long enough to stand alone (needs_rewrite())
+- caches rewrites per session, keyed on the question and the session's previous
+  standalone query (what a follow-up usually refers to), so re-asking the same
+  follow-up doesn't call the model again
+- caches per session the embedding of each normalised standalone query, and the
+  documents retrieved for (query, k, filter); a follow-up that resolves to a query
+  already asked skips the vector search, and one asked with a different k or
+  filter still skips the embedding model
+
+Sessions are kept in an LRU (max_sessions), and each session's caches are LRUs too.
+HistoryAwareRetriever.stats counts skipped rewrites, rewrite calls and cache hits.
+
+build_history_rag_chain() wraps it all in RunnableWithMessageHistory:
+
+    chain = build_history_rag_chain()
+    config = {"configurable": {"session_id": "pets"}}
+    chain.invoke({"question": "tell me about dogs"}, config=config)
+    chain.invoke({"question": "are they good with kids?"}, config=config)
+"""
+
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.documents import Document
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableConfig, RunnableLambda, RunnablePassthrough
+from langchain_core.vectorstores import VectorStore
+
+REWRITE_SYSTEM = (
+    "Given the conversation and a follow-up question, rewrite the follow-up as a standalone question "
+    "that can be understood without the conversation. Do not answer it. Return only the question."
+)
+
+ANSWER_SYSTEM = """Answer the user's question using the provided context only.
+
+Context:
+{context}"""
+
+# Words that usually point back into the conversation
+_REFERENCES = {
+    "it", "its", "it's", "they", "them", "their", "theirs", "this", "that", "these", "those", "he", "him",
+    "his", "she", "her", "hers", "one", "ones", "same", "such", "former", "latter", "there", "also", "too",
+    "else", "another", "other", "others", "more", "above", "previous", "earlier",
+}
+_FOLLOW_UP_OPENERS = ("and ", "but ", "so ", "what about", "how about", "what else", "why", "how come")
+_WORD = re.compile(r"[a-z']+")
+
+
+def needs_rewrite(question: str, history: Sequence[BaseMessage], min_words: int = 4) -> bool:
+    """
+    Cheap check for whether a question depends on the conversation.
+
+    Args:
+        question: The user's latest question
+        history: Earlier messages of the session
+        min_words: Questions shorter than this are treated as follow-ups ("why?", "and cats?")
+
+    Returns:
+        False when there is no history or the question looks self-contained
+    """
+    if not history:
+        return False
+    text = question.strip().lower()
+    words = _WORD.findall(text)
+    if len(words) < min_words or text.startswith(_FOLLOW_UP_OPENERS):
+        return True
+    return any(word in _REFERENCES for word in words)
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split()).rstrip(" ?.!")
+
+
+class _LRU(OrderedDict):
+    def __init__(self, size: int):
+        super().__init__()
+        self.size = size
+
+    def lookup(self, key):
+        if key in self:
+            self.move_to_end(key)
+            return self[key]
+        return None
+
+    def remember(self, key, value):
+        self[key] = value
+        self.move_to_end(key)
+        if len(self) > self.size:
+            self.popitem(last=False)
+        return value
+
+
+class _SessionCache:
+    def __init__(self, size: int):
+        self.rewrites = _LRU(size)
+        self.embeddings = _LRU(size)
+        self.results = _LRU(size)
+        self.last_query = ""
+
+
+class HistoryAwareRetriever:
+    """
+    Rewrite follow-ups into standalone queries and retrieve with per-session caching.
+
+    Args:
+        vectorstore: Store to search; queries are embedded with its embedding model so
+            the vectors can be cached
+        llm: Chat model for rewrites
+        k: Documents per query
+        history_window: Messages of history shown to the rewriter
+        cache_size: Entries per cache per session
+        max_sessions: Sessions whose caches are kept
+    """
+
+    def __init__(self, vectorstore: VectorStore, llm: BaseChatModel, k: int = 1, history_window: int = 6,
+                 cache_size: int = 256, max_sessions: int = 1024):
+        self.vectorstore = vectorstore
+        self.k = k
+        self.history_window = history_window
+        self.cache_size = cache_size
+        self.rewriter = ChatPromptTemplate.from_messages([
+            ("system", REWRITE_SYSTEM),
+            MessagesPlaceholder("chat_history"),
+            ("human", "{question}"),
+        ]) | llm | StrOutputParser()
+        self.stats = {"questions": 0, "rewrite_skipped": 0, "rewrite_calls": 0, "rewrite_cache_hits": 0,
+                      "embedding_cache_hits": 0, "retrieval_cache_hits": 0}
+        self._sessions = _LRU(max_sessions)
+        self._lock = threading.Lock()
+
+    def _session(self, session_id: str) -> _SessionCache:
+        with self._lock:
+            return self._sessions.lookup(session_id) or self._sessions.remember(session_id,
+                                                                                 _SessionCache(self.cache_size))
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def standalone_query(self, question: str, history: Sequence[BaseMessage], session_id: str = "default") -> str:
+        """The question itself if it is self-contained, else a (cached) rewrite."""
+        self._count("questions")
+        cache = self._session(session_id)
+        if not needs_rewrite(question, history):
+            self._count("rewrite_skipped")
+            cache.last_query = question
+            return question
+        key = (normalize_query(question), normalize_query(cache.last_query))
+        rewritten = cache.rewrites.lookup(key)
+        if rewritten is not None:
+            self._count("rewrite_cache_hits")
+        else:
+            self._count("rewrite_calls")
+            history = list(history)[-self.history_window:]
+            rewritten = self.rewriter.invoke({"question": question, "chat_history": history}).strip() or question
+            cache.rewrites.remember(key, rewritten)
+            # Asking the same follow-up straight after resolves to the same query
+            cache.rewrites.remember((key[0], normalize_query(rewritten)), rewritten)
+        cache.last_query = rewritten
+        return rewritten
+
+    def retrieve(self, query: str, session_id: str = "default", k: Optional[int] = None,
+                  filter: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """
+        Documents for a standalone query, from the session's caches when possible.
+
+        Args:
+            query: Standalone query
+            session_id: Session whose caches are used
+            k: Documents to return (defaults to the retriever's k)
+            filter: Metadata filter passed to the vector store
+        """
+        cache = self._session(session_id)
+        k = k or self.k
+        key = normalize_query(query)
+        # The embedding depends only on the query, so it is shared by every k and filter
+        vector = cache.embeddings.lookup(key)
+        if vector is None:
+            vector = cache.embeddings.remember(key, self.vectorstore.embeddings.embed_query(query))
+        else:
+            self._count("embedding_cache_hits")
+        result_key = (key, k, json.dumps(filter, sort_keys=True, default=str) if filter else None)
+        documents = cache.results.lookup(result_key)
+        if documents is not None:
+            self._count("retrieval_cache_hits")
+            return documents
+        search_kwargs = {"filter": filter} if filter else {}
+        return cache.results.remember(result_key,
+                                      self.vectorstore.similarity_search_by_vector(vector, k=k, **search_kwargs))
+
+    def invoke(self, inputs: Dict[str, Any], session_id: str = "default") -> List[Document]:
+        """Retrieve for {"question", "chat_history"} and optional "k" / "filter" overrides."""
+        query = self.standalone_query(inputs["question"], inputs.get("chat_history") or [], session_id)
+        return self.retrieve(query, session_id, k=inputs.get("k"), filter=inputs.get("filter"))
+
+    def as_runnable(self) -> RunnableLambda:
+        """Runnable over {"question", "chat_history"}; the session comes from config["configurable"]."""
+
+        def run(inputs: Dict[str, Any], config: RunnableConfig) -> List[Document]:
+            session_id = (config.get("configurable") or {}).get("session_id", "default")
+            return self.invoke(inputs, session_id)
+
+        return RunnableLambda(run, name="history_aware_retriever")
+
+    def clear(self, session_id: Optional[str] = None) -> None:
+        """Drop one session's caches, or all of them."""
+        with self._lock:
+            if session_id is None:
+                self._sessions.clear()
+            else:
+                self._sessions.pop(session_id, None)
+
+
+def build_history_rag_chain(llm: Optional[BaseChatModel] = None, vectorstore: Optional[VectorStore] = None,
+                            k: int = 1, max_context_tokens: Optional[int] = 1000, get_session_history=None,
+                            retriever: Optional[HistoryAwareRetriever] = None):
+    """
+    Build a conversational RAG chain that retrieves with history-aware queries.
+
+    Args:
+        llm: Chat model for rewrites and answers (defaults to the shared Groq Llama3-8b client)
+        vectorstore: Store to search (defaults to the pet documents, see pet_search.build_vectorstore)
+        k: Documents retrieved per question
+        max_context_tokens: Pack the retrieved documents into this many tokens (None: no packing)
+        get_session_history: session_id -> BaseChatMessageHistory (defaults to an in-memory dict)
+        retriever: A prebuilt HistoryAwareRetriever (overrides vectorstore / k); pass one to read its stats
+
+    Returns:
+        A RunnableWithMessageHistory taking {"question": ...} (optionally "k" and "filter" too) and a
+        session_id in config["configurable"]
+    """
+    from langchain_core.runnables.history import RunnableWithMessageHistory
+
+    if llm is None:
+        from learning_ai.llm_clients import get_chat_model
+        llm = get_chat_model("groq", "Llama3-8b-8192")
+    if retriever is None and vectorstore is None:
+        from learning_ai.chains.pet_search import build_vectorstore
+        vectorstore = build_vectorstore()
+    if get_session_history is None:
+        from langchain_core.chat_history import InMemoryChatMessageHistory
+
+        histories: Dict[str, BaseChatMessageHistory] = {}
+
+        def get_session_history(session_id: str) -> BaseChatMessageHistory:
+            return histories.setdefault(session_id, InMemoryChatMessageHistory())
+
+    if retriever is None:
+        retriever = HistoryAwareRetriever(vectorstore, llm, k=k)
+    context = retriever.as_runnable()
+    if max_context_tokens is not None:
+        from learning_ai.context_packer import ContextPacker
+        context = context | ContextPacker(max_tokens=max_context_tokens).as_runnable(as_text=True)
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", ANSWER_SYSTEM),
+        MessagesPlaceholder("chat_history"),
+        ("human", "{question}"),
+    ])
+    chain = RunnablePassthrough.assign(context=context) | prompt | llm
+    return RunnableWithMessageHistory(chain, get_session_history, input_messages_key="question",
+                                      history_messages_key="chat_history")
@@ -0,0 +1,36 @@
+"""JSON-answer prompt chain used by LangChain/1-Langchain_Prompt.py."""
+
+from typing import Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+
+from learning_ai.streaming_json import StreamingJsonOutputParser
+
+SYSTEM_PROMPT = "You are an expert AI Engineer. Provide response in JSON format.\n{format_instructions}"
+
+
+def build_json_chain(llm: Optional[BaseChatModel] = None, streaming: bool = False):
+    """
+    Build `prompt | llm | parser` with the JSON format instructions already filled in.
+
+    Args:
+        llm: Chat model to use (defaults to a deterministic, cached gpt-4 client)
+        streaming: Use StreamingJsonOutputParser so chain.stream() yields each
+            top-level field as soon as it is complete
+
+    Returns:
+        A chain taking {"input": ...} and returning a dict
+    """
+    if llm is None:
+        from learning_ai.llm_clients import get_chat_model
+        # temperature=0 makes the call deterministic, so repeated prompts hit the response cache
+        llm = get_chat_model("openai", "gpt-4", temperature=0)
+
+    output_parser = StreamingJsonOutputParser(completed_only=True) if streaming else JsonOutputParser()
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", SYSTEM_PROMPT),
+        ("user", "{input}")
+    ]).partial(format_instructions=output_parser.get_format_instructions())
+    return prompt | llm | output_parser
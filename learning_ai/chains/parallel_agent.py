@@ -0,0 +1,127 @@
+"""
+AgentExecutor that runs the tool calls of one agent step concurrently.
+
+When a tools agent asks for wikipedia, arxiv and langsmith-search in the same step,
+the stock AgentExecutor.invoke runs them one after another, so the step takes the
+sum of the three latencies. ParallelAgentExecutor runs them at the same time, so the
+slowest call sets the latency:
+
+- sync (invoke / stream): each action is submitted to a thread pool the moment the
+  agent emits it; AgentExecutor then collects the results in order
+- async (ainvoke / astream_events): AgentExecutor already gathers the actions; every
+  call is additionally wrapped in asyncio.wait_for
+
+Every call gets a timeout (tool_timeouts per tool name, default_tool_timeout_s
+otherwise). A timed-out call becomes an observation the agent can react to ("timed out
+after 10s") instead of failing the run. In async mode the call is cancelled; in sync
+mode Python threads can't be interrupted, so the thread finishes in the background and
+its result is dropped.
+
+astream_agent_events() turns astream_events into a simple stream of tool starts, tool
+results, answer tokens and the final output.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+
+from langchain.agents import AgentExecutor
+from langchain_core.agents import AgentAction, AgentStep
+from pydantic import PrivateAttr
+
+
+class ParallelAgentExecutor(AgentExecutor):
+    """
+    AgentExecutor with concurrent tool calls and per-tool timeouts.
+
+    Args (in addition to AgentExecutor's):
+        tool_timeouts: Seconds allowed per tool name
+        default_tool_timeout_s: Timeout for tools not in tool_timeouts (None: wait forever)
+        max_tool_workers: Threads used to run tool calls in sync mode
+    """
+
+    tool_timeouts: Dict[str, float] = {}
+    default_tool_timeout_s: Optional[float] = 30.0
+    max_tool_workers: int = 8
+
+    _pool: Optional[ThreadPoolExecutor] = PrivateAttr(default=None)
+    _pending: Dict[int, Any] = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def _timeout_for(self, action: AgentAction) -> Optional[float]:
+        return self.tool_timeouts.get(action.tool, self.default_tool_timeout_s)
+
+    def _timed_out(self, action: AgentAction, timeout: float) -> AgentStep:
+        return AgentStep(action=action, observation=f"Tool '{action.tool}' timed out after {timeout}s.")
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_tool_workers, thread_name_prefix="agent-tool")
+            return self._pool
+
+    def _iter_next_step(self, name_to_tool_map, color_mapping, inputs, intermediate_steps,
+                        run_manager=None) -> Iterator[Any]:
+        # The base generator yields every AgentAction of the step before it runs the first
+        # one, so each action is started here as soon as it appears; _perform_agent_action
+        # below then only waits for the already-running call.
+        for item in super()._iter_next_step(name_to_tool_map, color_mapping, inputs, intermediate_steps,
+                                            run_manager):
+            if isinstance(item, AgentAction):
+                context = contextvars.copy_context()
+                future = self._get_pool().submit(context.run, super()._perform_agent_action, name_to_tool_map,
+                                                 color_mapping, item, run_manager)
+                # The timeout runs from submission, so waiting on earlier calls doesn't extend it
+                timeout = self._timeout_for(item)
+                deadline = None if timeout is None else time.monotonic() + timeout
+                with self._lock:
+                    self._pending[id(item)] = (future, deadline)
+            yield item
+
+    def _perform_agent_action(self, name_to_tool_map, color_mapping, agent_action, run_manager=None) -> AgentStep:
+        with self._lock:
+            pending = self._pending.pop(id(agent_action), None)
+        if pending is None:
+            return super()._perform_agent_action(name_to_tool_map, color_mapping, agent_action, run_manager)
+        future, deadline = pending
+        timeout = self._timeout_for(agent_action)
+        try:
+            return future.result(timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+        except FutureTimeout:
+            future.cancel()  # only helps if the call hasn't started yet
+            return self._timed_out(agent_action, timeout)
+
+    async def _aperform_agent_action(self, name_to_tool_map, color_mapping, agent_action,
+                                     run_manager=None) -> AgentStep:
+        timeout = self._timeout_for(agent_action)
+        try:
+            return await asyncio.wait_for(
+                super()._aperform_agent_action(name_to_tool_map, color_mapping, agent_action, run_manager),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            return self._timed_out(agent_action, timeout)
+
+
+async def astream_agent_events(executor: AgentExecutor, inputs: Dict[str, Any],
+                               config=None) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Stream an agent run as ("tool_start", {"tool", "input"}), ("tool_end", {"tool", "output"}),
+    ("token", text) and finally ("final", output) events.
+    """
+    async for event in executor.astream_events(inputs, config=config, version="v2"):
+        kind = event["event"]
+        if kind == "on_tool_start":
+            yield "tool_start", {"tool": event["name"], "input": event["data"].get("input")}
+        elif kind == "on_tool_end":
+            yield "tool_end", {"tool": event["name"], "output": event["data"].get("output")}
+        elif kind == "on_chat_model_stream":
+            chunk = event["data"]["chunk"]
+            if isinstance(chunk.content, str) and chunk.content:
+                yield "token", chunk.content
+        elif kind == "on_chain_end" and not event.get("parent_ids"):  # the executor's own run
+            yield "final", event["data"]["output"].get("output")
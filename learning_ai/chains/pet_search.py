@@ -0,0 +1,90 @@
+"""Pet documents vector search and RAG chain used by ChatBots/5-Vector_retriever_Search.py."""
+
+from typing import List, Optional
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnablePassthrough
+
+DOCUMENTS = [
+    Document(
+        page_content="Dogs are great companions, known for their loyalty and friendliness.",
+        metadata={"source": "mammal-pets-doc"},
+    ),
+    Document(
+        page_content="Cats are independent pets that often enjoy their own space.",
+        metadata={"source": "mammal-pets-doc"},
+    ),
+    Document(
+        page_content="Goldfish are popular pets for beginners, requiring relatively simple care.",
+        metadata={"source": "fish-pets-doc"},
+    ),
+    Document(
+        page_content="Parrots are intelligent birds capable of mimicking human speech.",
+        metadata={"source": "bird-pets-doc"},
+    ),
+    Document(
+        page_content="Rabbits are social animals that need plenty of space to hop around.",
+        metadata={"source": "mammal-pets-doc"},
+    ),
+]
+
+RAG_MESSAGE = """
+Answer this question using the provided context only.
+
+{question}
+
+Context:
+{context}
+"""
+
+
+def build_vectorstore(documents: Optional[List[Document]] = None, embeddings: Optional[Embeddings] = None,
+                      backend: str = "auto"):
+    """
+    Embed the documents into a vector store.
+
+    Args:
+        documents: Documents to index (defaults to the five pet documents)
+        embeddings: Embedding model (defaults to all-MiniLM-L6-v2 via local_embeddings(): the embedding
+            server, the int8 ONNX export or HuggingFace, see learning_ai/onnx_embeddings.py)
+        backend: "auto" (NumPy for small corpora like this one, see learning_ai/vector_backends.py),
+            "numpy", "faiss" or "chroma"
+    """
+    from learning_ai.vector_backends import build_vectorstore as build_backend
+
+    if embeddings is None:
+        from learning_ai.onnx_embeddings import local_embeddings
+        embeddings = local_embeddings()
+    return build_backend(documents or DOCUMENTS, embeddings, backend=backend)
+
+
+def build_pet_rag_chain(llm: Optional[BaseChatModel] = None, retriever=None, embeddings: Optional[Embeddings] = None,
+                        max_context_tokens: Optional[int] = 1000):
+    """
+    Build the retrieval-augmented generation chain.
+
+    Args:
+        llm: Chat model to use (defaults to the shared Groq Llama3-8b client)
+        retriever: Retriever for the context (defaults to k=1 search over the pet documents)
+        embeddings: Embedding model for the default retriever
+        max_context_tokens: Pack the retrieved documents into this many tokens of plain text
+            (see learning_ai/context_packer.py); None passes the Documents through unchanged
+
+    Returns:
+        A chain taking the question string and returning the model's message
+    """
+    if llm is None:
+        from learning_ai.llm_clients import get_chat_model
+        llm = get_chat_model("groq", "Llama3-8b-8192")
+    if retriever is None:
+        retriever = build_vectorstore(embeddings=embeddings).as_retriever(
+            search_type="similarity", search_kwargs={"k": 1}
+        )
+    prompt = ChatPromptTemplate.from_messages([("human", RAG_MESSAGE)])
+    if max_context_tokens is not None:
+        from learning_ai.context_packer import ContextPacker
+        retriever = retriever | ContextPacker(max_tokens=max_context_tokens).as_runnable(as_text=True)
+    return {"context": retriever, "question": RunnablePassthrough()} | prompt | llm
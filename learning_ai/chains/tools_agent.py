@@ -0,0 +1,131 @@
+"""Wikipedia / Arxiv / LangSmith-docs tools agent used by ChatBots/4-tools_chain."""
+
+from typing import List, Optional
+
+from langchain_core.language_models import BaseChatModel
+
+DOCS_URL = "https://docs.smith.langchain.com/"
+PROMPT_REF = "hwchase17/openai-functions-agent"
+
+# Result caching per tool name (see learning_ai/tool_cache.py): external lookups change slowly
+TOOL_TTL_S = {
+    "wikipedia": 24 * 3600,
+    "arxiv": 24 * 3600,
+    "langsmith-search": 3600,
+}
+
+
+def load_docs(url: str = DOCS_URL, dedupe_threshold: Optional[float] = 0.85):
+    """Crawl and split the LangSmith docs, dropping near-duplicate chunks (see learning_ai/dedupe.py)."""
+    from learning_ai.env import load_env
+    from learning_ai.web_crawler import AsyncWebCrawler
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    load_env()
+    # Re-crawls are conditional GETs against the on-disk HTTP cache (see learning_ai/web_crawler.py)
+    docs = AsyncWebCrawler([url], raise_for_errors=True).load()
+    chunks = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200).split_documents(docs)
+    if dedupe_threshold is not None:
+        from learning_ai.dedupe import dedupe_documents
+        chunks = dedupe_documents(chunks, threshold=dedupe_threshold)
+    return chunks
+
+
+def build_docs_retriever(url: str = DOCS_URL, build_if_missing: bool = True,
+                         refresh_interval_s: Optional[float] = None, server: Optional[str] = None):
+    """
+    Retriever over the prebuilt LangSmith-docs artifact (see learning_ai/retriever_artifact.py).
+
+    Args:
+        url: Site crawled if the artifact has to be built here
+        build_if_missing: Build the artifact on first use instead of failing; later starts load it
+        refresh_interval_s: Poll for newer artifact versions every this many seconds
+        server: Query a shared retrieval server at this socket path or host:port instead of
+            loading the index in this process (defaults to TOOLS_AGENT_RETRIEVAL_SERVER)
+    """
+    import os
+
+    server = server or os.getenv("TOOLS_AGENT_RETRIEVAL_SERVER")
+    if server:
+        # One process holds the index (`python -m learning_ai.retrieval_server --artifact`)
+        from learning_ai.retrieval_server import RemoteRetriever
+        return RemoteRetriever(address=server)
+
+    from learning_ai.retriever_artifact import ArtifactError, ArtifactRetriever, build_artifact, current_version
+
+    if current_version() is None:
+        if not build_if_missing:
+            raise ArtifactError("No docs artifact; run `python -m learning_ai.retriever_artifact build`.")
+        build_artifact(url=url)
+    retriever = ArtifactRetriever.load()
+    if refresh_interval_s:
+        retriever.start_refresh(refresh_interval_s)
+    return retriever
+
+
+def load_prompt():
+    """The agent prompt stored in the artifact, falling back to a hub pull if there is none."""
+    from learning_ai.retriever_artifact import load_artifact_prompt
+
+    prompt = load_artifact_prompt()
+    if prompt is None:
+        from langchain import hub
+        prompt = hub.pull(PROMPT_REF)
+    return prompt
+
+
+def build_tools(retriever=None, memoize: bool = True) -> List:
+    """
+    Wikipedia, Arxiv and LangSmith search tools.
+
+    Args:
+        retriever: Retriever behind the LangSmith search tool (defaults to build_docs_retriever())
+        memoize: Cache results for TOOL_TTL_S and collapse concurrent duplicate lookups
+    """
+    from langchain_community.tools import ArxivQueryRun, WikipediaQueryRun
+    from langchain_community.utilities import ArxivAPIWrapper, WikipediaAPIWrapper
+    from langchain_core.tools.retriever import create_retriever_tool
+
+    wiki = WikipediaQueryRun(api_wrapper=WikipediaAPIWrapper(top_k_results=1, doc_content_chars_max=250))
+    arxiv = ArxivQueryRun(api_wrapper=ArxivAPIWrapper(top_k_results=1, doc_content_chars_max=250))
+    retriever_tool = create_retriever_tool(
+        retriever or build_docs_retriever(), "langsmith-search", "Search any information about Langsmith"
+    )
+    tools = [wiki, arxiv, retriever_tool]
+    if memoize:
+        from learning_ai.tool_cache import ToolPolicy, memoize_tools
+        tools = memoize_tools(tools, {name: ToolPolicy(ttl_s=ttl) for name, ttl in TOOL_TTL_S.items()})
+    return tools
+
+
+def build_tools_agent(llm: Optional[BaseChatModel] = None, tools: Optional[List] = None, prompt=None,
+                      verbose: bool = True, parallel: bool = True, tool_timeout_s: Optional[float] = 30.0):
+    """
+    Build the tool-calling AgentExecutor.
+
+    Args:
+        llm: Chat model to use (defaults to the shared Groq Llama3-8b client)
+        tools: Tools for the agent (defaults to build_tools())
+        prompt: Agent prompt (defaults to the copy of hwchase17/openai-functions-agent stored in
+            the docs artifact, or a hub pull if no artifact has been built)
+        verbose: Print the agent's intermediate steps
+        parallel: Run the tool calls of one step concurrently (ParallelAgentExecutor)
+        tool_timeout_s: Per-call tool timeout when parallel; a timeout becomes the tool's observation
+
+    Returns:
+        An AgentExecutor taking {"input": ...}
+    """
+    from langchain.agents import AgentExecutor, create_openai_tools_agent
+
+    if llm is None:
+        from learning_ai.llm_clients import get_chat_model
+        llm = get_chat_model("groq", "Llama3-8b-8192")
+    if tools is None:
+        tools = build_tools()
+    if prompt is None:
+        prompt = load_prompt()
+    agent = create_openai_tools_agent(llm, tools, prompt)
+    if parallel:
+        from learning_ai.chains.parallel_agent import ParallelAgentExecutor
+        return ParallelAgentExecutor(agent=agent, tools=tools, verbose=verbose, default_tool_timeout_s=tool_timeout_s)
+    return AgentExecutor(agent=agent, tools=tools, verbose=verbose)
@@ -0,0 +1,95 @@
+"""Web page RAG pipeline used by LangChain/3-LangChain_RAG.py."""
+
+import os
+from operator import itemgetter
+from typing import List, Optional, Sequence, Union
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnablePassthrough
+
+DEFAULT_URL = "https://cricinfo.com/"
+
+PROMPT = "Answer the following question based on the context provided: {context}\n\nQuestion: {question}\nAnswer:"
+
+
+def load_documents(url: Union[str, Sequence[str]] = DEFAULT_URL, chunk_size: int = 1000, chunk_overlap: int = 200,
+                   dedupe_threshold: Optional[float] = 0.85) -> List[Document]:
+    """
+    Fetch web pages and split them into chunks.
+
+    Args:
+        url: Page (or pages) to load; fetched concurrently and revalidated against the
+            on-disk HTTP cache (see learning_ai/web_crawler.py)
+        chunk_size: Characters per chunk
+        chunk_overlap: Characters shared by neighbouring chunks
+        dedupe_threshold: Drop chunks at least this similar to an earlier one (navigation and
+            other boilerplate) before they are embedded; None keeps every chunk
+    """
+    from learning_ai.env import load_env
+    load_env()
+    # This is used to identify the application making requests
+    os.environ.setdefault("USER_AGENT", "Neel_Learn/1.0.0")
+
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    from learning_ai.web_crawler import AsyncWebCrawler
+
+    # Fail loudly like WebBaseLoader: a DNS error, timeout or non-200 must not build an empty store
+    documents = AsyncWebCrawler([url] if isinstance(url, str) else url, raise_for_errors=True).load()
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    chunks = text_splitter.split_documents(documents)
+    if dedupe_threshold is not None:
+        from learning_ai.dedupe import dedupe_documents
+        chunks = dedupe_documents(chunks, threshold=dedupe_threshold)
+    return chunks
+
+
+def build_vectorstore(documents: List[Document], embeddings: Optional[Embeddings] = None, backend: str = "auto"):
+    """Embed the chunks (OpenAI embeddings by default) into the backend picked by learning_ai/vector_backends.py."""
+    from learning_ai.vector_backends import build_vectorstore as build_backend
+
+    if embeddings is None:
+        from learning_ai.env import load_env
+        from langchain_openai import OpenAIEmbeddings
+        load_env()
+        embeddings = OpenAIEmbeddings()
+    return build_backend(documents, embeddings, backend=backend)
+
+
+def build_document_chain(llm: Optional[BaseChatModel] = None):
+    """Stuff-documents chain taking {"context": [Document, ...], "question": ...}."""
+    from langchain.chains.combine_documents import create_stuff_documents_chain
+
+    if llm is None:
+        from learning_ai.llm_clients import get_chat_model
+        # Using gpt-4o-mini with a temperature of 0 for deterministic (and therefore cached) responses
+        llm = get_chat_model("openai", "gpt-4o-mini", temperature=0)
+    return create_stuff_documents_chain(llm, ChatPromptTemplate.from_template(PROMPT))
+
+
+def build_web_rag(vectorstore=None, llm: Optional[BaseChatModel] = None, k: int = 4, url: str = DEFAULT_URL,
+                  max_context_tokens: Optional[int] = 1500):
+    """
+    Build the full retrieve-then-answer chain.
+
+    Args:
+        vectorstore: Store to retrieve from (defaults to crawling and embedding `url`)
+        llm: Chat model for the answer
+        k: Number of chunks to retrieve
+        url: Page indexed when no vectorstore is given
+        max_context_tokens: Pack the retrieved chunks into this many tokens (see
+            learning_ai/context_packer.py); None passes them through unchanged
+
+    Returns:
+        A chain taking {"question": ...} and returning the answer string
+    """
+    if vectorstore is None:
+        vectorstore = build_vectorstore(load_documents(url))
+    retriever = vectorstore.as_retriever(search_kwargs={"k": k})
+    if max_context_tokens is not None:
+        from learning_ai.context_packer import ContextPacker
+        retriever = retriever | ContextPacker(max_tokens=max_context_tokens).as_runnable()
+    return RunnablePassthrough.assign(context=itemgetter("question") | retriever) | build_document_chain(llm)
@@ -0,0 +1,209 @@
+"""
+Token-budgeted context packing for stuff-documents prompts.
+
+Retrievers return whole chunks in relevance order, and the RAG chains used to paste
+all of them into the prompt. Chunks split with chunk_overlap repeat up to
+`chunk_overlap` characters of their neighbours, so the prompt carries the same text
+twice, and its size depends on whatever the retriever returned. ContextPacker
+builds a prompt context that fits a fixed token budget:
+
+1. whitespace is compressed (runs of spaces collapse to one, blank-line runs to one blank line)
+2. chunks are taken greedily, most relevant first, while they fit the budget
+3. a chunk whose text is already contained in a taken chunk is dropped
+4. a chunk that overlaps a taken chunk from the same source (the end of one is the
+   start of the other, as chunk_overlap produces) is merged into it, so the
+   overlap is paid for once
+5. a chunk that doesn't fit is skipped; optionally the first such chunk is cut at a
+   sentence or word boundary to use the remaining budget
+
+Relevance comes from (Document, score) pairs, a "score" metadata field, or else the
+input order. Tokens are counted with tiktoken's cl100k_base when it is installed,
+or estimated at 4 characters per token.
+
+Example:
+    packer = ContextPacker(max_tokens=1500)
+    chain = RunnablePassthrough.assign(context=itemgetter("question") | retriever | packer.as_runnable())
+"""
+
+import functools
+import re
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+from langchain_core.documents import Document
+
+_SPACES = re.compile(r"[ \t\f\v\u00a0]+")
+_BLANK_LINES = re.compile(r"\s*\n\s*\n\s*")
+_LINE_BREAK = re.compile(r" ?\n ?")
+_SENTENCE_END = re.compile(r"[.!?](?=\s)")
+
+DocumentLike = Union[Document, Tuple[Document, float]]
+
+
+def compress_whitespace(text: str) -> str:
+    text = _SPACES.sub(" ", text)
+    text = _BLANK_LINES.sub("\n\n", text)
+    return _LINE_BREAK.sub("\n", text).strip()
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:  # not installed, or the encoding can't be downloaded
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """cl100k_base token count, or a 4-characters-per-token estimate without tiktoken."""
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def merge_overlapping(first: str, second: str, min_overlap: int = 20) -> Optional[str]:
+    """
+    Join two chunks if the end of one is the start of the other.
+
+    Returns:
+        The merged text, or None if they don't overlap by at least min_overlap characters
+    """
+    for left, right in ((first, second), (second, first)):
+        # Longest suffix of `left` that is a prefix of `right`: look for the start of
+        # `right` near the end of `left`, earliest (= longest overlap) first
+        probe = right[:min_overlap]
+        if len(probe) < min_overlap:
+            continue
+        start = left.find(probe, max(0, len(left) - len(right)))
+        while start != -1:
+            if right.startswith(left[start:]):
+                return left[:start] + right
+            start = left.find(probe, start + 1)
+    return None
+
+
+class _Packed:
+    __slots__ = ("text", "source", "score", "tokens", "parts", "metadata")
+
+    def __init__(self, text: str, source, score: float, tokens: int, metadata: dict):
+        self.text = text
+        self.source = source
+        self.score = score
+        self.tokens = tokens
+        self.parts = 1
+        self.metadata = metadata
+
+
+class ContextPacker:
+    """
+    Fill a token budget with the most relevant, de-duplicated context.
+
+    Args:
+        max_tokens: Budget for the packed context, separators included
+        token_counter: Function text -> tokens (defaults to count_tokens)
+        separator: Placed between chunks by format()
+        min_overlap: Shortest shared text (in characters) that counts as chunk overlap
+        truncate_last: Cut the first chunk that doesn't fit to use the rest of the budget
+        min_truncated_tokens: Don't bother adding a cut chunk shorter than this
+    """
+
+    def __init__(self, max_tokens: int = 1500, token_counter: Optional[Callable[[str], int]] = None,
+                 separator: str = "\n\n", min_overlap: int = 20, truncate_last: bool = True,
+                 min_truncated_tokens: int = 32):
+        self.max_tokens = max_tokens
+        self.count = token_counter or count_tokens
+        self.separator = separator
+        self.min_overlap = min_overlap
+        self.truncate_last = truncate_last
+        self.min_truncated_tokens = min_truncated_tokens
+        self._separator_tokens = self.count(separator)
+
+    @staticmethod
+    def _scored(documents: Sequence[DocumentLike]) -> List[Tuple[Document, float]]:
+        scored = []
+        for rank, item in enumerate(documents):
+            doc, score = item if isinstance(item, tuple) else (item, item.metadata.get("score"))
+            # Without scores, earlier results rank higher
+            scored.append((doc, float(score) if score is not None else -float(rank)))
+        # sorted() is stable, so equal scores keep the retriever's order
+        return sorted(scored, key=lambda pair: pair[1], reverse=True)
+
+    def _truncate(self, text: str, budget: int) -> Optional[str]:
+        if budget < self.min_truncated_tokens:
+            return None
+        # Start from a character estimate, then shrink until the count fits
+        cut = text[: budget * 4]
+        while cut and self.count(cut) > budget:
+            cut = cut[: int(len(cut) * 0.9)]
+        sentence_ends = [m.end() for m in _SENTENCE_END.finditer(cut)]
+        if sentence_ends and sentence_ends[-1] > len(cut) // 2:
+            cut = cut[: sentence_ends[-1]]
+        elif " " in cut:
+            cut = cut[: cut.rindex(" ")] + " ..."
+        return cut if self.count(cut) >= self.min_truncated_tokens else None
+
+    def pack(self, documents: Sequence[DocumentLike]) -> List[Document]:
+        """
+        Select, de-duplicate and merge chunks into the budget.
+
+        Returns:
+            Documents in relevance order; metadata keeps the first chunk's fields plus
+            "score", and "merged_chunks" when chunks were merged
+        """
+        packed: List[_Packed] = []
+        used = 0
+        truncated = False
+        for doc, score in self._scored(documents):
+            text = compress_whitespace(doc.page_content)
+            if not text or any(text in item.text for item in packed):
+                continue  # duplicate (or contained in a chunk we already have)
+            source = doc.metadata.get("source")
+
+            merged_into = None
+            for item in packed:
+                if item.source == source:
+                    merged = merge_overlapping(item.text, text, self.min_overlap)
+                    if merged is not None:
+                        merged_into = (item, merged)
+                        break
+            if merged_into is not None:
+                item, merged = merged_into
+                tokens = self.count(merged)
+                if used - item.tokens + tokens <= self.max_tokens:
+                    used += tokens - item.tokens
+                    item.text, item.tokens = merged, tokens
+                    item.parts += 1
+                continue
+
+            tokens = self.count(text)
+            cost = tokens + (self._separator_tokens if packed else 0)
+            if used + cost > self.max_tokens:
+                # Skip it (a shorter, less relevant chunk may still fit), cutting only the first misfit
+                if self.truncate_last and not truncated:
+                    truncated = True
+                    cut = self._truncate(text, self.max_tokens - used - (cost - tokens))
+                    if cut is not None:
+                        cut_tokens = self.count(cut)
+                        packed.append(_Packed(cut, source, score, cut_tokens, doc.metadata))
+                        used += cut_tokens + (cost - tokens)
+                continue
+            packed.append(_Packed(text, source, score, tokens, doc.metadata))
+            used += cost
+
+        result = []
+        for item in packed:
+            metadata = {**item.metadata, "score": item.score}
+            if item.parts > 1:
+                metadata["merged_chunks"] = item.parts
+            result.append(Document(page_content=item.text, metadata=metadata))
+        return result
+
+    def format(self, documents: Sequence[DocumentLike]) -> str:
+        """Packed context as one string, for prompts that take {context} as text."""
+        return self.separator.join(doc.page_content for doc in self.pack(documents))
+
+    def as_runnable(self, as_text: bool = False):
+        """RunnableLambda for chains: documents in, packed documents (or text) out."""
+        from langchain_core.runnables import RunnableLambda
+        return RunnableLambda(self.format if as_text else self.pack, name="ContextPacker")
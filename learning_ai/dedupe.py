@@ -0,0 +1,161 @@
+"""
+Ingest-time near-duplicate removal with MinHash and LSH.
+
+Web pages share navigation bars, cookie banners and footers, so after splitting,
+many chunks are nearly identical. Each one costs an embedding call and a slot in the
+index, and a query that matches the boilerplate gets top-k results that all say the
+same thing. NearDuplicateFilter removes them before embedding:
+
+1. each chunk becomes a set of word shingles (overlapping `shingle_size`-word windows)
+2. a MinHash signature of `num_perm` values estimates the Jaccard similarity of two
+   shingle sets as the fraction of equal signature positions
+3. signatures are split into LSH bands; chunks sharing any band bucket become
+   candidates, so only near-duplicates are ever compared (no all-pairs scan)
+4. a candidate whose estimated similarity reaches `threshold` is dropped, and its
+   source is recorded on the chunk that was kept (metadata "duplicate_sources")
+
+The filter keeps its index between calls, so the corpus can be deduplicated
+incrementally, loader by loader. It is a LangChain BaseDocumentTransformer and can
+be chained after a text splitter.
+
+Example:
+    chunks = splitter.split_documents(WebBaseLoader(url).load())
+    chunks = NearDuplicateFilter(threshold=0.85).transform_documents(chunks)
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import BaseDocumentTransformer, Document
+
+_WORD = re.compile(r"\w+")
+# Prime just above 2**32: with 32-bit shingle hashes and 32-bit coefficients, a * x + b
+# fits in uint64, so the permutations need no big-integer arithmetic
+_PRIME = np.uint64(4294967311)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+
+def _shingle_hashes(text: str, shingle_size: int) -> np.ndarray:
+    words = _WORD.findall(text.lower())
+    if len(words) < shingle_size:
+        shingles = {" ".join(words)} if words else set()
+    else:
+        shingles = {" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)}
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little") for s in shingles),
+        dtype=np.uint64, count=len(shingles),
+    )
+
+
+def lsh_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    (bands, rows) with bands * rows = num_perm whose S-curve midpoint, (1 / bands) ** (1 / rows),
+    is closest to the threshold.
+    """
+    options = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    return min(options, key=lambda option: abs((1 / option[0]) ** (1 / option[1]) - threshold))
+
+
+class MinHasher:
+    """
+    MinHash signatures over word shingles.
+
+    Args:
+        num_perm: Signature length; the similarity estimate's error shrinks with 1/sqrt(num_perm)
+        shingle_size: Words per shingle
+        seed: Seed for the permutation coefficients (signatures are only comparable with the same seed)
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._a = rng.integers(1, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = _shingle_hashes(text, self.shingle_size)
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        # One row per shingle, one column per permutation; keep the column minimums
+        permuted = (np.outer(hashes, self._a) + self._b) % _PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        """Estimated Jaccard similarity of the two shingle sets."""
+        return float(np.count_nonzero(first == second)) / len(first)
+
+
+class NearDuplicateFilter(BaseDocumentTransformer):
+    """
+    Drop chunks that are near-duplicates of a chunk already seen.
+
+    Args:
+        threshold: Estimated Jaccard similarity at which two chunks count as duplicates
+        num_perm: MinHash signature length
+        shingle_size: Words per shingle
+        record_sources: Add the dropped chunk's source to the kept chunk's "duplicate_sources"
+    """
+
+    def __init__(self, threshold: float = 0.85, num_perm: int = 128, shingle_size: int = 5,
+                 record_sources: bool = True):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.bands, self.rows = lsh_bands(num_perm, threshold)
+        self.record_sources = record_sources
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(self.bands)]
+        self._signatures: List[np.ndarray] = []
+        self._kept: List[Document] = []
+        self.seen = 0
+        self.dropped = 0
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def find_duplicate(self, signature: np.ndarray) -> int:
+        """Index of a kept chunk similar to `signature`, or -1."""
+        checked = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            for candidate in self._buckets[band].get(key, ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                if MinHasher.similarity(signature, self._signatures[candidate]) >= self.threshold:
+                    return candidate
+        return -1
+
+    def transform_documents(self, documents: Sequence[Document], **kwargs: Any) -> Sequence[Document]:
+        """Return the chunks that are not near-duplicates of a chunk seen so far (in this or earlier calls)."""
+        kept = []
+        for doc in documents:
+            self.seen += 1
+            signature = self.hasher.signature(doc.page_content)
+            duplicate_of = self.find_duplicate(signature)
+            if duplicate_of >= 0:
+                self.dropped += 1
+                original = self._kept[duplicate_of]
+                source = doc.metadata.get("source")
+                if self.record_sources and source is not None and source != original.metadata.get("source"):
+                    sources = original.metadata.setdefault("duplicate_sources", [])
+                    if source not in sources:
+                        sources.append(source)
+                continue
+            index = len(self._kept)
+            self._signatures.append(signature)
+            self._kept.append(doc)
+            for band, key in enumerate(self._band_keys(signature)):
+                self._buckets[band][key].append(index)
+            kept.append(doc)
+        return kept
+
+    def stats(self) -> Dict[str, int]:
+        return {"seen": self.seen, "kept": self.seen - self.dropped, "dropped": self.dropped}
+
+
+def dedupe_documents(documents: Sequence[Document], threshold: float = 0.85) -> List[Document]:
+    """One-shot near-duplicate removal over a list of chunks."""
+    return list(NearDuplicateFilter(threshold=threshold).transform_documents(documents))
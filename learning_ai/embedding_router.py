@@ -0,0 +1,240 @@
+"""
+Nearest-centroid message router over cached embeddings.
+
+Asking a chat model which destination a message belongs to costs a full LLM round
+trip. CentroidRouter instead embeds a handful of exemplar messages per destination
+once, averages them into one unit-length centroid per destination, and routes a new
+message to the centroid with the highest cosine similarity, a single small matrix
+product.
+
+A decision is `confident` when the best similarity is at least `threshold` and beats
+the runner-up by `margin`; callers fall back to the LLM otherwise.
+
+Embeddings are cached at two levels:
+
+- exemplar (and optionally query) embeddings persist on disk through LangChain's
+  CacheBackedEmbeddings, so restarting doesn't re-embed the exemplars
+- query embeddings are memoised in an in-process LRU, so repeated messages skip
+  the embedding model entirely
+
+RouterStats keeps counts, latency percentiles and, when the true destination is
+reported with record_outcome(), accuracy; log_stats() writes them to the
+`learning_ai.router` logger.
+
+Example:
+    router = CentroidRouter(embeddings, {"Billing": [...], "Support Team": [...]})
+    decision = router.route("I was charged twice this month")
+    if decision.confident:
+        ...  # decision.destination
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Deque, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger("learning_ai.router")
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "learning_ai" / "embeddings"
+
+
+class RouteDecision(NamedTuple):
+    destination: str
+    score: float
+    """Cosine similarity to the chosen destination's centroid."""
+    margin: float
+    """Difference between the best and the second-best similarity."""
+    confident: bool
+    embed_s: float
+    """Time spent getting the message embedding (0 on an LRU hit)."""
+    decide_s: float
+    """Time spent scoring against the centroids."""
+
+
+class RouterStats:
+    """Counters and latency samples for a router (latencies keep the last `window` decisions).
+
+    Updates and snapshots hold `lock`: routers are shared by executor threads.
+    """
+
+    def __init__(self, window: int = 10_000):
+        self.lock = threading.Lock()
+        self.decisions = 0
+        self.confident = 0
+        self.cache_hits = 0
+        self.correct = 0
+        self.labelled = 0
+        self.embed_s: Deque[float] = deque(maxlen=window)
+        self.decide_s: Deque[float] = deque(maxlen=window)
+
+    @staticmethod
+    def _percentile(samples: Sequence[float], p: float) -> Optional[float]:
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        with self.lock:
+            return self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Optional[float]]:
+        return {
+            "decisions": self.decisions,
+            "confident_rate": self.confident / self.decisions if self.decisions else None,
+            "embedding_cache_hit_rate": self.cache_hits / self.decisions if self.decisions else None,
+            "accuracy": self.correct / self.labelled if self.labelled else None,
+            "decide_p50_ms": _ms(self._percentile(self.decide_s, 0.50)),
+            "decide_p99_ms": _ms(self._percentile(self.decide_s, 0.99)),
+            "embed_p50_ms": _ms(self._percentile(self.embed_s, 0.50)),
+            "embed_p99_ms": _ms(self._percentile(self.embed_s, 0.99)),
+        }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 4)
+
+
+def cached_embeddings(embeddings: Embeddings, namespace: str, cache_dir: Optional[os.PathLike] = None) -> Embeddings:
+    """
+    Wrap an embedding model with LangChain's on-disk CacheBackedEmbeddings.
+
+    Args:
+        embeddings: Underlying embedding model
+        namespace: Cache namespace; use the model name so different models never share vectors
+        cache_dir: Cache location (defaults to EMBEDDING_CACHE_DIR or ~/.cache/learning_ai/embeddings)
+    """
+    from langchain.embeddings import CacheBackedEmbeddings
+    from langchain.storage import LocalFileStore
+
+    cache_dir = Path(cache_dir or os.getenv("EMBEDDING_CACHE_DIR", DEFAULT_CACHE_DIR))
+    store = LocalFileStore(str(cache_dir))
+    return CacheBackedEmbeddings.from_bytes_store(embeddings, store, namespace=namespace,
+                                                  query_embedding_cache=True)
+
+
+class CentroidRouter:
+    """
+    Route text to the destination whose exemplar centroid is most similar.
+
+    Args:
+        embeddings: Embedding model (wrap it with cached_embeddings() to persist vectors)
+        exemplars: Example messages per destination
+        threshold: Minimum cosine similarity for a confident decision
+        margin: Minimum lead over the second-best destination for a confident decision
+        query_cache_size: Query embeddings kept in the in-process LRU
+    """
+
+    def __init__(self, embeddings: Embeddings, exemplars: Dict[str, List[str]], threshold: float = 0.35,
+                 margin: float = 0.03, query_cache_size: int = 4096):
+        if not exemplars:
+            raise ValueError("CentroidRouter needs at least one destination with exemplars.")
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.margin = margin
+        self.destinations = list(exemplars)
+        self.stats = RouterStats()
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_cache_size = query_cache_size
+        # The sync classify node runs on executor threads, so the LRU is shared between threads
+        self._cache_lock = threading.Lock()
+
+        texts = [text for destination in self.destinations for text in exemplars[destination]]
+        vectors = self._normalize(np.asarray(embeddings.embed_documents(texts), dtype=np.float32))
+        centroids, start = [], 0
+        for destination in self.destinations:
+            count = len(exemplars[destination])
+            if count == 0:
+                raise ValueError(f"Destination {destination!r} has no exemplars.")
+            centroids.append(vectors[start:start + count].mean(axis=0))
+            start += count
+        self._centroids = self._normalize(np.stack(centroids))
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    def _cached(self, key: str) -> Optional[np.ndarray]:
+        with self._cache_lock:
+            vector = self._query_cache.get(key)
+            if vector is not None:
+                self._query_cache.move_to_end(key)
+        if vector is not None:
+            with self.stats.lock:
+                self.stats.cache_hits += 1
+        return vector
+
+    def _embed(self, text: str) -> np.ndarray:
+        key = text.strip()
+        vector = self._cached(key)
+        if vector is not None:
+            return vector
+        return self._remember(key, self.embeddings.embed_query(key))
+
+    def _remember(self, key: str, raw: List[float]) -> np.ndarray:
+        vector = self._normalize(np.asarray(raw, dtype=np.float32))
+        with self._cache_lock:
+            self._query_cache[key] = vector
+            self._query_cache.move_to_end(key)
+            if len(self._query_cache) > self._query_cache_size:
+                self._query_cache.popitem(last=False)
+        return vector
+
+    def _decide(self, vector: np.ndarray, embed_s: float, started: float) -> RouteDecision:
+        scores = self._centroids @ vector
+        if len(scores) > 1:
+            second, best = np.argpartition(scores, -2)[-2:]
+            margin = float(scores[best] - scores[second])
+        else:
+            best, margin = 0, float(scores[0])
+        score = float(scores[best])
+        confident = score >= self.threshold and margin >= self.margin
+        decide_s = time.perf_counter() - started
+
+        with self.stats.lock:
+            self.stats.decisions += 1
+            self.stats.confident += confident
+            self.stats.embed_s.append(embed_s)
+            self.stats.decide_s.append(decide_s)
+        return RouteDecision(self.destinations[int(best)], score, margin, confident, embed_s, decide_s)
+
+    def route(self, text: str) -> RouteDecision:
+        """Classify one message."""
+        started = time.perf_counter()
+        vector = self._embed(text)
+        embedded = time.perf_counter()
+        return self._decide(vector, embedded - started, embedded)
+
+    async def aroute(self, text: str) -> RouteDecision:
+        """Classify one message, embedding it with the model's async API on an LRU miss."""
+        started = time.perf_counter()
+        key = text.strip()
+        vector = self._cached(key)
+        if vector is None:
+            vector = self._remember(key, await self.embeddings.aembed_query(key))
+        embedded = time.perf_counter()
+        return self._decide(vector, embedded - started, embedded)
+
+    def record_outcome(self, predicted: str, actual: str) -> None:
+        """Report where a routed message really belonged (e.g. the LLM fallback's choice or a human fix)."""
+        with self.stats.lock:
+            self.stats.labelled += 1
+            self.stats.correct += predicted.strip().lower() == actual.strip().lower()
+
+    def evaluate(self, labelled: Dict[str, List[str]]) -> float:
+        """Route labelled messages ({destination: [messages]}) and return the accuracy."""
+        for destination, texts in labelled.items():
+            for text in texts:
+                self.record_outcome(self.route(text).destination, destination)
+        with self.stats.lock:
+            return self.stats.correct / self.stats.labelled if self.stats.labelled else 0.0
+
+    def log_stats(self, level: int = logging.INFO) -> None:
+        logger.log(level, "router stats: %s", self.stats.snapshot())
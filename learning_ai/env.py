@@ -0,0 +1,26 @@
+"""
+Environment handling shared by the examples.
+
+load_env() replaces the `load_dotenv()` + `os.environ[...] = os.getenv(...)` preamble
+the scripts used to run at import time. It is called lazily when a model or client is
+first built, so importing a graph module has no side effects.
+"""
+
+import functools
+import os
+
+
+@functools.lru_cache(maxsize=None)
+def load_env() -> None:
+    """Load the repository .env file once per process."""
+    from dotenv import load_dotenv  # imported here so `import learning_ai` stays cheap
+    load_dotenv()
+
+
+def require_env(name: str) -> str:
+    """Return an environment variable, raising a clear error if it is not set."""
+    load_env()
+    value = os.getenv(name)
+    if not value:
+        raise ValueError(f"{name} environment variable is not set.")
+    return value
@@ -0,0 +1,241 @@
+"""
+Opt-in, offline rendering of LangGraph diagrams.
+
+draw_mermaid_png() sends the graph to a remote rendering service, so every script
+paid a network round trip (and failed offline) just to draw a picture. render_graph()
+does nothing unless rendering was asked for (RENDER_GRAPHS=1 or --draw on the command
+line). When it does run, it renders locally:
+
+- with Graphviz (`dot`) if it is installed, as SVG or PNG
+- otherwise with a small pure-Python layered SVG layout
+
+Diagrams are cached by a hash of the graph structure, so an unchanged graph is
+never rendered twice.
+
+Example:
+    render_graph(react_graph, "react_graph")   # writes ./react_graph.svg when enabled
+"""
+
+import hashlib
+import html
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "learning_ai" / "graphs"
+
+
+def rendering_enabled() -> bool:
+    """True if the user opted in with RENDER_GRAPHS=1 or --draw."""
+    return os.getenv("RENDER_GRAPHS", "").lower() in ("1", "true", "yes") or "--draw" in sys.argv
+
+
+def _structure(graph: Any) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str, bool, Optional[str]]]]:
+    """(nodes, edges) of a compiled graph; nodes as (id, label), edges as (source, target, conditional, label)."""
+    drawable = graph.get_graph()
+    nodes = [(node.id, node.name) for node in drawable.nodes.values()]
+    edges = [
+        (edge.source, edge.target, bool(edge.conditional), None if edge.data is None else str(edge.data))
+        for edge in drawable.edges
+    ]
+    return nodes, edges
+
+
+def structure_hash(nodes, edges) -> str:
+    payload = json.dumps({"nodes": nodes, "edges": edges}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+# ========================
+# Graphviz
+# ========================
+
+def to_dot(nodes, edges) -> str:
+    """Graphviz DOT source for the graph."""
+    def quote(text: str) -> str:
+        return '"' + text.replace('"', '\\"') + '"'
+
+    lines = ["digraph G {", "  rankdir=TB;", '  node [shape=box, style="rounded,filled", fillcolor="#f2f0ff", fontname="Helvetica"];']
+    for node_id, label in nodes:
+        shape = ', shape=oval, fillcolor="#e0e0e0"' if node_id in ("__start__", "__end__") else ""
+        lines.append(f"  {quote(node_id)} [label={quote(label)}{shape}];")
+    for source, target, conditional, label in edges:
+        attrs = ["style=dashed"] if conditional else []
+        if label:
+            attrs.append(f"label={quote(label)}")
+        suffix = f" [{', '.join(attrs)}]" if attrs else ""
+        lines.append(f"  {quote(source)} -> {quote(target)}{suffix};")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def _render_graphviz(nodes, edges, fmt: str) -> Optional[bytes]:
+    dot = shutil.which("dot")
+    if dot is None:
+        return None
+    result = subprocess.run([dot, f"-T{fmt}"], input=to_dot(nodes, edges).encode(),
+                            capture_output=True, check=False)
+    return result.stdout if result.returncode == 0 else None
+
+
+# ========================
+# Pure-Python SVG
+# ========================
+
+_NODE_HEIGHT = 36
+_RANK_GAP = 80
+_NODE_GAP = 40
+_CHAR_WIDTH = 8
+
+
+def _ranks(nodes, edges) -> Dict[str, int]:
+    """Longest-path layering from the start node(s), ignoring edges that close cycles."""
+    ids = [node_id for node_id, _ in nodes]
+    children: Dict[str, List[str]] = {node_id: [] for node_id in ids}
+    for source, target, _, _ in edges:
+        children.setdefault(source, []).append(target)
+
+    # Find back edges with an iterative DFS so loops (tools -> assistant) don't break layering
+    back_edges = set()
+    state: Dict[str, int] = {}
+    for root in ids:
+        if root in state:
+            continue
+        stack = [(root, iter(children.get(root, [])))]
+        state[root] = 1
+        while stack:
+            node, it = stack[-1]
+            child = next(it, None)
+            if child is None:
+                state[node] = 2
+                stack.pop()
+            elif state.get(child) == 1:
+                back_edges.add((node, child))
+            elif child not in state:
+                state[child] = 1
+                stack.append((child, iter(children.get(child, []))))
+
+    rank = {node_id: 0 for node_id in ids}
+    changed = True
+    while changed:  # the graph is a DAG once back edges are ignored, so this terminates
+        changed = False
+        for source, target, _, _ in edges:
+            if (source, target) not in back_edges and rank.get(target, 0) < rank.get(source, 0) + 1:
+                rank[target] = rank.get(source, 0) + 1
+                changed = True
+    if "__end__" in rank:
+        rank["__end__"] = max(rank.values())  # keep END at the bottom
+    return rank
+
+
+def to_svg(nodes, edges) -> str:
+    """Render the graph as a standalone SVG document."""
+    rank = _ranks(nodes, edges)
+    labels = dict(nodes)
+    rows: Dict[int, List[str]] = {}
+    for node_id, _ in nodes:
+        rows.setdefault(rank[node_id], []).append(node_id)
+
+    width_of = {node_id: max(80, len(label) * _CHAR_WIDTH + 24) for node_id, label in nodes}
+    row_widths = {r: sum(width_of[n] for n in row) + _NODE_GAP * (len(row) - 1) for r, row in rows.items()}
+    canvas_width = max(row_widths.values(), default=0) + 2 * _NODE_GAP + 120
+    canvas_height = (max(rows, default=0) + 1) * (_NODE_HEIGHT + _RANK_GAP) + _NODE_GAP
+
+    pos: Dict[str, Tuple[float, float]] = {}
+    for r, row in rows.items():
+        x = (canvas_width - row_widths[r]) / 2
+        y = _NODE_GAP + r * (_NODE_HEIGHT + _RANK_GAP)
+        for node_id in row:
+            pos[node_id] = (x, y)
+            x += width_of[node_id] + _NODE_GAP
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{canvas_width:.0f}" height="{canvas_height:.0f}" '
+        f'font-family="Helvetica, Arial, sans-serif" font-size="13">',
+        '<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" markerHeight="8" '
+        'orient="auto-start-reverse"><path d="M 0 0 L 10 5 L 0 10 z" fill="#555"/></marker></defs>',
+    ]
+    for source, target, conditional, label in edges:
+        sx, sy = pos[source]
+        tx, ty = pos[target]
+        x1, x2 = sx + width_of[source] / 2, tx + width_of[target] / 2
+        dash = ' stroke-dasharray="6 4"' if conditional else ""
+        if rank[target] > rank[source]:
+            y1, y2 = sy + _NODE_HEIGHT, ty
+            path = f"M {x1:.0f} {y1:.0f} L {x2:.0f} {y2:.0f}"
+            mx, my = (x1 + x2) / 2, (y1 + y2) / 2
+        else:
+            # Edge back up the graph: loop around the right-hand side
+            x1, x2 = sx + width_of[source], tx + width_of[target]
+            y1, y2 = sy + _NODE_HEIGHT / 2, ty + _NODE_HEIGHT / 2
+            bend = max(x1, x2) + 60
+            path = f"M {x1:.0f} {y1:.0f} C {bend:.0f} {y1:.0f}, {bend:.0f} {y2:.0f}, {x2:.0f} {y2:.0f}"
+            mx, my = bend - 15, (y1 + y2) / 2
+        parts.append(f'<path d="{path}" fill="none" stroke="#555"{dash} marker-end="url(#arrow)"/>')
+        if label:
+            parts.append(f'<text x="{mx:.0f}" y="{my:.0f}" fill="#333" text-anchor="middle">{html.escape(label)}</text>')
+    for node_id, (x, y) in pos.items():
+        terminal = node_id in ("__start__", "__end__")
+        fill = "#e0e0e0" if terminal else "#f2f0ff"
+        radius = _NODE_HEIGHT / 2 if terminal else 8
+        parts.append(
+            f'<rect x="{x:.0f}" y="{y:.0f}" width="{width_of[node_id]}" height="{_NODE_HEIGHT}" '
+            f'rx="{radius:.0f}" fill="{fill}" stroke="#6b5fb5"/>'
+        )
+        parts.append(
+            f'<text x="{x + width_of[node_id] / 2:.0f}" y="{y + _NODE_HEIGHT / 2 + 4:.0f}" '
+            f'text-anchor="middle">{html.escape(labels[node_id])}</text>'
+        )
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+# ========================
+# Entry point
+# ========================
+
+def render_graph(graph: Any, name: str, fmt: str = "svg", output_dir: os.PathLike = ".",
+                 force: bool = False) -> Optional[Path]:
+    """
+    Write a diagram of a compiled graph to <output_dir>/<name>.<fmt>.
+
+    Args:
+        graph: Anything with get_graph() (a compiled LangGraph or a Runnable)
+        name: Output file name without extension
+        fmt: "svg" or "png" (PNG needs Graphviz; falls back to SVG without it)
+        output_dir: Directory for the output file
+        force: Render even if rendering wasn't enabled via RENDER_GRAPHS / --draw
+
+    Returns:
+        Path of the written file, or None if rendering is disabled
+    """
+    if not (force or rendering_enabled()):
+        return None
+
+    nodes, edges = _structure(graph)
+    cache_dir = Path(os.getenv("GRAPH_CACHE_DIR", DEFAULT_CACHE_DIR))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    digest = structure_hash(nodes, edges)
+
+    data = None
+    for candidate in ([fmt, "svg"] if fmt != "svg" else ["svg"]):
+        cached = cache_dir / f"{digest}.{candidate}"
+        if cached.exists():
+            data, fmt = cached.read_bytes(), candidate
+            break
+        data = _render_graphviz(nodes, edges, candidate)
+        if data is None and candidate == "svg":
+            data = to_svg(nodes, edges).encode()
+        if data is not None:
+            fmt = candidate
+            cached.write_bytes(data)
+            break
+
+    output = Path(output_dir) / f"{name}.{fmt}"
+    output.write_bytes(data)
+    print(f"Graph diagram saved to: {output}")
+    return output
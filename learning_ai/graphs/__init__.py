@@ -0,0 +1,43 @@
+"""
+LangGraph workflows as factory functions.
+
+Each module builds its graph only when its factory is called, and every factory
+accepts an `llm` argument so the default provider model can be swapped (for a
+cheaper model, or a fake one in benchmarks).
+
+    build_chatbot_graph       learning_ai.graphs.chatbot        (LangGraph/1-chatbot.py)
+    build_react_graph         learning_ai.graphs.react_math     (LangGraph/2-..., 3-...)
+    build_parallel_graph      learning_ai.graphs.parallel       (LangGraph/4-Parallel_Workflow.py)
+    build_map_reduce_graph    learning_ai.graphs.parallel
+    build_routing_graph       learning_ai.graphs.routing        (LangGraph/5-Routing_workflow.py --llm-only)
+    build_embedding_routing_graph  learning_ai.graphs.routing   (LangGraph/5-Routing_workflow.py)
+    build_orchestrator_graph  learning_ai.graphs.orchestrator   (LangGraph/6-orchestrator.py --agent)
+    build_worker_pool_graph   learning_ai.graphs.orchestrator   (LangGraph/6-orchestrator.py)
+    build_joke_graph          learning_ai.graphs.joke           (LangGraph/tell_Joke.py)
+    build_joke_judge_graph    learning_ai.graphs.joke           (LangGraph/tell_Joke.py --judge)
+"""
+
+import importlib
+
+_FACTORIES = {
+    "build_chatbot_graph": "learning_ai.graphs.chatbot",
+    "build_react_graph": "learning_ai.graphs.react_math",
+    "build_parallel_graph": "learning_ai.graphs.parallel",
+    "build_map_reduce_graph": "learning_ai.graphs.parallel",
+    "build_routing_graph": "learning_ai.graphs.routing",
+    "build_embedding_routing_graph": "learning_ai.graphs.routing",
+    "build_orchestrator_graph": "learning_ai.graphs.orchestrator",
+    "build_worker_pool_graph": "learning_ai.graphs.orchestrator",
+    "build_joke_graph": "learning_ai.graphs.joke",
+    "build_joke_judge_graph": "learning_ai.graphs.joke",
+}
+
+
+def __getattr__(name):
+    if name in _FACTORIES:
+        return getattr(importlib.import_module(_FACTORIES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_FACTORIES))
@@ -0,0 +1,68 @@
+"""
+Streaming chatbot graph used by LangGraph/1-chatbot.py.
+
+Conversation history is kept per thread_id by the checkpointer and bounded: the
+chatbot node sends only the most recent `max_history_tokens` of it to the model and
+removes older messages from the stored state.
+"""
+
+import os
+from typing import Annotated, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AnyMessage, RemoveMessage, trim_messages
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+from typing_extensions import TypedDict
+
+
+class State(TypedDict):
+    # add_messages appends new messages to the history instead of replacing it
+    messages: Annotated[list[AnyMessage], add_messages]
+
+
+def build_chatbot_graph(llm: Optional[BaseChatModel] = None, checkpointer=None,
+                        max_history_tokens: Optional[int] = None):
+    """
+    Build the chatbot graph.
+
+    Args:
+        llm: Chat model to use (defaults to the shared Groq gemma2 client)
+        checkpointer: Checkpointer holding each thread's history (defaults to MemorySaver)
+        max_history_tokens: Approximate token budget for the history sent to the model
+            (defaults to MAX_HISTORY_TOKENS or 2000)
+
+    Returns:
+        The compiled graph; stream it with stream_mode="messages" to get tokens
+    """
+    if llm is None:
+        from learning_ai.env import require_env
+        from learning_ai.llm_clients import get_chat_model
+        llm = get_chat_model("groq", "gemma2-9b-it", api_key=require_env("GROQ_API_KEY"), temperature=0.7)
+    if checkpointer is None:
+        from langgraph.checkpoint.memory import MemorySaver
+        checkpointer = MemorySaver()
+    max_history_tokens = max_history_tokens or int(os.getenv("MAX_HISTORY_TOKENS", "2000"))
+
+    def chatbot(state: State) -> State:
+        history = state["messages"]
+        kept = trim_messages(
+            history,
+            max_tokens=max_history_tokens,
+            strategy="last",
+            token_counter=count_tokens_approximately,
+            include_system=True,
+            start_on="human",
+        )
+        response = llm.invoke(kept)
+        # Drop the trimmed-off messages from the stored state so it stays bounded too
+        kept_ids = {m.id for m in kept}
+        removed = [RemoveMessage(id=m.id) for m in history if m.id not in kept_ids]
+        return {"messages": removed + [response]}
+
+    graph_builder = StateGraph(State)
+    graph_builder.add_node("chatbot", chatbot)
+    graph_builder.add_edge(START, "chatbot")
+    graph_builder.add_edge("chatbot", END)
+    return graph_builder.compile(checkpointer=checkpointer)
@@ -0,0 +1,207 @@
+"""
+Joke workflows used by LangGraph/tell_Joke.py.
+
+build_joke_graph is the original prompt chain: generate, a string heuristic gate, then
+two more calls (improve, finalize) whenever the gate fails.
+
+build_joke_judge_graph is an evaluator-optimizer loop: a cheaper judge model scores
+each joke and the loop stops as soon as a joke reaches `threshold` or `max_iterations`
+rounds are spent, returning the best joke seen. With speculative=True each round
+generates an improved joke and a fresh alternative draft in parallel, judges both in
+parallel and keeps the better one, so a round costs one generation + one judging of
+latency while giving two chances to pass.
+"""
+
+import operator
+import re
+from typing import Annotated, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langgraph.graph import END, START, StateGraph
+from typing_extensions import TypedDict
+
+
+class State(TypedDict):
+    topic: str
+    joke: str
+    improved_joke: str
+    final_joke: str
+
+
+def check_punchline(state: State):
+    """Gate function to check if the joke is funny"""
+    # Simple check - does the joke contain "?" or "!"
+    if "?" in state["joke"] or "!" in state["joke"]:
+        return "Fail"
+    return "Pass"
+
+
+def build_joke_graph(llm: Optional[BaseChatModel] = None):
+    """
+    Build the generate -> gate -> improve -> finalize joke workflow.
+
+    Args:
+        llm: Chat model to use (defaults to the shared Groq mixtral client)
+
+    Returns:
+        The compiled graph; invoke it with {"topic": ...}
+    """
+    if llm is None:
+        from learning_ai.llm_clients import get_chat_model
+        llm = get_chat_model("groq", "mixtral-8x7b-32768")
+
+    def generate_joke(state: State):
+        """First LLM call to generate a joke"""
+        msg = llm.invoke(f"Generate a joke about {state['topic']}")
+        return {"joke": msg.content}
+
+    def improve_joke(state: State):
+        """Second LLM call to improve the joke"""
+        msg = llm.invoke(f"Make this joke funnier by adding wordplay: {state['joke']}")
+        return {"improved_joke": msg.content}
+
+    def final_joke(state: State):
+        """Final LLM call to generate the final joke"""
+        msg = llm.invoke(f"Generate a final joke: {state['improved_joke']}")
+        return {"final_joke": msg.content}
+
+    # Build the workflow
+    workflow = StateGraph(State)
+    workflow.add_node("generate_joke", generate_joke)
+    workflow.add_node("improve_joke", improve_joke)
+    workflow.add_node("generate_final_joke", final_joke)
+
+    # Add edges
+    workflow.add_edge(START, "generate_joke")
+    workflow.add_conditional_edges(
+        "generate_joke",
+        check_punchline,
+        {"Fail": "improve_joke", "Pass": END}
+    )
+    workflow.add_edge("improve_joke", "generate_final_joke")
+    workflow.add_edge("generate_final_joke", END)
+
+    return workflow.compile()
+
+
+# ========================
+# Evaluator-optimizer loop
+# ========================
+
+JUDGE_PROMPT = (
+    "Rate how funny this joke about {topic} is on a scale of 1 to 10.\n"
+    "Reply with the number on the first line and one sentence of feedback on the second.\n\n"
+    "Joke: {joke}"
+)
+
+# The score must open the first line ("8", "8/10", "Score: 8", "**8**"); a number buried in a
+# sentence ("On a scale of 1 to 10, I'd give it 8") is not trusted
+_SCORE = re.compile(r"[\s*#]*(?:score|rating)?\W*(10|[1-9])(?:\s*/\s*10)?(?!\d|\s*(?:to|-)\s*\d)", re.IGNORECASE)
+
+
+class Attempt(TypedDict):
+    joke: str
+    score: int
+    feedback: str
+
+
+class JudgeState(TypedDict):
+    topic: str
+    joke: str
+    score: int
+    feedback: str
+    iterations: int
+    # Every judged joke, so the best one can be returned even if none passes
+    attempts: Annotated[list[Attempt], operator.add]
+    final_joke: str
+
+
+def parse_judgement(text: str) -> tuple[int, str]:
+    """(score, feedback) from the judge's reply; a reply whose first line doesn't start with the score scores 0."""
+    lines = [line.strip() for line in text.strip().splitlines() if line.strip()]
+    match = _SCORE.match(lines[0]) if lines else None
+    score = int(match.group(1)) if match else 0
+    feedback = lines[1] if len(lines) > 1 else (lines[0] if lines else "")
+    return score, feedback
+
+
+def build_joke_judge_graph(llm: Optional[BaseChatModel] = None, judge_llm: Optional[BaseChatModel] = None,
+                           threshold: int = 7, max_iterations: int = 2, speculative: bool = False):
+    """
+    Build the generate -> judge -> (improve -> judge)* joke loop.
+
+    Args:
+        llm: Chat model writing the jokes (defaults to the shared Groq mixtral client)
+        judge_llm: Cheaper model scoring them (defaults to Groq llama-3.1-8b-instant at
+            temperature 0, so repeated judgements come from the response cache)
+        threshold: Score (1-10) that ends the loop early
+        max_iterations: Improvement rounds after the first draft
+        speculative: Generate an improvement and an alternative draft in parallel each round
+
+    Returns:
+        The compiled graph; invoke it with {"topic": ...}, the answer is in "final_joke"
+    """
+    from learning_ai.llm_clients import get_chat_model
+
+    llm = llm or get_chat_model("groq", "mixtral-8x7b-32768")
+    judge_llm = judge_llm or get_chat_model("groq", "llama-3.1-8b-instant", temperature=0)
+
+    def draft_prompt(state: JudgeState) -> str:
+        return f"Generate a joke about {state['topic']}"
+
+    def improve_prompt(state: JudgeState) -> str:
+        return (f"Make this joke funnier by adding wordplay: {state['joke']}\n"
+                f"A reviewer said: {state['feedback']}\nReply with the joke only.")
+
+    def judge(topic: str, jokes: list[str]) -> list[Attempt]:
+        replies = judge_llm.batch([JUDGE_PROMPT.format(topic=topic, joke=joke) for joke in jokes])
+        attempts = []
+        for joke, reply in zip(jokes, replies):
+            score, feedback = parse_judgement(reply.content)
+            attempts.append({"joke": joke, "score": score, "feedback": feedback})
+        return attempts
+
+    def best_update(attempts: list[Attempt], iterations: int):
+        best = max(attempts, key=lambda attempt: attempt["score"])
+        return {"joke": best["joke"], "score": best["score"], "feedback": best["feedback"],
+                "iterations": iterations, "attempts": attempts}
+
+    def generate_and_judge(state: JudgeState):
+        """First draft, scored by the judge"""
+        joke = llm.invoke(draft_prompt(state)).content
+        return best_update(judge(state["topic"], [joke]), 0)
+
+    def improve_and_judge(state: JudgeState):
+        """Improve the current joke using the judge's feedback"""
+        joke = llm.invoke(improve_prompt(state)).content
+        return best_update(judge(state["topic"], [joke]), state["iterations"] + 1)
+
+    def speculate_and_judge(state: JudgeState):
+        """Improve the current joke and write a fresh draft in parallel; keep the better one"""
+        candidates = [reply.content for reply in llm.batch([improve_prompt(state), draft_prompt(state)])]
+        return best_update(judge(state["topic"], candidates), state["iterations"] + 1)
+
+    def finalize(state: JudgeState):
+        """Return the best joke judged so far (no extra LLM call)"""
+        best = max(state["attempts"], key=lambda attempt: attempt["score"])
+        return {"final_joke": best["joke"], "score": best["score"]}
+
+    def should_continue(state: JudgeState):
+        """Gate: stop once the judge is happy or the budget is spent"""
+        if state["score"] >= threshold or state["iterations"] >= max_iterations:
+            return "Done"
+        return "Improve"
+
+    improve_node = speculate_and_judge if speculative else improve_and_judge
+
+    workflow = StateGraph(JudgeState)
+    workflow.add_node("generate_joke", generate_and_judge)
+    workflow.add_node("improve_joke", improve_node)
+    workflow.add_node("finalize", finalize)
+
+    workflow.add_edge(START, "generate_joke")
+    for node in ("generate_joke", "improve_joke"):
+        workflow.add_conditional_edges(node, should_continue, {"Improve": "improve_joke", "Done": "finalize"})
+    workflow.add_edge("finalize", END)
+
+    return workflow.compile()
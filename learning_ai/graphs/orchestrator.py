@@ -0,0 +1,290 @@
+"""
+Orchestrator-worker graphs used by LangGraph/6-orchestrator.py.
+
+build_orchestrator_graph is the original tool-calling agent: the model calls
+process_task / report_status and ToolNode runs them.
+
+build_worker_pool_graph is a planner -> workers -> synthesizer pipeline:
+
+- plan: the LLM splits the request into independent subtasks (skipped when the input
+  already lists them)
+- worker: one Send per subtask; each runs the worker function in a bounded
+  process pool (CPU-bound work) or thread pool (I/O-bound work, e.g. LLM calls),
+  so subtasks really run in parallel
+- synthesize: the LLM combines the worker results into one answer
+
+Results are merged through a reducer-annotated `results` field, and an optional
+on_progress callback is told about every finished subtask.
+
+With task_queue=... the workers are not local at all: each subtask is enqueued on a
+durable queue (learning_ai/task_queue.py) and the graph waits for whichever worker
+process, on any machine, leases and finishes it.
+"""
+
+import hashlib
+import operator
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Annotated, Callable, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Send
+from pydantic import BaseModel, Field
+from typing_extensions import TypedDict
+
+from learning_ai.graphs.tool_agent import build_tool_agent_graph
+
+if TYPE_CHECKING:
+    from learning_ai.task_queue import TaskQueue
+
+SYSTEM_PROMPT = "You are an orchestrator managing tasks and workers."
+
+
+def process_task(task: str) -> str:
+    """Process a task by a worker.
+
+    Args:
+        task: The task to be processed
+    """
+    return f"Task '{task}' processed by worker."
+
+
+def report_status(status: str) -> str:
+    """Report the status of a task.
+
+    Args:
+        status: The status to be reported
+    """
+    return f"Status '{status}' reported by worker."
+
+
+TOOLS = [process_task, report_status]
+
+
+def build_orchestrator_graph(llm: Optional[BaseChatModel] = None, checkpointer=None):
+    """
+    Build the orchestrator graph.
+
+    Args:
+        llm: Chat model to use (defaults to the shared gpt-4o client)
+        checkpointer: Optional LangGraph checkpointer for per-thread memory
+
+    Returns:
+        The compiled graph
+    """
+    if llm is None:
+        from learning_ai.llm_clients import get_chat_model
+        llm = get_chat_model("openai", "gpt-4o")
+    # ToolNode runs the tool calls of one turn concurrently
+    return build_tool_agent_graph(llm, TOOLS, SYSTEM_PROMPT, checkpointer=checkpointer, parallel_tool_calls=True)
+
+
+# ========================
+# Planner -> worker pool -> synthesizer
+# ========================
+
+PLANNER_PROMPT = (
+    "You are an orchestrator. Split the request below into at most {max_subtasks} independent "
+    "subtasks that workers can do in parallel. Each subtask must make sense on its own.\n\n"
+    "Request: {request}"
+)
+
+SYNTHESIZER_PROMPT = (
+    "You are an orchestrator. Combine the workers' results into one answer to the request.\n\n"
+    "Request: {request}\n\nResults:\n{results}"
+)
+
+
+class Plan(BaseModel):
+    """Subtasks for the workers."""
+
+    subtasks: List[str] = Field(description="Independent subtasks, one sentence each")
+
+
+class Subtask(TypedDict):
+    id: int
+    description: str
+
+
+class WorkerResult(TypedDict):
+    id: int
+    description: str
+    output: str
+    error: Optional[str]
+    elapsed_s: float
+    worker: str  # "host:pid" of the process that ran the subtask
+
+
+class WorkerPoolState(TypedDict):
+    request: str
+    run_id: str
+    subtasks: list[Subtask]
+    # Each worker appends its own result
+    results: Annotated[list[WorkerResult], operator.add]
+    summary: str
+
+
+class WorkerInput(TypedDict):
+    run_id: str
+    total: int
+    subtask: Subtask
+
+
+def simulated_workload(description: str, rounds: int = 200_000) -> str:
+    """
+    CPU-bound stand-in for real work: repeated hashing seeded by the subtask.
+
+    It is a module-level function so a process pool can pickle it.
+    """
+    digest = description.encode()
+    for _ in range(rounds):
+        digest = hashlib.sha256(digest).digest()
+    return f"Task '{description}' processed by worker {os.getpid()} ({digest.hex()[:12]})."
+
+
+def _run_timed(worker: Callable[[str], str], description: str):
+    started = time.perf_counter()
+    return worker(description), time.perf_counter() - started, f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LazyPool:
+    """
+    Executor created on the first submit(), so building a graph starts no processes.
+
+    shutdown() stops the executor if it was started; a later submit() starts a new one.
+    """
+
+    def __init__(self, factory: Callable[[], Executor]):
+        self._factory = factory
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._factory()
+            return self._executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+def build_worker_pool_graph(llm: Optional[BaseChatModel] = None, worker: Callable[[str], str] = simulated_workload,
+                            executor: str = "process", max_workers: Optional[int] = None, max_subtasks: int = 8,
+                            on_progress: Optional[Callable[[int, int, WorkerResult], None]] = None,
+                            task_queue: Optional["TaskQueue"] = None, queue_name: str = "orchestrator",
+                            handler: str = "simulated_workload", task_timeout_s: Optional[float] = None):
+    """
+    Build the planner -> worker pool -> synthesizer graph.
+
+    Args:
+        llm: Chat model for planning and synthesis (defaults to the shared gpt-4o client)
+        worker: Function run for each subtask (description -> result text); must be a
+            module-level function when executor="process"
+        executor: "process" for CPU-bound workers, "thread" for I/O-bound ones
+        max_workers: Pool size (defaults to the number of CPUs)
+        max_subtasks: Upper bound on subtasks the planner may create
+        on_progress: Called as on_progress(done, total, result) after each subtask finishes
+        task_queue: Send subtasks to this durable queue instead of a local pool; start workers
+            with `python -m learning_ai.task_queue worker --queue <queue_name>`
+        queue_name: Queue the subtasks go to
+        handler: Registered task handler the queue workers run (see task_queue.HANDLERS)
+        task_timeout_s: How long to wait for a queued subtask before reporting it as failed
+
+    Returns:
+        The compiled graph; invoke it with {"request": ...} (optionally with "subtasks" to
+        skip planning). The local pool is graph.pool (None with task_queue), a LazyPool
+        started on the first dispatch; call graph.pool.shutdown() when done.
+    """
+    if llm is None:
+        from learning_ai.llm_clients import get_chat_model
+        llm = get_chat_model("openai", "gpt-4o")
+    max_workers = max_workers or os.cpu_count() or 1
+    pool: Optional[LazyPool] = None
+    if task_queue is None:
+        executor_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+        pool = LazyPool(lambda: executor_cls(max_workers=max_workers))
+    planner = llm.with_structured_output(Plan)
+    progress_lock = threading.Lock()
+    done_by_run: dict[str, int] = {}
+
+    def plan(state: WorkerPoolState):
+        """Decompose the request into subtasks (unless they were given)"""
+        run_id = uuid.uuid4().hex
+        if state.get("subtasks"):
+            return {"run_id": run_id}
+        result = planner.invoke(PLANNER_PROMPT.format(max_subtasks=max_subtasks, request=state["request"]))
+        descriptions = [text for text in result.subtasks if text.strip()][:max_subtasks] or [state["request"]]
+        return {"run_id": run_id, "subtasks": [{"id": i, "description": text} for i, text in enumerate(descriptions)]}
+
+    def dispatch(state: WorkerPoolState):
+        """One worker per subtask"""
+        total = len(state["subtasks"])
+        return [Send("worker", {"run_id": state["run_id"], "total": total, "subtask": subtask})
+                for subtask in state["subtasks"]]
+
+    def run_queued(state: WorkerInput):
+        """Enqueue one subtask and wait for a queue worker to finish it"""
+        subtask = state["subtask"]
+        # Deterministic id: re-running this node (e.g. on a graph retry) doesn't enqueue a duplicate
+        task_id = task_queue.enqueue(queue_name, {"handler": handler, "args": [subtask["description"]]},
+                                     task_id=f"{state['run_id']}-{subtask['id']}")
+        record = task_queue.wait(task_id, timeout=task_timeout_s)
+        if record.status != "done":
+            raise RuntimeError(record.error or "task failed")
+        return record.result["output"], record.result["elapsed_s"], record.result["worker"]
+
+    def run_worker(state: WorkerInput):
+        """Run one subtask in the pool (or on the task queue)"""
+        subtask = state["subtask"]
+        try:
+            if task_queue is not None:
+                output, elapsed, worker_id = run_queued(state)
+            else:
+                output, elapsed, worker_id = pool.submit(_run_timed, worker, subtask["description"]).result()
+            error = None
+        except Exception as e:  # a failed subtask is reported, not fatal
+            output, elapsed, worker_id, error = "", 0.0, "", f"{type(e).__name__}: {e}"
+        result: WorkerResult = {"id": subtask["id"], "description": subtask["description"], "output": output,
+                                "error": error, "elapsed_s": round(elapsed, 4), "worker": worker_id}
+        if on_progress is not None:
+            # Counted per run, so concurrent invocations of the graph don't mix their progress
+            with progress_lock:
+                done = done_by_run.get(state["run_id"], 0) + 1
+                if done == state["total"]:
+                    done_by_run.pop(state["run_id"], None)
+                else:
+                    done_by_run[state["run_id"]] = done
+                on_progress(done, state["total"], result)
+        return {"results": [result]}
+
+    def synthesize(state: WorkerPoolState):
+        """Combine the worker results"""
+        ordered = sorted(state["results"], key=lambda result: result["id"])
+        lines = "\n".join(
+            f"{result['id'] + 1}. {result['description']}: "
+            + (result["output"] if result["error"] is None else f"FAILED ({result['error']})")
+            for result in ordered
+        )
+        summary = llm.invoke(SYNTHESIZER_PROMPT.format(request=state["request"], results=lines))
+        return {"summary": summary.content}
+
+    builder = StateGraph(WorkerPoolState)
+    builder.add_node("plan", plan)
+    builder.add_node("worker", run_worker)
+    builder.add_node("synthesize", synthesize)
+    builder.add_edge(START, "plan")
+    builder.add_conditional_edges("plan", dispatch, ["worker"])
+    builder.add_edge("worker", "synthesize")
+    builder.add_edge("synthesize", END)
+    graph = builder.compile()
+    graph.pool = pool
+    return graph
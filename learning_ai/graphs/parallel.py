@@ -0,0 +1,162 @@
+"""
+Parallel content workflows used by LangGraph/4-Parallel_Workflow.py.
+
+build_parallel_graph runs three fixed branches (joke/story/poem) for one topic.
+build_map_reduce_graph creates its branches at runtime with Send: one worker per
+topic x content type, so one graph run can process any number of topics. Cap the
+number of workers running at once with config={"max_concurrency": N}.
+"""
+
+import operator
+from typing import Annotated, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Send
+from typing_extensions import TypedDict
+
+CONTENT_TYPES = ["joke", "story", "poem"]
+
+
+def _default_llm(priority: Optional[int] = None) -> BaseChatModel:
+    from learning_ai.llm_clients import get_chat_model
+    return get_chat_model("groq", "mixtral-8x7b-32768", priority=priority)
+
+
+# ========================
+# Fixed three-branch workflow
+# ========================
+
+class State(TypedDict):
+    topic: str
+    joke: str
+    story: str
+    poem: str
+    combined_content: str
+
+
+def aggregate_content(state: State):
+    """Combine the joke, story, and poem into one string"""
+    combined = (
+        f"Here's a story, joke, and poem about {state['topic']}:\n\n"
+        f"Story: {state['story']}\n\n"
+        f"Joke: {state['joke']}\n\n"
+        f"Poem: {state['poem']}\n\n"
+    )
+    return {"combined_content": combined}
+
+
+def build_parallel_graph(llm: Optional[BaseChatModel] = None):
+    """
+    Build the joke/story/poem fan-out for a single topic.
+
+    Args:
+        llm: Chat model to use (defaults to the shared Groq mixtral client)
+
+    Returns:
+        The compiled graph; invoke it with {"topic": ...}
+    """
+    llm = llm or _default_llm()
+
+    def generate_joke(state: State):
+        """Generate a joke"""
+        msg = llm.invoke(f"Generate a joke about {state['topic']}")
+        return {"joke": msg.content}
+
+    def generate_story(state: State):
+        """Generate a story"""
+        msg = llm.invoke(f"Generate a story about {state['topic']}")
+        return {"story": msg.content}
+
+    def generate_poem(state: State):
+        """Generate a poem"""
+        msg = llm.invoke(f"Generate a poem about {state['topic']}")
+        return {"poem": msg.content}
+
+    parallel_workflow = StateGraph(State)
+    parallel_workflow.add_node("generate_joke", generate_joke)
+    parallel_workflow.add_node("generate_story", generate_story)
+    parallel_workflow.add_node("generate_poem", generate_poem)
+    parallel_workflow.add_node("aggregate_content", aggregate_content)
+
+    parallel_workflow.add_edge(START, "generate_joke")
+    parallel_workflow.add_edge(START, "generate_story")
+    parallel_workflow.add_edge(START, "generate_poem")
+    parallel_workflow.add_edge("generate_joke", "aggregate_content")
+    parallel_workflow.add_edge("generate_story", "aggregate_content")
+    parallel_workflow.add_edge("generate_poem", "aggregate_content")
+    parallel_workflow.add_edge("aggregate_content", END)
+    return parallel_workflow.compile()
+
+
+# ========================
+# Map-reduce fan-out
+# ========================
+
+class MapReduceState(TypedDict):
+    topics: list[str]
+    content_types: list[str]
+    # Every worker returns a one-item list; operator.add concatenates them
+    results: Annotated[list[dict], operator.add]
+    combined_content: dict[str, str]
+
+
+class WorkItem(TypedDict):
+    topic: str
+    content_type: str
+
+
+def fan_out(state: MapReduceState):
+    """Dispatch one worker per topic x content type"""
+    content_types = state.get("content_types") or CONTENT_TYPES
+    return [
+        Send("generate_content", {"topic": topic, "content_type": content_type})
+        for topic in state["topics"]
+        for content_type in content_types
+    ]
+
+
+def combine_by_topic(state: MapReduceState):
+    """Reduce the worker results into one combined string per topic"""
+    grouped = {}
+    for item in state["results"]:
+        text = item.get("content", f"<failed: {item.get('error')}>")
+        grouped.setdefault(item["topic"], []).append(f"{item['content_type'].title()}: {text}")
+    combined = {
+        topic: f"Here's content about {topic}:\n\n" + "\n\n".join(parts)
+        for topic, parts in grouped.items()
+    }
+    return {"combined_content": combined}
+
+
+def build_map_reduce_graph(llm: Optional[BaseChatModel] = None):
+    """
+    Build the Send-based map-reduce workflow.
+
+    Args:
+        llm: Chat model for the workers (defaults to the shared Groq mixtral client
+            at batch priority, so it queues behind interactive callers)
+
+    Returns:
+        The compiled graph; invoke it with {"topics": [...], "content_types": [...]}
+    """
+    llm = llm or _default_llm(priority=20)
+
+    def generate_content(item: WorkItem):
+        """Worker: a single LLM call for one topic and content type"""
+        result = {"topic": item["topic"], "content_type": item["content_type"]}
+        try:
+            msg = llm.invoke(f"Generate a {item['content_type']} about {item['topic']}")
+            result["content"] = msg.content
+        except Exception as e:
+            # Keep the batch going; a failed item is reported instead of aborting the run
+            result["error"] = str(e)
+        return {"results": [result]}
+
+    map_reduce_workflow = StateGraph(MapReduceState)
+    map_reduce_workflow.add_node("generate_content", generate_content)
+    map_reduce_workflow.add_node("combine_by_topic", combine_by_topic)
+    map_reduce_workflow.add_conditional_edges(START, fan_out, ["generate_content"])
+    map_reduce_workflow.add_edge("generate_content", "combine_by_topic")
+    map_reduce_workflow.add_edge("combine_by_topic", END)
+    return map_reduce_workflow.compile()
@@ -0,0 +1,64 @@
+"""Arithmetic ReAct agent used by LangGraph/2-Agent_nodes_memory.py and 3-Agent_simple_Math.py."""
+
+from typing import Optional
+
+from langchain_core.language_models import BaseChatModel
+
+from learning_ai.graphs.tool_agent import build_tool_agent_graph
+
+SYSTEM_PROMPT = "You are a helpful assistant tasked with performing arithmetic on a set of inputs."
+
+
+def multiply(a: int, b: int) -> int:
+    """Multiply a and b.
+
+    Args:
+        a: first int
+        b: second int
+    """
+    return a * b
+
+
+def add(a: int, b: int) -> int:
+    """Adds a and b.
+
+    Args:
+        a: first int
+        b: second int
+    """
+    return a + b
+
+
+def divide(a: int, b: int) -> float:
+    """Divide a and b.
+
+    Args:
+        a: first int
+        b: second int
+    """
+    return a / b
+
+
+TOOLS = [add, multiply, divide]
+
+
+def build_react_graph(llm: Optional[BaseChatModel] = None, checkpointer=None, memoize: bool = True):
+    """
+    Build the arithmetic agent graph.
+
+    Args:
+        llm: Chat model to use (defaults to the shared gpt-4o client)
+        checkpointer: Optional LangGraph checkpointer for per-thread memory
+        memoize: Cache tool results across turns and threads (the tools are pure)
+
+    Returns:
+        A compiled graph that can process messages
+    """
+    if llm is None:
+        from learning_ai.llm_clients import get_chat_model
+        llm = get_chat_model("openai", "gpt-4o")
+    tools = TOOLS
+    if memoize:
+        from learning_ai.tool_cache import PURE, memoize_tools
+        tools = memoize_tools(TOOLS, {}, default=PURE)
+    return build_tool_agent_graph(llm, tools, SYSTEM_PROMPT, checkpointer=checkpointer)
@@ -0,0 +1,172 @@
+"""
+Message routing graphs used by LangGraph/5-Routing_workflow.py.
+
+build_routing_graph asks the LLM to call route_message / log_message.
+build_embedding_routing_graph classifies the message against destination exemplars
+with a nearest-centroid embedding router and calls the tools directly; only messages
+the router isn't confident about go to the LLM agent.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from learning_ai.graphs.tool_agent import build_tool_agent_graph
+
+SYSTEM_PROMPT = "You are a system responsible for routing and logging messages."
+
+
+def route_message(destination: str, message: str) -> str:
+    """Route a message to a specific destination.
+
+    Args:
+        destination: The destination to route the message to
+        message: The message to be routed
+    """
+    return f"Message '{message}' routed to {destination}."
+
+
+def log_message(message: str) -> str:
+    """Log a message for auditing purposes.
+
+    Args:
+        message: The message to be logged
+    """
+    return f"Message '{message}' logged for auditing."
+
+
+TOOLS = [route_message, log_message]
+
+
+def build_routing_graph(llm: Optional[BaseChatModel] = None, checkpointer=None):
+    """
+    Build the LLM tool-calling routing graph.
+
+    Args:
+        llm: Chat model to use (defaults to the shared gpt-4o client)
+        checkpointer: Optional LangGraph checkpointer for per-thread memory
+
+    Returns:
+        The compiled graph
+    """
+    if llm is None:
+        from learning_ai.llm_clients import get_chat_model
+        llm = get_chat_model("openai", "gpt-4o")
+    return build_tool_agent_graph(llm, TOOLS, SYSTEM_PROMPT, checkpointer=checkpointer)
+
+
+# ========================
+# Embedding router with LLM fallback
+# ========================
+
+# Example messages per destination; the router averages their embeddings into one centroid each
+DESTINATION_EXEMPLARS: Dict[str, List[str]] = {
+    "Support Team": [
+        "The app crashes every time I log in",
+        "I can't reset my password",
+        "Error 500 when uploading a file",
+        "The page won't load and shows a blank screen",
+        "How do I enable two-factor authentication?",
+    ],
+    "Sales": [
+        "I'd like a quote for 50 licenses",
+        "Do you offer volume discounts for enterprises?",
+        "Can I schedule a product demo?",
+        "What does the premium plan include?",
+        "We want to upgrade our subscription",
+    ],
+    "Billing": [
+        "I was charged twice this month",
+        "Please send me last month's invoice",
+        "How do I update my credit card?",
+        "I need a refund for my last payment",
+        "Why is my bill higher than usual?",
+    ],
+}
+
+
+class RoutingState(MessagesState):
+    destination: str   # set only when the router is confident
+    router_guess: str  # the router's best destination, kept to score it against the LLM
+    confidence: float
+
+
+def build_embedding_routing_graph(embeddings: Optional[Embeddings] = None, llm: Optional[BaseChatModel] = None,
+                                  exemplars: Optional[Dict[str, List[str]]] = None, threshold: float = 0.35,
+                                  margin: float = 0.03, router=None, checkpointer=None):
+    """
+    Build the classify -> (route | LLM fallback) graph.
+
+    Args:
+        embeddings: Embedding model for the router (defaults to HuggingFace all-MiniLM-L6-v2,
+            cached on disk)
+        llm: Chat model for the fallback agent (defaults to the shared gpt-4o client)
+        exemplars: Example messages per destination (defaults to DESTINATION_EXEMPLARS)
+        threshold: Minimum similarity for the router to decide without the LLM
+        margin: Minimum lead over the second-best destination
+        router: A prebuilt CentroidRouter (overrides embeddings / exemplars / threshold / margin)
+        checkpointer: Optional LangGraph checkpointer for per-thread memory
+
+    Returns:
+        The compiled graph; the router is available as graph.router for stats
+    """
+    from learning_ai.embedding_router import CentroidRouter, cached_embeddings
+
+    if router is None:
+        if embeddings is None:
+            from langchain_huggingface import HuggingFaceEmbeddings  # pulls in torch; only when needed
+            embeddings = cached_embeddings(HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2"),
+                                           namespace="all-MiniLM-L6-v2")
+        router = CentroidRouter(embeddings, exemplars or DESTINATION_EXEMPLARS, threshold=threshold, margin=margin)
+    # The fallback is the original tool-calling agent, used as a subgraph
+    fallback = build_routing_graph(llm=llm)
+    log = logging.getLogger("learning_ai.router")
+
+    def classify(state: RoutingState):
+        """Nearest-centroid classification of the latest message"""
+        decision = router.route(state["messages"][-1].content)
+        log.debug("route %r -> %s (score %.3f, margin %.3f, %.3f ms)", state["messages"][-1].content,
+                  decision.destination, decision.score, decision.margin, decision.decide_s * 1000)
+        return {
+            "destination": decision.destination if decision.confident else "",
+            "router_guess": decision.destination,
+            "confidence": decision.score,
+        }
+
+    def route(state: RoutingState):
+        """Call the routing and logging tools directly, without an LLM round trip"""
+        message = state["messages"][-1].content
+        routed = route_message(state["destination"], message)
+        logged = log_message(message)
+        return {"messages": [AIMessage(content=f"{routed} {logged}")]}
+
+    def score_router(state: RoutingState):
+        """Use the LLM's route_message call as the label for the router's guess (accuracy stats)"""
+        for message in reversed(state["messages"]):
+            for call in getattr(message, "tool_calls", None) or []:
+                if call["name"] == "route_message":
+                    destination = call["args"].get("destination", "")
+                    router.record_outcome(state["router_guess"], destination)
+                    return {"destination": destination}
+        return {}
+
+    def choose(state: RoutingState):
+        return "route" if state.get("destination") else "llm_fallback"
+
+    builder = StateGraph(RoutingState)
+    builder.add_node("classify", classify)
+    builder.add_node("route", route)
+    builder.add_node("llm_fallback", fallback)
+    builder.add_node("score_router", score_router)
+    builder.add_edge(START, "classify")
+    builder.add_conditional_edges("classify", choose, {"route": "route", "llm_fallback": "llm_fallback"})
+    builder.add_edge("route", END)
+    builder.add_edge("llm_fallback", "score_router")
+    builder.add_edge("score_router", END)
+    graph = builder.compile(checkpointer=checkpointer)
+    graph.router = router
+    return graph
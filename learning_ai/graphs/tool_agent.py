@@ -0,0 +1,47 @@
+"""
+Generic tool-calling (ReAct) graph: assistant <-> tools until the model stops calling tools.
+
+The arithmetic, routing and orchestrator examples all use this same shape with a
+different tool list and system prompt.
+"""
+
+from typing import Callable, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import SystemMessage
+from langgraph.graph import START, MessagesState, StateGraph
+from langgraph.prebuilt import ToolNode, tools_condition
+
+
+def build_tool_agent_graph(llm: BaseChatModel, tools: Sequence[Callable], system_prompt: str,
+                           checkpointer=None, tool_node=None, parallel_tool_calls: bool = False):
+    """
+    Build and compile a ReAct-style graph.
+
+    Args:
+        llm: Chat model that supports bind_tools
+        tools: Tool functions (or BaseTools) the model may call
+        system_prompt: System message prepended to every assistant call
+        checkpointer: Optional LangGraph checkpointer for per-thread memory
+        tool_node: Node used to run tool calls (defaults to ToolNode(tools))
+        parallel_tool_calls: Let the model request several tool calls in one turn; ToolNode
+            then runs them concurrently
+
+    Returns:
+        The compiled graph
+    """
+    llm_with_tools = llm.bind_tools(tools, parallel_tool_calls=parallel_tool_calls)
+    sys_msg = SystemMessage(content=system_prompt)
+
+    def assistant(state: MessagesState):
+        return {"messages": [llm_with_tools.invoke([sys_msg] + state["messages"])]}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("assistant", assistant)
+    builder.add_node("tools", tool_node or ToolNode(tools))
+    builder.add_edge(START, "assistant")
+    # If the latest message from the assistant is a tool call -> tools_condition routes to tools
+    # Otherwise -> tools_condition routes to END
+    builder.add_conditional_edges("assistant", tools_condition)
+    builder.add_edge("tools", "assistant")
+    return builder.compile(checkpointer=checkpointer)
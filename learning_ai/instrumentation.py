@@ -0,0 +1,449 @@
+"""
+Local latency and token instrumentation for graphs and chains.
+
+LangSmith tracing (LANGCHAIN_TRACING_V2) sends every run to the hosted service. The
+Instrumentation callback handler records the same kind of information in-process:
+
+- wall time of every graph node, LLM call, tool call and retriever call
+- prompt / completion tokens and rate-limiter queue wait per LLM call
+- errors per node / call
+
+It exports them without any network service:
+
+- Prometheus text format (write_prometheus(), or serve_prometheus() for scraping)
+- OpenTelemetry spans as OTLP/JSON (write_spans() to a file, or export_otlp() to a
+  local collector such as the OTel Collector's OTLP/HTTP receiver)
+
+Example:
+    metrics = Instrumentation()
+    react_graph.invoke(inputs, config={"callbacks": [metrics]})
+    print(metrics.summary())
+    metrics.export()   # honours METRICS_PROM_FILE, TRACE_SPANS_FILE, OTEL_EXPORTER_OTLP_ENDPOINT
+
+The callbacks only read a clock and update a few dicts; histograms and span records
+are built when a run ends, and exporting happens off the hot path.
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+import urllib.request
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+# Prometheus' default latency buckets (seconds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# OpenTelemetry span kinds
+_SPAN_KIND_INTERNAL = 1
+_SPAN_KIND_CLIENT = 3
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        i = bisect.bisect_left(self.buckets, value)
+        if i < len(self.counts):
+            self.counts[i] += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total, rows = 0, []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            rows.append((repr(float(bound)), total))
+        rows.append(("+Inf", self.count))
+        return rows
+
+
+class Span:
+    """One finished node / LLM / tool / retriever run."""
+
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, kind: str, trace_id: UUID, span_id: UUID, parent_id: Optional[UUID],
+                 start_ns: int, attributes: Dict[str, Any]):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start_ns = start_ns
+        self.end_ns = start_ns
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    @property
+    def duration_s(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id.hex,
+            "spanId": self.span_id.hex[:16],
+            "name": self.name,
+            "kind": _SPAN_KIND_CLIENT if self.kind in ("llm", "tool", "retriever") else _SPAN_KIND_INTERNAL,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()
+                           if value is not None] + [_otlp_attribute("learning_ai.kind", self.kind)],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id is not None:
+            span["parentSpanId"] = self.parent_id.hex[:16]
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Open:
+    """A run that has started but not ended. `span` is None for runs that aren't recorded."""
+
+    __slots__ = ("span", "trace_id", "parent_span_id", "started")
+
+    def __init__(self, span: Optional[Span], trace_id: UUID, parent_span_id: Optional[UUID], started: int):
+        self.span = span
+        self.trace_id = trace_id
+        self.parent_span_id = parent_span_id
+        self.started = started
+
+
+class Instrumentation(BaseCallbackHandler):
+    """
+    Callback handler recording per-node, per-LLM-call and per-tool latency and tokens.
+
+    One instance can be shared by any number of concurrent runs (threads or asyncio).
+
+    Args:
+        service_name: service.name resource attribute on exported spans
+        max_spans: Finished spans kept in memory for export (oldest are dropped first)
+        buckets: Histogram bucket bounds in seconds
+    """
+
+    # Run the callbacks in the caller's thread/event loop rather than an executor
+    run_inline = True
+
+    def __init__(self, service_name: str = "learning_ai", max_spans: int = 10_000, buckets=DEFAULT_BUCKETS):
+        self.service_name = service_name
+        self.buckets = buckets
+        self._open: Dict[UUID, _Open] = {}
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+        self._durations: Dict[Tuple[str, str], Histogram] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._queue_wait: Dict[str, Histogram] = {}
+        self._tokens: Dict[Tuple[str, str], int] = {}
+
+    # ---- run bookkeeping ----
+
+    def _start(self, run_id: UUID, parent_run_id: Optional[UUID], kind: Optional[str], name: str,
+               attributes: Dict[str, Any]) -> None:
+        now = time.time_ns()
+        parent = self._open.get(parent_run_id) if parent_run_id is not None else None
+        if parent is None:
+            trace_id, parent_span_id = run_id, None
+        else:
+            trace_id = parent.trace_id
+            parent_span_id = parent.span.span_id if parent.span is not None else parent.parent_span_id
+        span = Span(name, kind, trace_id, run_id, parent_span_id, now, attributes) if kind else None
+        self._open[run_id] = _Open(span, trace_id, parent_span_id, time.perf_counter_ns())
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None) -> Optional[Span]:
+        entry = self._open.pop(run_id, None)
+        if entry is None or entry.span is None:
+            return None
+        span = entry.span
+        span.end_ns = span.start_ns + (time.perf_counter_ns() - entry.started)
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        key = (span.kind, span.name)
+        with self._lock:
+            histogram = self._durations.get(key)
+            if histogram is None:
+                histogram = self._durations[key] = Histogram(self.buckets)
+            histogram.observe(span.duration_s)
+            if span.error:
+                self._errors[key] = self._errors.get(key, 0) + 1
+            self._spans.append(span)
+        return span
+
+    # ---- chains / graph nodes ----
+
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                       tags=None, metadata=None, **kwargs: Any) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "chain"
+        node = (metadata or {}).get("langgraph_node")
+        if parent_run_id is None:
+            kind = "graph"
+        elif node is not None and node == name:
+            kind = "node"
+        else:
+            kind = None  # internal runnables (sequences, channel writes, ...) are not recorded
+        self._start(run_id, parent_run_id, kind, name, {"langgraph.node": node} if kind == "node" else {})
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        # LangGraph uses an exception to pause at interrupts; that isn't a failure
+        self._end(run_id, None if type(error).__name__ == "GraphInterrupt" else error)
+
+    # ---- LLM calls ----
+
+    def _start_llm(self, serialized, run_id, parent_run_id, metadata, kwargs) -> None:
+        metadata = metadata or {}
+        model = (metadata.get("ls_model_name") or (serialized or {}).get("kwargs", {}).get("model_name")
+                 or kwargs.get("name") or "llm")
+        self._start(run_id, parent_run_id, "llm", str(model), {
+            "gen_ai.system": metadata.get("ls_provider"),
+            "gen_ai.request.model": model,
+            "langgraph.node": metadata.get("langgraph_node"),
+        })
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                            tags=None, metadata=None, **kwargs: Any) -> None:
+        self._start_llm(serialized, run_id, parent_run_id, metadata, kwargs)
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                     tags=None, metadata=None, **kwargs: Any) -> None:
+        self._start_llm(serialized, run_id, parent_run_id, metadata, kwargs)
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        span = self._end(run_id)
+        if span is None:
+            return
+        llm_output = response.llm_output or {}
+        prompt_tokens = completion_tokens = None
+        generation = response.generations[0][0] if response.generations and response.generations[0] else None
+        usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+        if usage:
+            prompt_tokens, completion_tokens = usage.get("input_tokens"), usage.get("output_tokens")
+        else:
+            token_usage = llm_output.get("token_usage") or {}
+            prompt_tokens, completion_tokens = token_usage.get("prompt_tokens"), token_usage.get("completion_tokens")
+        queue_wait = llm_output.get("queue_wait_s")
+
+        span.attributes["gen_ai.usage.input_tokens"] = prompt_tokens
+        span.attributes["gen_ai.usage.output_tokens"] = completion_tokens
+        span.attributes["learning_ai.queue_wait_s"] = queue_wait
+        with self._lock:
+            for token_type, count in (("prompt", prompt_tokens), ("completion", completion_tokens)):
+                if count:
+                    key = (span.name, token_type)
+                    self._tokens[key] = self._tokens.get(key, 0) + int(count)
+            if queue_wait is not None:
+                histogram = self._queue_wait.get(span.name)
+                if histogram is None:
+                    histogram = self._queue_wait[span.name] = Histogram(self.buckets)
+                histogram.observe(queue_wait)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error)
+
+    # ---- tools and retrievers ----
+
+    def on_tool_start(self, serialized, input_str, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                      tags=None, metadata=None, **kwargs: Any) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "tool"
+        self._start(run_id, parent_run_id, "tool", name, {"langgraph.node": (metadata or {}).get("langgraph_node")})
+
+    def on_tool_end(self, output, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error)
+
+    def on_retriever_start(self, serialized, query, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                           tags=None, metadata=None, **kwargs: Any) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "retriever"
+        self._start(run_id, parent_run_id, "retriever", name, {})
+
+    def on_retriever_end(self, documents, *, run_id: UUID, **kwargs: Any) -> None:
+        span = self._end(run_id)
+        if span is not None:
+            span.attributes["learning_ai.documents"] = len(documents)
+
+    def on_retriever_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error)
+
+    # ========================
+    # Reporting and export
+    # ========================
+
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def summary(self) -> str:
+        """Human-readable table of count / mean / max duration per node and call."""
+        with self._lock:
+            rows = sorted(self._durations.items(), key=lambda item: -item[1].sum)
+            tokens = dict(self._tokens)
+        lines = [f"{'kind':<10} {'name':<32} {'count':>6} {'mean_s':>8} {'total_s':>8}"]
+        for (kind, name), histogram in rows:
+            mean = histogram.sum / histogram.count if histogram.count else 0.0
+            lines.append(f"{kind:<10} {name[:32]:<32} {histogram.count:>6} {mean:>8.3f} {histogram.sum:>8.3f}")
+        for (model, token_type), count in sorted(tokens.items()):
+            lines.append(f"tokens     {model[:32]:<32} {token_type:>10} {count:>8}")
+        return "\n".join(lines)
+
+    def prometheus_text(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            durations = {key: (h.cumulative(), h.sum, h.count) for key, h in self._durations.items()}
+            queue_wait = {key: (h.cumulative(), h.sum, h.count) for key, h in self._queue_wait.items()}
+            errors = dict(self._errors)
+            tokens = dict(self._tokens)
+
+        lines = [
+            "# HELP learning_ai_run_duration_seconds Wall time of graph runs, nodes, LLM, tool and retriever calls.",
+            "# TYPE learning_ai_run_duration_seconds histogram",
+        ]
+        for (kind, name), (buckets, total, count) in sorted(durations.items()):
+            labels = f'kind="{kind}",name="{_escape_label(name)}"'
+            for bound, value in buckets:
+                lines.append(f'learning_ai_run_duration_seconds_bucket{{{labels},le="{bound}"}} {value}')
+            lines.append(f"learning_ai_run_duration_seconds_sum{{{labels}}} {total}")
+            lines.append(f"learning_ai_run_duration_seconds_count{{{labels}}} {count}")
+
+        lines += [
+            "# HELP learning_ai_run_errors_total Runs that raised an exception.",
+            "# TYPE learning_ai_run_errors_total counter",
+        ]
+        for (kind, name), count in sorted(errors.items()):
+            lines.append(f'learning_ai_run_errors_total{{kind="{kind}",name="{_escape_label(name)}"}} {count}')
+
+        lines += [
+            "# HELP learning_ai_llm_queue_wait_seconds Time LLM calls waited for the shared rate limiter.",
+            "# TYPE learning_ai_llm_queue_wait_seconds histogram",
+        ]
+        for model, (buckets, total, count) in sorted(queue_wait.items()):
+            labels = f'model="{_escape_label(model)}"'
+            for bound, value in buckets:
+                lines.append(f'learning_ai_llm_queue_wait_seconds_bucket{{{labels},le="{bound}"}} {value}')
+            lines.append(f"learning_ai_llm_queue_wait_seconds_sum{{{labels}}} {total}")
+            lines.append(f"learning_ai_llm_queue_wait_seconds_count{{{labels}}} {count}")
+
+        lines += [
+            "# HELP learning_ai_llm_tokens_total Prompt and completion tokens reported by the provider.",
+            "# TYPE learning_ai_llm_tokens_total counter",
+        ]
+        for (model, token_type), count in sorted(tokens.items()):
+            lines.append(f'learning_ai_llm_tokens_total{{model="{_escape_label(model)}",type="{token_type}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: os.PathLike) -> Path:
+        """Write the metrics file atomically (suitable for node_exporter's textfile collector)."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(self.prometheus_text())
+        os.replace(tmp, path)
+        return path
+
+    def serve_prometheus(self, port: int = 9464, host: str = "127.0.0.1"):
+        """Serve /metrics from a daemon thread; returns the server (call shutdown() to stop)."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        instrumentation = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = instrumentation.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def _drain_spans(self) -> List[Span]:
+        with self._lock:
+            spans = list(self._spans)
+            self._spans.clear()
+        return spans
+
+    def otlp_payload(self, spans: List[Span]) -> Dict[str, Any]:
+        """An OTLP/JSON ExportTraceServiceRequest for the given spans."""
+        return {"resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+            "scopeSpans": [{"scope": {"name": "learning_ai.instrumentation"},
+                            "spans": [span.to_otlp() for span in spans]}],
+        }]}
+
+    def write_spans(self, path: os.PathLike, spans: Optional[List[Span]] = None) -> int:
+        """Append finished spans to a JSONL file (one OTLP/JSON request per line) and clear them."""
+        spans = self._drain_spans() if spans is None else spans
+        if spans:
+            with Path(path).open("a", encoding="utf-8") as f:
+                f.write(json.dumps(self.otlp_payload(spans)) + "\n")
+        return len(spans)
+
+    def export_otlp(self, endpoint: str, spans: Optional[List[Span]] = None, timeout: float = 5.0) -> int:
+        """POST finished spans to an OTLP/HTTP (JSON) collector, e.g. http://localhost:4318, and clear them."""
+        spans = self._drain_spans() if spans is None else spans
+        if not spans:
+            return 0
+        url = endpoint.rstrip("/")
+        if not url.endswith("/v1/traces"):
+            url += "/v1/traces"
+        request = urllib.request.Request(url, data=json.dumps(self.otlp_payload(spans)).encode(),
+                                         headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(request, timeout=timeout):
+            pass
+        return len(spans)
+
+    def export(self, prometheus_path: Optional[str] = None, spans_path: Optional[str] = None,
+               otlp_endpoint: Optional[str] = None) -> None:
+        """
+        Export to whichever destinations are configured.
+
+        Args:
+            prometheus_path: Metrics file (defaults to METRICS_PROM_FILE)
+            spans_path: Span JSONL file (defaults to TRACE_SPANS_FILE)
+            otlp_endpoint: OTLP/HTTP collector (defaults to OTEL_EXPORTER_OTLP_ENDPOINT)
+        """
+        prometheus_path = prometheus_path or os.getenv("METRICS_PROM_FILE")
+        spans_path = spans_path or os.getenv("TRACE_SPANS_FILE")
+        otlp_endpoint = otlp_endpoint or os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+        if prometheus_path:
+            self.write_prometheus(prometheus_path)
+        if spans_path or otlp_endpoint:
+            spans = self._drain_spans()
+            if spans_path:
+                self.write_spans(spans_path, spans)
+            if otlp_endpoint:
+                self.export_otlp(otlp_endpoint, spans)
@@ -0,0 +1,200 @@
+"""
+Persistent exact-match cache for deterministic LLM calls.
+
+SQLiteLRUCache plugs into LangChain's model-level cache hook (the `cache` field of a
+chat model), so a cached call skips the provider, the rate limiter and the network.
+Entries are keyed on a hash of:
+
+- the model's llm_string: model name, sampling params, stop words and bound tools
+- the prompt messages, normalised so run-specific fields (message ids, response and
+  usage metadata) don't turn identical prompts into misses
+
+The store is capped by size; the least recently used entries are evicted first.
+
+get_chat_model() attaches the default cache only when sampling is deterministic
+(temperature=0, single choice). Skip it for a single call with
+config={"configurable": {"llm_cache_bypass": True}}, for a block of code with
+`with cache_bypass():`, or for the whole process with LLM_CACHE_BYPASS=1.
+"""
+
+import contextlib
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+# Key under config["configurable"] that skips the cache for one call (or a whole graph run)
+CACHE_BYPASS_KEY = "llm_cache_bypass"
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "learning_ai" / "llm_cache.sqlite"
+DEFAULT_MAX_MB = 256
+
+_bypass: contextvars.ContextVar[bool] = contextvars.ContextVar("llm_cache_bypass", default=False)
+
+
+@contextlib.contextmanager
+def cache_bypass(enabled: bool = True):
+    """Skip cache reads and writes for LLM calls made inside this block."""
+    token = _bypass.set(enabled)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def is_bypassed() -> bool:
+    return _bypass.get() or os.getenv("LLM_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
+
+
+def is_deterministic(params: Dict[str, Any]) -> bool:
+    """True when the model params pin sampling (temperature 0, a single choice)."""
+    return params.get("temperature") == 0 and params.get("n", 1) in (None, 1)
+
+
+# Message fields that change from run to run without changing what the model sees
+_VOLATILE_FIELDS = ("id", "response_metadata", "usage_metadata")
+
+
+def _normalize(node: Any) -> Any:
+    if isinstance(node, dict):
+        if node.get("lc") == 1 and isinstance(node.get("kwargs"), dict):
+            kwargs = {k: _normalize(v) for k, v in node["kwargs"].items() if k not in _VOLATILE_FIELDS}
+            if isinstance(kwargs.get("content"), str):
+                kwargs["content"] = kwargs["content"].strip()
+            return {**node, "kwargs": kwargs}
+        return {k: _normalize(v) for k, v in node.items()}
+    if isinstance(node, list):
+        return [_normalize(v) for v in node]
+    return node
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Canonical form of a serialized prompt (see module docstring)."""
+    try:
+        data = json.loads(prompt)
+    except ValueError:
+        return prompt.strip()  # plain-string prompts from completion models
+    return json.dumps(_normalize(data), sort_keys=True, separators=(",", ":"))
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    return hashlib.sha256(f"{llm_string}\x00{normalize_prompt(prompt)}".encode()).hexdigest()
+
+
+class SQLiteLRUCache(BaseCache):
+    """
+    Size-bounded SQLite cache for LLM generations.
+
+    Args:
+        path: SQLite file (created with its parent directory if missing)
+        max_bytes: Evict least recently used entries once the stored values exceed this
+    """
+
+    def __init__(self, path: Optional[os.PathLike] = None, max_bytes: Optional[int] = None):
+        self.path = Path(path or os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH))
+        self.max_bytes = max_bytes or int(float(os.getenv("LLM_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_lru ON llm_cache(last_access)")
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        if is_bypassed():
+            return None
+        key = cache_key(prompt, llm_string)
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET last_access = ?, hits = hits + 1 WHERE key = ?", (time.time(), key)
+            )
+            self.hits += 1
+        return [loads(item) for item in json.loads(row[0])]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        if is_bypassed():
+            return
+        key = cache_key(prompt, llm_string)
+        value = json.dumps([dumps(generation) for generation in return_val])
+        size = len(value)
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time()),
+            )
+            self._total += size - (old[0] if old else 0)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Other processes may share the file, so recount before deciding what to drop.
+        # Evict down to 90% so we don't run an eviction on every insert near the cap.
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        target = int(self.max_bytes * 0.9)
+        while self._total > target:
+            rows = self._conn.execute(
+                "SELECT key, size FROM llm_cache ORDER BY last_access LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            freed = 0
+            for key, size in rows:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                freed += size
+                if self._total - freed <= target:
+                    break
+            self._total -= freed
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._total = 0
+
+    # Local SQLite calls are sub-millisecond; run them inline rather than in a thread
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        return self.lookup(prompt, llm_string)
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self.update(prompt, llm_string, return_val)
+
+    async def aclear(self, **kwargs: Any) -> None:
+        self.clear(**kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        return {"entries": entries, "bytes": self._total, "hits": self.hits, "misses": self.misses}
+
+
+_default_cache: Optional[SQLiteLRUCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> SQLiteLRUCache:
+    """Process-wide cache at LLM_CACHE_PATH (default ~/.cache/learning_ai/llm_cache.sqlite)."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = SQLiteLRUCache()
+        return _default_cache
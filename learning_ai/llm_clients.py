@@ -0,0 +1,654 @@
+"""
+Shared LLM client factory with rate limiting.
+
+Every example used to build its own ChatGroq / ChatOpenAI at import time, so running
+several of them at once meant each one hit the provider independently and retried on
+its own schedule. get_chat_model() hands out chat models that share one limiter per
+provider/model:
+
+- token buckets for requests per minute and tokens per minute
+- a priority queue for callers waiting on those buckets
+- jittered exponential backoff on 429s and transient errors; a throttled response
+  (and its Retry-After) pushes back every caller of the same model, not just the one
+  that got the 429, so retries don't turn into a storm
+- coalescing of identical concurrent requests into a single provider call
+- queue depth and wait time metrics (see limiter_metrics())
+- a persistent response cache for deterministic calls (see learning_ai.llm_cache)
+
+Limits are per process. When several processes share one API key, set
+LLM_RATE_LIMIT_SHARE to the fraction of the budget each process may use
+(e.g. 0.25 for four workers).
+
+Example:
+    llm = get_chat_model("groq", "gemma2-9b-it", temperature=0.7)
+    with llm_priority(0):
+        llm.invoke("Tell me a joke")
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import copy
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, AsyncIterator, List, Optional, Tuple, Union
+
+from langchain_core.caches import BaseCache
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.load import dumps
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableConfig, ensure_config
+from pydantic import ConfigDict
+
+from learning_ai.env import load_env
+from learning_ai.llm_cache import CACHE_BYPASS_KEY, cache_bypass, get_default_cache, is_deterministic
+
+
+# ========================
+# Limits
+# ========================
+
+@dataclass
+class RateLimit:
+    """Requests and tokens allowed per minute for one provider/model."""
+    requests_per_minute: float
+    tokens_per_minute: Optional[float] = None
+
+
+# Conservative defaults (free-tier sized); override with configure_limits() or the
+# LLM_RATE_LIMITS env var, e.g. '{"groq/gemma2-9b-it": {"requests_per_minute": 30}}'
+DEFAULT_LIMITS: Dict[str, RateLimit] = {
+    "groq": RateLimit(requests_per_minute=30, tokens_per_minute=6_000),
+    "openai": RateLimit(requests_per_minute=500, tokens_per_minute=200_000),
+}
+
+# Priority used when neither the model nor llm_priority() sets one. Lower runs first.
+DEFAULT_PRIORITY = 10
+
+_current_priority: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+    "llm_priority", default=None
+)
+
+
+@contextlib.contextmanager
+def llm_priority(priority: int):
+    """Run the LLM calls made inside this block at the given priority (lower = sooner)."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class TokenBucket:
+    """
+    Continuous-refill token bucket.
+
+    A request is admitted once the bucket holds enough for it (capped at the bucket
+    capacity so oversized requests cannot block forever). Admission may drive the
+    level negative; later requests then wait for the debt to refill.
+    """
+
+    def __init__(self, per_minute: float, burst: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        # Default burst: ten seconds' worth of budget, at least one unit
+        self.capacity = burst if burst is not None else max(1.0, per_minute / 6.0)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be consumed (0 if it can be consumed now)."""
+        self._refill(now)
+        need = min(amount, self.capacity)
+        if self.level >= need:
+            return 0.0
+        return (need - self.level) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self.level -= amount
+
+    def refund(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+    def block_for(self, seconds: float, now: float) -> None:
+        """Make the bucket unavailable for at least `seconds` (used on 429s)."""
+        self._refill(now)
+        self.level = min(self.level, -seconds * self.rate)
+
+
+@dataclass(order=True)
+class _Ticket:
+    priority: int
+    seq: int
+    tokens: float = 0.0
+
+
+class ProviderLimiter:
+    """
+    Shared limiter for one provider/model.
+
+    Waiters are served strictly by (priority, arrival order); only the head of the
+    queue may take from the buckets, so a flood of low-priority batch calls cannot
+    starve an interactive call that arrives later.
+    """
+
+    _poll_interval = 0.05
+
+    def __init__(self, name: str, limit: RateLimit):
+        self.name = name
+        self.limit = limit
+        self._requests = TokenBucket(limit.requests_per_minute)
+        self._tokens = TokenBucket(limit.tokens_per_minute) if limit.tokens_per_minute else None
+        self._queue: List[_Ticket] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._inflight: Dict[str, Future] = {}
+
+        # Metrics
+        self.in_flight = 0
+        self.admitted = 0
+        self.throttled = 0
+        self.retries = 0
+        self.coalesced = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._recent_waits: deque = deque(maxlen=1000)
+
+    # ---- admission ----
+
+    def _enqueue(self, tokens: float, priority: int) -> _Ticket:
+        ticket = _Ticket(priority, next(self._seq), tokens)
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+        return ticket
+
+    def _try_admit(self, ticket: _Ticket) -> float:
+        """Admit the ticket if it's at the head and the buckets allow; return wait otherwise."""
+        with self._cond:
+            if self._queue[0] is not ticket:
+                return self._poll_interval
+            now = time.monotonic()
+            wait = self._requests.time_until(1, now)
+            if self._tokens is not None:
+                wait = max(wait, self._tokens.time_until(ticket.tokens, now))
+            if wait > 0:
+                return wait
+            heapq.heappop(self._queue)
+            self._requests.consume(1)
+            if self._tokens is not None:
+                self._tokens.consume(ticket.tokens)
+            self.in_flight += 1
+            self.admitted += 1
+            self._cond.notify_all()
+            return 0.0
+
+    def _record_wait(self, waited: float) -> None:
+        with self._cond:
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            self._recent_waits.append(waited)
+
+    def _drop(self, ticket: _Ticket) -> None:
+        # Called when a waiter is cancelled or interrupted before admission
+        with self._cond:
+            if ticket in self._queue:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+
+    def acquire(self, tokens: float = 0.0, priority: int = DEFAULT_PRIORITY) -> float:
+        """Block until a request of `tokens` estimated tokens may be sent; return the wait."""
+        start = time.monotonic()
+        ticket = self._enqueue(tokens, priority)
+        try:
+            while True:
+                wait = self._try_admit(ticket)
+                if wait == 0.0:
+                    break
+                with self._cond:
+                    self._cond.wait(timeout=min(wait, 1.0))
+        except BaseException:
+            self._drop(ticket)
+            raise
+        waited = time.monotonic() - start
+        self._record_wait(waited)
+        return waited
+
+    async def aacquire(self, tokens: float = 0.0, priority: int = DEFAULT_PRIORITY) -> float:
+        """Async version of acquire()."""
+        start = time.monotonic()
+        ticket = self._enqueue(tokens, priority)
+        try:
+            while True:
+                wait = self._try_admit(ticket)
+                if wait == 0.0:
+                    break
+                await asyncio.sleep(min(wait, self._poll_interval))
+        except BaseException:
+            self._drop(ticket)
+            raise
+        waited = time.monotonic() - start
+        self._record_wait(waited)
+        return waited
+
+    def release(self, estimated_tokens: float = 0.0, actual_tokens: Optional[float] = None) -> None:
+        """Finish a request, correcting the token bucket with the real usage if known."""
+        with self._cond:
+            self.in_flight -= 1
+            if self._tokens is not None and actual_tokens is not None:
+                diff = actual_tokens - estimated_tokens
+                if diff > 0:
+                    self._tokens.consume(diff)
+                else:
+                    self._tokens.refund(-diff)
+            self._cond.notify_all()
+
+    def record_retry(self) -> None:
+        """Count a retried call (the limiter is shared across threads, so under its lock)."""
+        with self._cond:
+            self.retries += 1
+
+    def penalize(self, seconds: float) -> None:
+        """Back off every caller of this model after the provider throttled us."""
+        with self._cond:
+            self.throttled += 1
+            now = time.monotonic()
+            self._requests.block_for(seconds, now)
+            if self._tokens is not None:
+                self._tokens.block_for(seconds, now)
+
+    # ---- metrics ----
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of queue depth, wait times and retry counters."""
+        with self._cond:
+            waits = sorted(self._recent_waits)
+            snapshot = {
+                "queue_depth": len(self._queue),
+                "in_flight": self.in_flight,
+                "admitted": self.admitted,
+                "throttled": self.throttled,
+                "retries": self.retries,
+                "coalesced": self.coalesced,
+                "wait_seconds_total": self.total_wait,
+                "wait_seconds_max": self.max_wait,
+            }
+        def pct(p: float) -> float:
+            return waits[min(len(waits) - 1, int(p * len(waits)))] if waits else 0.0
+        snapshot["wait_seconds_p50"] = pct(0.50)
+        snapshot["wait_seconds_p95"] = pct(0.95)
+        return snapshot
+
+
+_limiters: Dict[Tuple[str, str], ProviderLimiter] = {}
+_overrides: Dict[Tuple[str, Optional[str]], RateLimit] = {}
+_registry_lock = threading.Lock()
+
+
+def configure_limits(provider: str, model: Optional[str] = None, *,
+                     requests_per_minute: float, tokens_per_minute: Optional[float] = None) -> None:
+    """
+    Set the rate limit for a provider (all models) or one provider/model.
+
+    Must be called before the first model of that provider/model is created.
+    """
+    with _registry_lock:
+        _overrides[(provider, model)] = RateLimit(requests_per_minute, tokens_per_minute)
+
+
+def _resolve_limit(provider: str, model: str) -> RateLimit:
+    env = json.loads(os.getenv("LLM_RATE_LIMITS", "{}"))
+    for key in (f"{provider}/{model}", provider):
+        if key in env:
+            limit = RateLimit(**env[key])
+            break
+    else:
+        limit = (_overrides.get((provider, model)) or _overrides.get((provider, None))
+                 or DEFAULT_LIMITS.get(provider) or RateLimit(requests_per_minute=60))
+    share = float(os.getenv("LLM_RATE_LIMIT_SHARE", "1"))
+    return RateLimit(
+        limit.requests_per_minute * share,
+        limit.tokens_per_minute * share if limit.tokens_per_minute else None,
+    )
+
+
+def get_limiter(provider: str, model: str) -> ProviderLimiter:
+    """Return the process-wide limiter for a provider/model, creating it on first use."""
+    with _registry_lock:
+        key = (provider, model)
+        if key not in _limiters:
+            _limiters[key] = ProviderLimiter(f"{provider}/{model}", _resolve_limit(provider, model))
+        return _limiters[key]
+
+
+def limiter_metrics() -> Dict[str, Dict[str, Any]]:
+    """Metrics for every limiter created so far, keyed by "provider/model"."""
+    with _registry_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.metrics() for limiter in limiters}
+
+
+# ========================
+# Retries
+# ========================
+
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+_RETRYABLE_NAMES = {"RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError"}
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """True for throttling and transient provider/network errors."""
+    return _status_code(exc) in _RETRYABLE_STATUS or type(exc).__name__ in _RETRYABLE_NAMES
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter for the given (0-based) attempt."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+# ========================
+# Managed chat model
+# ========================
+
+def _estimate_tokens(messages: List[BaseMessage], kwargs: Dict[str, Any], inner: BaseChatModel) -> float:
+    # A rough chars/4 estimate is enough for admission; release() corrects it with real usage
+    chars = sum(len(m.content) if isinstance(m.content, str) else len(str(m.content)) for m in messages)
+    completion = kwargs.get("max_tokens") or getattr(inner, "max_tokens", None) or 256
+    return chars / 4 + completion
+
+
+def _usage_tokens(result: ChatResult) -> Optional[float]:
+    usage = (result.llm_output or {}).get("token_usage") or {}
+    if usage.get("total_tokens"):
+        return usage["total_tokens"]
+    total = 0
+    for generation in result.generations:
+        metadata = getattr(generation.message, "usage_metadata", None)
+        if metadata:
+            total += metadata.get("total_tokens", 0)
+    return total or None
+
+
+class ManagedChatModel(BaseChatModel):
+    """
+    Chat model wrapper that routes every call through a shared ProviderLimiter.
+
+    Behaves like the wrapped model (bind_tools, streaming, token counting all
+    delegate to it), so it can be dropped into chains, agents and graphs unchanged.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inner: BaseChatModel
+    limiter: ProviderLimiter
+    priority: Optional[int] = None
+    max_attempts: int = 5
+    coalesce: bool = True
+
+    @property
+    def _llm_type(self) -> str:
+        return self.inner._llm_type
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return self.inner._identifying_params
+
+    def bind_tools(self, tools, **kwargs):
+        # Let the provider format the tools, then bind the result to this wrapper
+        return self.bind(**self.inner.bind_tools(tools, **kwargs).kwargs)
+
+    def get_num_tokens_from_messages(self, messages, *args, **kwargs) -> int:
+        return self.inner.get_num_tokens_from_messages(messages, *args, **kwargs)
+
+    def get_num_tokens(self, text: str) -> int:
+        return self.inner.get_num_tokens(text)
+
+    def _combine_llm_outputs(self, llm_outputs):
+        return self.inner._combine_llm_outputs(llm_outputs)
+
+    # Honour config["configurable"]["llm_cache_bypass"], including when it was set on
+    # an enclosing chain or graph run and reaches us through the inherited config
+    def invoke(self, input, config: Optional[RunnableConfig] = None, **kwargs: Any):
+        bypass = ensure_config(config).get("configurable", {}).get(CACHE_BYPASS_KEY, False)
+        with cache_bypass(bypass) if bypass else contextlib.nullcontext():
+            return super().invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input, config: Optional[RunnableConfig] = None, **kwargs: Any):
+        bypass = ensure_config(config).get("configurable", {}).get(CACHE_BYPASS_KEY, False)
+        with cache_bypass(bypass) if bypass else contextlib.nullcontext():
+            return await super().ainvoke(input, config, **kwargs)
+
+    def _priority(self) -> int:
+        current = _current_priority.get()
+        if current is not None:
+            return current
+        return self.priority if self.priority is not None else DEFAULT_PRIORITY
+
+    def _coalesce_key(self, messages, stop, kwargs) -> str:
+        payload = self._get_llm_string(stop=stop, **kwargs) + dumps(messages)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _handle_failure(self, exc: BaseException, attempt: int) -> float:
+        """Return the delay before retrying, or re-raise if the error is final."""
+        if attempt + 1 >= self.max_attempts or not is_retryable(exc):
+            raise exc
+        self.limiter.record_retry()
+        delay = max(_retry_after(exc) or 0.0, backoff_delay(attempt))
+        if _status_code(exc) == 429 or type(exc).__name__ == "RateLimitError":
+            self.limiter.penalize(delay)
+        return delay
+
+    # ---- sync ----
+
+    def _call_with_retries(self, messages, stop, run_manager, kwargs) -> ChatResult:
+        estimated = _estimate_tokens(messages, kwargs, self.inner)
+        for attempt in itertools.count():
+            waited = self.limiter.acquire(estimated, self._priority())
+            try:
+                result = self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as exc:
+                self.limiter.release(estimated, None)
+                time.sleep(self._handle_failure(exc, attempt))
+                continue
+            self.limiter.release(estimated, _usage_tokens(result))
+            result.llm_output = {**(result.llm_output or {}), "queue_wait_s": waited}
+            return result
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        if not self.coalesce:
+            return self._call_with_retries(messages, stop, run_manager, kwargs)
+
+        key = self._coalesce_key(messages, stop, kwargs)
+        with self.limiter._cond:
+            leader = key not in self.limiter._inflight
+            if leader:
+                future = self.limiter._inflight[key] = Future()
+            else:
+                future = self.limiter._inflight[key]
+                self.limiter.coalesced += 1
+        if not leader:
+            # Copy so callback bookkeeping on the leader's result doesn't leak across runs
+            return copy.deepcopy(future.result())
+        try:
+            result = self._call_with_retries(messages, stop, run_manager, kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self.limiter._cond:
+                self.limiter._inflight.pop(key, None)
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        # Streams are never coalesced and are only retried before the first chunk
+        estimated = _estimate_tokens(messages, kwargs, self.inner)
+        for attempt in itertools.count():
+            self.limiter.acquire(estimated, self._priority())
+            started = False
+            try:
+                for chunk in self.inner._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    started = True
+                    yield chunk
+            except Exception as exc:
+                self.limiter.release(estimated, None)
+                if started:
+                    raise
+                time.sleep(self._handle_failure(exc, attempt))
+                continue
+            self.limiter.release(estimated, None)
+            return
+
+    # ---- async ----
+
+    async def _acall_with_retries(self, messages, stop, run_manager, kwargs) -> ChatResult:
+        estimated = _estimate_tokens(messages, kwargs, self.inner)
+        for attempt in itertools.count():
+            waited = await self.limiter.aacquire(estimated, self._priority())
+            try:
+                result = await self.inner._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as exc:
+                self.limiter.release(estimated, None)
+                await asyncio.sleep(self._handle_failure(exc, attempt))
+                continue
+            self.limiter.release(estimated, _usage_tokens(result))
+            result.llm_output = {**(result.llm_output or {}), "queue_wait_s": waited}
+            return result
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        if not self.coalesce:
+            return await self._acall_with_retries(messages, stop, run_manager, kwargs)
+
+        key = self._coalesce_key(messages, stop, kwargs)
+        with self.limiter._cond:
+            leader = key not in self.limiter._inflight
+            if leader:
+                future = self.limiter._inflight[key] = Future()
+            else:
+                future = self.limiter._inflight[key]
+                self.limiter.coalesced += 1
+        if not leader:
+            return copy.deepcopy(await asyncio.wrap_future(future))
+        try:
+            result = await self._acall_with_retries(messages, stop, run_manager, kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self.limiter._cond:
+                self.limiter._inflight.pop(key, None)
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        estimated = _estimate_tokens(messages, kwargs, self.inner)
+        for attempt in itertools.count():
+            await self.limiter.aacquire(estimated, self._priority())
+            started = False
+            try:
+                async for chunk in self.inner._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    started = True
+                    yield chunk
+            except Exception as exc:
+                self.limiter.release(estimated, None)
+                if started:
+                    raise
+                await asyncio.sleep(self._handle_failure(exc, attempt))
+                continue
+            self.limiter.release(estimated, None)
+            return
+
+
+# ========================
+# Factory
+# ========================
+
+def _build_provider_model(provider: str, model: str, **kwargs: Any) -> BaseChatModel:
+    # Provider packages are imported lazily so callers only need the one they use
+    if provider == "groq":
+        from langchain_groq import ChatGroq
+        return ChatGroq(model=model, **kwargs)
+    if provider == "openai":
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(model=model, **kwargs)
+    raise ValueError(f"Unknown LLM provider: {provider!r} (expected 'groq' or 'openai')")
+
+
+def get_chat_model(provider: str, model: str, *, priority: Optional[int] = None,
+                   max_attempts: int = 5, coalesce: bool = True,
+                   cache: Union[str, BaseCache, None] = "auto", **kwargs: Any) -> ManagedChatModel:
+    """
+    Create a rate-limited chat model.
+
+    Args:
+        provider: "groq" or "openai"
+        model: Provider model name, e.g. "gemma2-9b-it" or "gpt-4o"
+        priority: Default queue priority for this model's calls (lower = sooner)
+        max_attempts: Attempts per call, including the first, for retryable errors
+        coalesce: Share one provider call between identical concurrent requests
+        cache: "auto" uses the persistent response cache only when sampling is
+            deterministic (temperature=0); "on" always uses it; "off"/None
+            disables it; a BaseCache
+            instance is used as given
+        **kwargs: Passed to the provider model (temperature, api_key, base_url, ...)
+
+    Returns:
+        A ManagedChatModel sharing its limiter with every other model created for
+        the same provider/model in this process
+    """
+    # API keys come from .env; loaded here so importing a graph module stays side-effect free
+    load_env()
+    # Retries are handled here (with a shared backoff), not by the provider SDK
+    kwargs.setdefault("max_retries", 0)
+    inner = _build_provider_model(provider, model, **kwargs)
+    if cache == "auto":
+        cache = get_default_cache() if is_deterministic(kwargs) else None
+    elif cache == "on":
+        cache = get_default_cache()
+    elif cache == "off":
+        cache = None
+    return ManagedChatModel(
+        inner=inner,
+        # False (not None) so an unrelated global cache isn't picked up either
+        cache=cache if isinstance(cache, BaseCache) else False,
+        limiter=get_limiter(provider, model),
+        priority=priority,
+        max_attempts=max_attempts,
+        coalesce=coalesce,
+    )
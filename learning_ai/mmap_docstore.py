@@ -0,0 +1,270 @@
+"""
+Memory-mapped, columnar docstore for FAISS vector stores.
+
+LangChain's FAISS keeps two Python structures with one entry per chunk: an
+InMemoryDocstore of Document objects and the index_to_docstore_id dict. Each
+Document costs about a kilobyte of interpreter objects on top of its text, so with
+millions of chunks RSS is mostly object overhead, and every worker process pays it
+again.
+
+MmapDocstore keeps the payloads in a read-only directory of flat files, opened with
+mmap:
+
+    manifest.json             row count, the metadata column layout and (to_mmap_faiss) the
+                              FAISS settings: distance strategy and L2 normalisation
+    text.bin / text.off       UTF-8 page_content blob + uint64 offsets (n + 1)
+    ids.bin / ids.off         docstore ids, same layout
+    ids.order                 uint32 row numbers sorted by id, for id -> row binary search
+    meta.<i>.codes            per metadata key, a dictionary-encoded column (uint32 code per row,
+    meta.<i>.dict.json        plus the distinct values) for low-cardinality keys such as "source";
+    meta.<i>.bin / .off       or a blob of JSON values for high-cardinality keys
+
+Only the rows a search returns are decoded into Documents. The files are shared
+through the OS page cache, so N worker processes map one copy. A chunk costs about
+30 bytes of index structures plus its text, which stays in the page cache instead
+of the Python heap.
+
+The store is read-only: build it once (write_docstore / to_mmap_faiss) and rebuild it
+to add documents.
+
+Example:
+    store = to_mmap_faiss(FAISS.from_documents(docs, embeddings), "pets_index")
+    store = load_mmap_faiss("pets_index", embeddings)  # in each worker
+"""
+
+import json
+import logging
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+from langchain_community.docstore.base import Docstore
+from langchain_core.documents import Document
+
+logger = logging.getLogger("learning_ai.mmap_docstore")
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+MISSING = 0xFFFFFFFF  # code for "row has no value for this key"
+
+# A key with at most this many distinct values (and at most one per 4 rows) is dictionary-encoded
+MAX_DICTIONARY_SIZE = 65536
+
+
+def _write_blob(path: Path, values: Sequence[bytes]) -> None:
+    offsets = memoryview(bytearray(8 * (len(values) + 1))).cast("Q")
+    position = 0
+    with open(f"{path}.bin", "wb") as blob:
+        for i, value in enumerate(values):
+            offsets[i] = position
+            blob.write(value)
+            position += len(value)
+    offsets[len(values)] = position
+    Path(f"{path}.off").write_bytes(offsets.tobytes())
+
+
+def write_docstore(path: os.PathLike, documents: Sequence[Document], ids: Sequence[str]) -> Path:
+    """
+    Write documents (row i has id ids[i]) as a columnar docstore directory.
+
+    Returns:
+        The directory
+    """
+    if len(documents) != len(ids):
+        raise ValueError("write_docstore needs one id per document.")
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    count = len(documents)
+
+    _write_blob(path / "text", [doc.page_content.encode() for doc in documents])
+    _write_blob(path / "ids", [str(i).encode() for i in ids])
+    order = memoryview(bytearray(4 * count)).cast("I")
+    for position, row in enumerate(sorted(range(count), key=lambda row: str(ids[row]))):
+        order[position] = row
+    (path / "ids.order").write_bytes(order.tobytes())
+
+    columns = []
+    keys = sorted({key for doc in documents for key in doc.metadata})
+    for i, key in enumerate(keys):
+        encoded = [json.dumps(doc.metadata[key], sort_keys=True) if key in doc.metadata else None
+                   for doc in documents]
+        distinct = sorted({value for value in encoded if value is not None})
+        if len(distinct) <= min(MAX_DICTIONARY_SIZE, max(1, count // 4)):
+            code_of = {value: code for code, value in enumerate(distinct)}
+            codes = memoryview(bytearray(4 * count)).cast("I")
+            for row, value in enumerate(encoded):
+                codes[row] = MISSING if value is None else code_of[value]
+            (path / f"meta.{i}.codes").write_bytes(codes.tobytes())
+            (path / f"meta.{i}.dict.json").write_text(json.dumps(distinct))
+            columns.append({"key": key, "encoding": "dictionary"})
+        else:
+            # An empty value marks a missing key (json.dumps never returns an empty string)
+            _write_blob(path / f"meta.{i}", [(value or "").encode() for value in encoded])
+            columns.append({"key": key, "encoding": "blob"})
+
+    manifest = {"format": FORMAT_VERSION, "count": count, "columns": columns}
+    (path / MANIFEST).write_text(json.dumps(manifest, indent=2))
+    return path
+
+
+class _Blob:
+    """Variable-length values: an mmapped data file plus an mmapped uint64 offset array."""
+
+    def __init__(self, base: Path):
+        self._data = _map(Path(f"{base}.bin"))
+        self._offsets = memoryview(_map(Path(f"{base}.off"))).cast("Q")
+
+    def __getitem__(self, row: int) -> bytes:
+        return self._data[self._offsets[row]:self._offsets[row + 1]]
+
+
+def _map(path: Path) -> Union[mmap.mmap, bytes]:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""  # mmap can't map an empty file
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class MmapDocstore(Docstore):
+    """
+    Read-only docstore over a write_docstore() directory.
+
+    Args:
+        path: Directory written by write_docstore()
+    """
+
+    def __init__(self, path: os.PathLike):
+        self.path = Path(path)
+        manifest = json.loads((self.path / MANIFEST).read_text())
+        if manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"{self.path} has docstore format {manifest.get('format')}, expected {FORMAT_VERSION}.")
+        self.count = manifest["count"]
+        self._text = _Blob(self.path / "text")
+        self._ids = _Blob(self.path / "ids")
+        self._order = memoryview(_map(self.path / "ids.order")).cast("I") if self.count else []
+        self._columns = []
+        for i, column in enumerate(manifest["columns"]):
+            if column["encoding"] == "dictionary":
+                codes = memoryview(_map(self.path / f"meta.{i}.codes")).cast("I")
+                values = json.loads((self.path / f"meta.{i}.dict.json").read_text())
+                self._columns.append((column["key"], codes, values))
+            else:
+                self._columns.append((column["key"], _Blob(self.path / f"meta.{i}"), None))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def id_at(self, row: int) -> str:
+        return self._ids[row].decode()
+
+    def row_of(self, doc_id: str) -> Optional[int]:
+        """Row holding `doc_id` (binary search over the sorted id order), or None."""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.id_at(self._order[middle]) < doc_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self.id_at(self._order[low]) == doc_id:
+            return self._order[low]
+        return None
+
+    def document_at(self, row: int) -> Document:
+        metadata: Dict[str, Any] = {}
+        for key, column, values in self._columns:
+            if values is not None:
+                code = column[row]
+                if code != MISSING:
+                    metadata[key] = json.loads(values[code])
+            else:
+                raw = column[row]
+                if raw:
+                    metadata[key] = json.loads(raw)
+        return Document(page_content=self._text[row].decode(), metadata=metadata, id=self.id_at(row))
+
+    def search(self, search: str) -> Union[str, Document]:
+        row = self.row_of(search)
+        if row is None:
+            return f"ID {search} not found."
+        return self.document_at(row)
+
+    def mget(self, ids: Sequence[str]) -> List[Optional[Document]]:
+        rows = [self.row_of(doc_id) for doc_id in ids]
+        return [None if row is None else self.document_at(row) for row in rows]
+
+
+class RowIdMap(Mapping[int, str]):
+    """index_to_docstore_id for FAISS that reads ids from the docstore instead of a dict."""
+
+    def __init__(self, docstore: MmapDocstore):
+        self.docstore = docstore
+
+    def __getitem__(self, row: int) -> str:
+        if not 0 <= row < self.docstore.count:
+            raise KeyError(row)
+        return self.docstore.id_at(row)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self.docstore.count))
+
+    def __len__(self) -> int:
+        return self.docstore.count
+
+
+def to_mmap_faiss(store, path: os.PathLike):
+    """
+    Write a FAISS store's index and documents to `path` and return a copy backed by MmapDocstore.
+
+    Rows follow the FAISS index order, so vector i's document is row i. The store's
+    distance strategy and normalize_L2 are saved in the manifest and restored on load; a
+    custom relevance_score_fn can't be saved, so pass it to load_mmap_faiss() again.
+    """
+    import faiss
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    ids = [store.index_to_docstore_id[i] for i in range(store.index.ntotal)]
+    documents = [store.docstore.search(doc_id) for doc_id in ids]
+    write_docstore(path, documents, ids)
+    faiss.write_index(store.index, str(path / "index.faiss"))
+    manifest = json.loads((path / MANIFEST).read_text())
+    manifest["faiss"] = {
+        "distance_strategy": getattr(store.distance_strategy, "value", store.distance_strategy),
+        "normalize_L2": bool(store._normalize_L2),
+        "custom_relevance_score_fn": store.override_relevance_score_fn is not None,
+    }
+    (path / MANIFEST).write_text(json.dumps(manifest, indent=2))
+    return load_mmap_faiss(path, store.embedding_function, relevance_score_fn=store.override_relevance_score_fn)
+
+
+def load_mmap_faiss(path: os.PathLike, embeddings, mmap_index: bool = False, **kwargs):
+    """
+    Open a to_mmap_faiss() directory as a FAISS vector store.
+
+    Args:
+        path: Directory written by to_mmap_faiss()
+        embeddings: Embedding model for queries (the one the index was built with)
+        mmap_index: Memory-map the FAISS index too, so processes share it as well (needs an index
+            type and faiss build that support IO_FLAG_MMAP)
+        kwargs: Passed to the FAISS constructor (e.g. relevance_score_fn); they override the
+            distance_strategy and normalize_L2 saved by to_mmap_faiss()
+    """
+    import faiss
+    from langchain_community.vectorstores import FAISS
+    from langchain_community.vectorstores.utils import DistanceStrategy
+
+    path = Path(path)
+    settings = json.loads((path / MANIFEST).read_text()).get("faiss", {})
+    if "distance_strategy" in settings:
+        kwargs.setdefault("distance_strategy", DistanceStrategy(settings["distance_strategy"]))
+    if "normalize_L2" in settings:
+        kwargs.setdefault("normalize_L2", settings["normalize_L2"])
+    if settings.get("custom_relevance_score_fn") and kwargs.get("relevance_score_fn") is None:
+        logger.warning("%s was built from a store with a custom relevance_score_fn; pass it again "
+                       "(relevance_score_fn=...) or relevance scores use the distance strategy's default", path)
+    flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if mmap_index else 0
+    index = faiss.read_index(str(path / "index.faiss"), flags)
+    docstore = MmapDocstore(path)
+    return FAISS(embeddings, index, docstore, RowIdMap(docstore), **kwargs)
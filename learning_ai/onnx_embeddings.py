@@ -0,0 +1,342 @@
+"""
+Local CPU sentence embeddings: ONNX int8 model, dynamic batching, one model per host.
+
+HuggingFaceEmbeddings("all-MiniLM-L6-v2") loads torch and a float32
+sentence-transformers model into every script that embeds. On CPU, a dynamically
+quantized (int8) ONNX export of the same model runs several times faster with a
+fraction of the memory. This module:
+
+1. exports the model once (`python -m learning_ai.onnx_embeddings export`), using
+   optimum for the ONNX export and dynamic int8 quantization, into
+   ~/.cache/learning_ai/onnx/<model> (ONNX_EMBEDDINGS_DIR overrides)
+2. runs it with onnxruntime and the Rust `tokenizers` tokenizer (no torch or
+   transformers at inference time), with mean pooling and L2 normalisation like
+   sentence-transformers
+3. puts a DynamicBatcher in front: concurrent requests are collected for up to
+   `max_wait_ms`, sorted by length so each batch is padded only to its own longest text,
+   run together, and the results are handed back in request order
+4. optionally serves it to every process on the host
+   (`python -m learning_ai.onnx_embeddings serve`), so the model is loaded once;
+   RemoteEmbeddings is the client
+
+local_embeddings() returns the best available option: the server if EMBEDDING_SERVER
+is set, else the exported ONNX model, else HuggingFaceEmbeddings.
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger("learning_ai.onnx_embeddings")
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_SOCKET = "/tmp/learning_ai_embeddings.sock"
+QUANTIZED_FILE = "model_quantized.onnx"
+MAX_LINE = 64 * 1024 * 1024
+
+
+def model_dir(model_name: str = DEFAULT_MODEL) -> Path:
+    root = Path(os.getenv("ONNX_EMBEDDINGS_DIR", Path.home() / ".cache" / "learning_ai" / "onnx"))
+    return root / model_name.replace("/", "__")
+
+
+def export_onnx(model_name: str = DEFAULT_MODEL, out_dir: Optional[os.PathLike] = None, quantize: bool = True) -> Path:
+    """
+    Export a sentence-transformers model to ONNX (and dynamic int8) with its tokenizer.
+
+    Needs `optimum[onnxruntime]`, at export time only.
+
+    Returns:
+        The model directory
+    """
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    out_dir = Path(out_dir or model_dir(model_name))
+    model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+    model.save_pretrained(out_dir)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(out_dir)
+    if quantize:
+        # Dynamic quantization: int8 weights, activations quantized per batch; no calibration data
+        quantizer = ORTQuantizer.from_pretrained(out_dir)
+        quantizer.quantize(save_dir=out_dir, quantization_config=AutoQuantizationConfig.avx2(is_static=False))
+    return out_dir
+
+
+class OnnxSentenceEncoder:
+    """
+    Mean-pooled, normalised sentence embeddings from an exported ONNX model.
+
+    Args:
+        path: Directory from export_onnx()
+        max_length: Token limit per text (MiniLM was trained with 256)
+        batch_size: Texts per forward pass
+        threads: onnxruntime intra-op threads (defaults to onnxruntime's choice)
+    """
+
+    def __init__(self, path: Optional[os.PathLike] = None, max_length: int = 256, batch_size: int = 64,
+                 threads: Optional[int] = None):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        path = Path(path or model_dir())
+        model_file = path / QUANTIZED_FILE if (path / QUANTIZED_FILE).exists() else path / "model.onnx"
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(str(model_file), options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = Tokenizer.from_file(str(path / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()  # pad to the longest text of each batch, not to max_length
+        self.batch_size = batch_size
+        self.model_file = model_file
+
+    def _forward(self, texts: Sequence[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(list(texts))
+        ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+        hidden = self.session.run(None, feeds)[0]  # (batch, tokens, dim)
+        weights = mask[..., None].astype(np.float32)
+        pooled = (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts; they are run in length order so each batch carries little padding."""
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors = [None] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            chunk = order[start:start + self.batch_size]
+            for i, vector in zip(chunk, self._forward([texts[i] for i in chunk])):
+                vectors[i] = vector
+        return np.stack(vectors).astype(np.float32)
+
+
+class DynamicBatcher:
+    """
+    Collect encode requests from many threads into shared model calls.
+
+    The worker takes the first waiting request, then keeps collecting for up to
+    `max_wait_ms` or until `max_batch` texts are queued, encodes everything in one call,
+    and resolves each request's Future with its own rows.
+    """
+
+    def __init__(self, encoder: OnnxSentenceEncoder, max_batch: int = 256, max_wait_ms: float = 5.0):
+        self.encoder = encoder
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_ms / 1000
+        self._requests: "queue.Queue[Tuple[List[str], Future]]" = queue.Queue()
+        self.calls = 0
+        self.texts = 0
+        threading.Thread(target=self._run, name="embedding-batcher", daemon=True).start()
+
+    def submit(self, texts: Sequence[str]) -> Future:
+        future: Future = Future()
+        self._requests.put((list(texts), future))
+        return future
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._requests.get()]
+            size = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait_s
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    request = self._requests.get(timeout=remaining) if remaining > 0 else self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(request)
+                size += len(request[0])
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            try:
+                vectors = self.encoder.encode(texts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.calls += 1
+            self.texts += len(texts)
+            start = 0
+            for request_texts, future in batch:
+                future.set_result(vectors[start:start + len(request_texts)])
+                start += len(request_texts)
+
+
+class OnnxEmbeddings(Embeddings):
+    """
+    LangChain Embeddings over the ONNX encoder and a DynamicBatcher.
+
+    Use get_onnx_embeddings() to share one model per process.
+    """
+
+    def __init__(self, path: Optional[os.PathLike] = None, max_batch: int = 256, max_wait_ms: float = 5.0, **kwargs):
+        self.batcher = DynamicBatcher(OnnxSentenceEncoder(path, **kwargs), max_batch, max_wait_ms)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.batcher.submit(texts).result().tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return (await asyncio.wrap_future(self.batcher.submit(texts))).tolist()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+@functools.lru_cache(maxsize=None)
+def get_onnx_embeddings(model_name: str = DEFAULT_MODEL) -> OnnxEmbeddings:
+    """Process-wide OnnxEmbeddings for an exported model."""
+    return OnnxEmbeddings(model_dir(model_name))
+
+
+class RemoteEmbeddings(Embeddings):
+    """
+    Embeddings client for `python -m learning_ai.onnx_embeddings serve`.
+
+    Args:
+        address: Unix socket path of the embedding server
+        timeout_s: Connect / read timeout
+    """
+
+    def __init__(self, address: str = DEFAULT_SOCKET, timeout_s: float = 60.0):
+        self.address = address
+        self.timeout_s = timeout_s
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout_s)
+            sock.connect(self.address)
+            sock.sendall(json.dumps({"texts": texts}).encode() + b"\n")
+            with sock.makefile("rb") as stream:
+                response = json.loads(stream.readline(MAX_LINE) or b'{"error": "connection closed"}')
+        if "error" in response:
+            raise RuntimeError(f"Embedding server error: {response['error']}")
+        return response["vectors"]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(self.address, limit=MAX_LINE),
+                                                self.timeout_s)
+        try:
+            writer.write(json.dumps({"texts": texts}).encode() + b"\n")
+            await writer.drain()
+            response = json.loads(await asyncio.wait_for(reader.readline(), self.timeout_s)
+                                  or b'{"error": "connection closed"}')
+        finally:
+            writer.close()
+        if "error" in response:
+            raise RuntimeError(f"Embedding server error: {response['error']}")
+        return response["vectors"]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+def local_embeddings(model_name: str = DEFAULT_MODEL) -> Embeddings:
+    """The embedding server (EMBEDDING_SERVER), else the exported ONNX model, else HuggingFaceEmbeddings."""
+    server = os.getenv("EMBEDDING_SERVER")
+    if server:
+        return RemoteEmbeddings(server)
+    if (model_dir(model_name) / "tokenizer.json").exists():
+        return get_onnx_embeddings(model_name)
+    from langchain_huggingface import HuggingFaceEmbeddings  # pulls in torch; only when needed
+    return HuggingFaceEmbeddings(model_name=model_name.rpartition("/")[2])
+
+
+async def serve(embeddings: OnnxEmbeddings, path: str = DEFAULT_SOCKET) -> None:
+    """Serve {"texts": [...]} -> {"vectors": [...]} requests on a Unix socket until cancelled."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    vectors = await embeddings.aembed_documents(json.loads(line)["texts"])
+                    response = {"vectors": vectors}
+                except Exception as e:
+                    response = {"error": f"{type(e).__name__}: {e}"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    if os.path.exists(path):
+        os.unlink(path)
+    server = await asyncio.start_unix_server(handle, path=path, limit=MAX_LINE)
+    logger.info("serving %s on %s", embeddings.batcher.encoder.model_file, path)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m learning_ai.onnx_embeddings",
+                                     description="Export, serve or benchmark the local ONNX embedding model.")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="Export the model to ONNX and quantize it to int8")
+    export.add_argument("--no-quantize", action="store_true")
+    serve_parser = commands.add_parser("serve", help="Serve the model to local processes")
+    serve_parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    serve_parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    bench = commands.add_parser("bench", help="Embed synthetic texts and print throughput")
+    bench.add_argument("--texts", type=int, default=2000)
+    bench.add_argument("--clients", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+    if args.command == "export":
+        print(export_onnx(args.model, quantize=not args.no_quantize))
+        return 0
+    embeddings = OnnxEmbeddings(model_dir(args.model), max_wait_ms=getattr(args, "max_wait_ms", 5.0))
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(embeddings, args.socket))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    texts = [" ".join(["token"] * (5 + i % 120)) + f" {i}" for i in range(args.texts)]
+    per_client = max(1, len(texts) // args.clients)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.clients) as pool:
+        list(pool.map(lambda i: [embeddings.embed_query(t) for t in texts[i:i + per_client]],
+                      range(0, len(texts), per_client)))
+    elapsed = time.perf_counter() - started
+    batcher = embeddings.batcher
+    print(f"{len(texts) / elapsed:.1f} texts/s, {batcher.texts / max(batcher.calls, 1):.1f} texts per model call")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,366 @@
+"""
+Local retrieval service: one process holds the vector index, many processes query it.
+
+Every example used to build or load its own FAISS store, so a box running many app
+workers held one copy of the index per worker. RetrievalServer loads the index once
+(optionally from a memory-mapped to_mmap_faiss() directory) and serves k-NN search
+over a Unix socket or TCP. RemoteRetriever is the BaseRetriever clients use instead
+of vectorstore.as_retriever().
+
+Concurrent queries are batched. Requests wait up to `max_wait_ms` (or until
+`max_batch` have arrived) and are then answered with one multi-query index.search,
+which is much cheaper than N single searches. While a batch is running, new requests
+queue up for the next one, so batches grow with load. Queries are embedded with
+embed_query, like FAISS.similarity_search. For symmetric models (OpenAI, MiniLM), where
+embed_query(q) == embed_documents([q])[0], `batch_embed_queries=True` (--batch-embed)
+embeds the whole batch with one embed_documents call instead.
+
+"score" is the store's relevance score (higher is better, as in
+similarity_search_with_relevance_scores); "distance" is the raw index distance.
+
+Protocol: newline-delimited JSON, several requests per connection allowed.
+
+    -> {"id": 1, "query": "...", "k": 4, "filter": {"source": "..."}}
+    <- {"id": 1, "documents": [{"page_content": ..., "metadata": ..., "id": ..., "score": ..., "distance": ...}]}
+    <- {"id": 1, "error": "..."}                         on failure
+
+Serve:
+    python -m learning_ai.retrieval_server --index pets_index --socket /tmp/pets.sock
+    python -m learning_ai.retrieval_server --artifact --socket /tmp/docs.sock   # tools-agent docs
+
+Use:
+    retriever = RemoteRetriever(address="/tmp/pets.sock", k=4)
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.callbacks import AsyncCallbackManagerForRetrieverRun, CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+logger = logging.getLogger("learning_ai.retrieval_server")
+
+DEFAULT_SOCKET = "/tmp/learning_ai_retrieval.sock"
+MAX_LINE = 16 * 1024 * 1024
+
+
+def _parse_address(address: str) -> Tuple[str, Any]:
+    """("unix", path) for "unix:/path" or "/path", ("tcp", (host, port)) for "host:port"."""
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    if "/" in address or ":" not in address:
+        return "unix", address
+    host, _, port = address.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+class _Pending:
+    __slots__ = ("query", "k", "filter", "future")
+
+    def __init__(self, query: str, k: int, filter: Optional[Dict[str, Any]], future: asyncio.Future):
+        self.query = query
+        self.k = k
+        self.filter = filter
+        self.future = future
+
+
+class RetrievalServer:
+    """
+    Batched k-NN search over one FAISS store.
+
+    Args:
+        store: LangChain FAISS vector store (e.g. from load_mmap_faiss or FAISS.load_local)
+        max_batch: Most queries answered by one index search
+        max_wait_ms: How long the first query of a batch waits for company
+        max_k: Upper bound on k per request
+        filter_fetch_factor: With a metadata filter, fetch k * this many neighbours before filtering
+        batch_embed_queries: Embed a batch with one embed_documents call; only correct for models
+            that embed queries and documents the same way
+    """
+
+    def __init__(self, store, max_batch: int = 64, max_wait_ms: float = 2.0, max_k: int = 50,
+                 filter_fetch_factor: int = 4, batch_embed_queries: bool = False):
+        self.store = store
+        self.batch_embed_queries = batch_embed_queries
+        # Distance -> [0, 1] relevance, honouring the store's distance strategy and any override
+        self.relevance = store._select_relevance_score_fn()
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_ms / 1000
+        self.max_k = max_k
+        self.filter_fetch_factor = filter_fetch_factor
+        self.queries = 0
+        self.batches = 0
+        self._queue: Optional[asyncio.Queue] = None
+
+    # ---------- search ----------
+
+    def _embed(self, texts: List[str]):
+        import numpy as np
+
+        embeddings = self.store.embedding_function
+        if self.batch_embed_queries and hasattr(embeddings, "embed_documents"):
+            vectors = embeddings.embed_documents(texts)
+        elif hasattr(embeddings, "embed_query"):
+            vectors = [embeddings.embed_query(text) for text in texts]
+        else:
+            vectors = [embeddings(text) for text in texts]  # FAISS also accepts a plain function
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if getattr(self.store, "_normalize_L2", False):
+            import faiss
+            faiss.normalize_L2(matrix)
+        return matrix
+
+    def search_batch(self, requests: List[Tuple[str, int, Optional[Dict[str, Any]]]]) -> List[List[Dict[str, Any]]]:
+        """Answer (query, k, filter) requests with one index search."""
+        if self.store.index.ntotal == 0:
+            return [[] for _ in requests]
+        matrix = self._embed([query for query, _, _ in requests])
+        fetch = max(k * (self.filter_fetch_factor if metadata_filter else 1) for _, k, metadata_filter in requests)
+        distances, rows = self.store.index.search(matrix, min(fetch, self.store.index.ntotal))
+        results = []
+        for (_, k, metadata_filter), row_distances, row_ids in zip(requests, distances, rows):
+            documents = []
+            for distance, row in zip(row_distances, row_ids):
+                if row == -1:
+                    continue
+                doc_id = self.store.index_to_docstore_id[int(row)]
+                doc = self.store.docstore.search(doc_id)
+                if not isinstance(doc, Document):
+                    continue
+                if metadata_filter and any(doc.metadata.get(key) != value for key, value in metadata_filter.items()):
+                    continue
+                documents.append({"page_content": doc.page_content, "metadata": doc.metadata,
+                                  "id": doc_id, "score": float(self.relevance(float(distance))),
+                                  "distance": float(distance)})
+                if len(documents) == k:
+                    break
+            results.append(documents)
+        return results
+
+    async def search(self, query: str, k: int = 4, metadata_filter: Optional[Dict[str, Any]] = None):
+        """Queue one query for the next batch and wait for its documents."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_Pending(query, min(max(1, k), self.max_k), metadata_filter, future))
+        return await future
+
+    async def _batcher(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_s
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0 and self._queue.empty():
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), max(remaining, 0)))
+                except asyncio.TimeoutError:
+                    break
+            batch = [pending for pending in batch if not pending.future.cancelled()]
+            if not batch:
+                continue
+            try:
+                # faiss and most embedding clients release the GIL, so the event loop keeps accepting
+                results = await loop.run_in_executor(
+                    None, self.search_batch, [(p.query, p.k, p.filter) for p in batch])
+            except Exception as e:
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+                continue
+            self.batches += 1
+            self.queries += len(batch)
+            for pending, documents in zip(batch, results):
+                if not pending.future.done():
+                    pending.future.set_result(documents)
+
+    # ---------- connections ----------
+
+    async def _respond(self, request: Dict[str, Any], writer: asyncio.StreamWriter, lock: asyncio.Lock) -> None:
+        try:
+            documents = await self.search(request["query"], int(request.get("k", 4)), request.get("filter"))
+            response = {"id": request.get("id"), "documents": documents}
+        except Exception as e:
+            response = {"id": request.get("id"), "error": f"{type(e).__name__}: {e}"}
+        async with lock:
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    async with lock:
+                        writer.write(b'{"id": null, "error": "invalid JSON"}\n')
+                    continue
+                # Requests on one connection are answered as they finish, matched by id
+                task = asyncio.create_task(self._respond(request, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, address: str = DEFAULT_SOCKET) -> None:
+        """Serve until cancelled."""
+        self._queue = asyncio.Queue()
+        batcher = asyncio.create_task(self._batcher())
+        kind, target = _parse_address(address)
+        if kind == "unix":
+            if os.path.exists(target):
+                os.unlink(target)  # stale socket from an earlier run
+            server = await asyncio.start_unix_server(self._handle, path=target, limit=MAX_LINE)
+        else:
+            server = await asyncio.start_server(self._handle, *target, limit=MAX_LINE)
+        logger.info("serving %d vectors on %s", self.store.index.ntotal, address)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            if kind == "unix" and os.path.exists(target):
+                os.unlink(target)
+
+    def stats(self) -> Dict[str, float]:
+        return {"queries": self.queries, "batches": self.batches,
+                "mean_batch": self.queries / self.batches if self.batches else 0.0}
+
+
+class RemoteRetriever(BaseRetriever):
+    """
+    BaseRetriever backed by a RetrievalServer.
+
+    Args:
+        address: Socket path ("/tmp/x.sock" or "unix:/tmp/x.sock") or "host:port"
+        k: Documents per query
+        filter: Metadata equality filter applied on the server
+        timeout_s: Connect / read timeout
+    """
+
+    address: str = DEFAULT_SOCKET
+    k: int = 4
+    filter: Optional[Dict[str, Any]] = None
+    timeout_s: float = 30.0
+
+    def _request(self, query: str) -> bytes:
+        return json.dumps({"id": 0, "query": query, "k": self.k, "filter": self.filter}).encode() + b"\n"
+
+    @staticmethod
+    def _documents(line: bytes) -> List[Document]:
+        response = json.loads(line)
+        if "error" in response:
+            raise RuntimeError(f"Retrieval server error: {response['error']}")
+        # "score" is a relevance score (higher is better), as ContextPacker expects
+        return [Document(page_content=d["page_content"],
+                         metadata={**d["metadata"], "score": d["score"], "distance": d["distance"]}, id=d["id"])
+                for d in response["documents"]]
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        kind, target = _parse_address(self.address)
+        family = socket.AF_UNIX if kind == "unix" else socket.AF_INET
+        with socket.socket(family, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout_s)
+            sock.connect(target)
+            sock.sendall(self._request(query))
+            with sock.makefile("rb") as stream:
+                line = stream.readline(MAX_LINE)
+        if not line:
+            raise ConnectionError(f"Retrieval server at {self.address} closed the connection.")
+        return self._documents(line)
+
+    async def _aget_relevant_documents(self, query: str, *,
+                                       run_manager: AsyncCallbackManagerForRetrieverRun) -> List[Document]:
+        kind, target = _parse_address(self.address)
+        if kind == "unix":
+            connect = asyncio.open_unix_connection(target, limit=MAX_LINE)
+        else:
+            connect = asyncio.open_connection(*target, limit=MAX_LINE)
+        reader, writer = await asyncio.wait_for(connect, self.timeout_s)
+        try:
+            writer.write(self._request(query))
+            await writer.drain()
+            line = await asyncio.wait_for(reader.readline(), self.timeout_s)
+        finally:
+            writer.close()
+        if not line:
+            raise ConnectionError(f"Retrieval server at {self.address} closed the connection.")
+        return self._documents(line)
+
+
+def load_store(index: Optional[str], embeddings, artifact: bool = False):
+    """FAISS store from a to_mmap_faiss() directory, a FAISS.save_local() directory or the docs artifact."""
+    if artifact:
+        from learning_ai.retriever_artifact import load_artifact
+        return load_artifact(index, embeddings).vectorstore
+    path = Path(index)
+    if (path / "manifest.json").exists() and not (path / "index.pkl").exists():
+        from learning_ai.mmap_docstore import load_mmap_faiss
+        return load_mmap_faiss(path, embeddings)
+    from langchain_community.vectorstores import FAISS
+    # Only serve indexes you built yourself: index.pkl is unpickled
+    return FAISS.load_local(str(path), embeddings, allow_dangerous_deserialization=True)
+
+
+def _embeddings(spec: str):
+    """'openai[:model]', 'huggingface:<model>' or 'onnx[:<model>]'."""
+    provider, _, model = spec.partition(":")
+    if provider == "openai":
+        from learning_ai.retriever_artifact import DEFAULT_EMBEDDING_MODEL, default_embeddings
+        return default_embeddings(model or DEFAULT_EMBEDDING_MODEL)
+    if provider == "huggingface":
+        from langchain_huggingface import HuggingFaceEmbeddings
+        return HuggingFaceEmbeddings(model_name=model or "all-MiniLM-L6-v2")
+    if provider == "onnx":
+        from learning_ai.onnx_embeddings import DEFAULT_MODEL, get_onnx_embeddings
+        return get_onnx_embeddings(model or DEFAULT_MODEL)
+    raise ValueError(f"Unknown embeddings {spec!r}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m learning_ai.retrieval_server",
+                                     description="Serve k-NN search over one FAISS index to many processes.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--index", help="to_mmap_faiss() or FAISS.save_local() directory")
+    source.add_argument("--artifact", action="store_true", help="Serve the tools agent's docs artifact")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Socket path or host:port")
+    parser.add_argument("--embeddings", default=None,
+                        help="openai[:model], huggingface:<model> or onnx[:<model>] (artifacts use their manifest's model)")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--batch-embed", action="store_true",
+                        help="One embed_documents call per batch (symmetric embedding models only)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+    embeddings = _embeddings(args.embeddings) if args.embeddings else None
+    if embeddings is None and not args.artifact:
+        embeddings = _embeddings("openai")
+    started = time.perf_counter()
+    store = load_store(args.index, embeddings, artifact=args.artifact)
+    logger.info("loaded index in %.2fs", time.perf_counter() - started)
+    server = RetrievalServer(store, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms,
+                             batch_embed_queries=args.batch_embed)
+    try:
+        asyncio.run(server.serve(args.socket))
+    except KeyboardInterrupt:
+        logger.info("stopped: %s", server.stats())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,302 @@
+"""
+Prebuilt, versioned retriever artifacts.
+
+Building the LangSmith-docs retriever for the tools agent means crawling a site,
+splitting it, embedding every chunk and pulling the agent prompt from the hub, all
+before the agent can answer anything. This module moves that work into an offline
+build step:
+
+    python -m learning_ai.retriever_artifact build          # crawl, embed, pull the prompt
+    python -m learning_ai.retriever_artifact show           # manifest of the current version
+
+An artifact directory holds one subdirectory per version plus a CURRENT pointer:
+
+    <root>/CURRENT                      name of the live version (replaced atomically)
+    <root>/<version>/index.faiss        FAISS index
+    <root>/<version>/index.pkl          FAISS docstore and id mapping
+    <root>/<version>/prompt.json        agent prompt, serialized with langchain_core.load
+    <root>/<version>/manifest.json      source, embedding model, counts and a sha256 per file
+
+load_artifact() checks every file against the manifest before deserializing it (the
+docstore is a pickle, so only files we wrote are loaded), which takes milliseconds.
+ArtifactRetriever serves queries from the loaded version. Its refresh thread swaps in a
+newer version when CURRENT changes, whether a cron job or the thread itself rebuilt it.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+
+logger = logging.getLogger("learning_ai.artifacts")
+
+DEFAULT_ROOT = Path.home() / ".cache" / "learning_ai" / "artifacts" / "langsmith_docs"
+DEFAULT_EMBEDDING_MODEL = "text-embedding-ada-002"
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+
+
+class ArtifactError(RuntimeError):
+    pass
+
+
+class Artifact(NamedTuple):
+    version: str
+    path: Path
+    vectorstore: Any  # FAISS
+    prompt: Any  # ChatPromptTemplate, or None if the artifact was built without one
+    manifest: Dict[str, Any]
+
+
+def artifact_root(root: Optional[os.PathLike] = None) -> Path:
+    return Path(root or os.getenv("TOOLS_AGENT_ARTIFACT_DIR", DEFAULT_ROOT))
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def default_embeddings(model: str = DEFAULT_EMBEDDING_MODEL) -> Embeddings:
+    """OpenAI embeddings; constructing the client makes no network call."""
+    from learning_ai.env import load_env
+    from langchain_openai import OpenAIEmbeddings
+    load_env()
+    return OpenAIEmbeddings(model=model)
+
+
+def current_version(root: Optional[os.PathLike] = None) -> Optional[str]:
+    try:
+        return (artifact_root(root) / "CURRENT").read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def build_artifact(root: Optional[os.PathLike] = None, documents: Optional[List[Document]] = None,
+                   url: Optional[str] = None, embeddings: Optional[Embeddings] = None,
+                   embedding_model: str = DEFAULT_EMBEDDING_MODEL, prompt: Any = None,
+                   prompt_ref: Optional[str] = None, keep: int = 3) -> str:
+    """
+    Build a new artifact version and make it current.
+
+    Args:
+        root: Artifact directory (defaults to TOOLS_AGENT_ARTIFACT_DIR or ~/.cache/learning_ai/artifacts/langsmith_docs)
+        documents: Chunks to index (defaults to crawling and splitting `url`)
+        url: Site crawled when no documents are given (defaults to the LangSmith docs)
+        embeddings: Embedding model (defaults to OpenAI `embedding_model`)
+        embedding_model: Name stored in the manifest; loads with a different model are refused
+        prompt: Prompt to store (defaults to pulling `prompt_ref` from the hub)
+        prompt_ref: Hub prompt to pull (defaults to the tools agent's prompt)
+        keep: Old versions to keep next to the new one
+
+    Returns:
+        The new version name
+    """
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.load import dumps
+
+    from learning_ai.chains.tools_agent import DOCS_URL, PROMPT_REF, load_docs
+
+    root = artifact_root(root)
+    url = url or DOCS_URL
+    if documents is None:
+        documents = load_docs(url)
+    embeddings = embeddings or default_embeddings(embedding_model)
+    if prompt is None:
+        from langchain import hub
+        prompt = hub.pull(prompt_ref or PROMPT_REF)
+
+    root.mkdir(parents=True, exist_ok=True)
+    staging = root / f".staging-{os.getpid()}-{time.time_ns()}"
+    FAISS.from_documents(documents, embeddings).save_local(str(staging))
+    (staging / "prompt.json").write_text(dumps(prompt))
+
+    files = {path.name: _sha256(path) for path in sorted(staging.iterdir())}
+    # Same content -> same version name, so rebuilding an unchanged site is recognisable
+    content_hash = hashlib.sha256(json.dumps(files, sort_keys=True).encode()).hexdigest()[:12]
+    version = time.strftime("%Y%m%dT%H%M%S") + "-" + content_hash
+    manifest = {
+        "format": FORMAT_VERSION,
+        "version": version,
+        "created_at": time.time(),
+        "source_url": url,
+        "documents": len(documents),
+        "embedding_model": embedding_model,
+        "files": files,
+    }
+    (staging / MANIFEST).write_text(json.dumps(manifest, indent=2))
+    staging.rename(root / version)
+
+    # Atomic pointer swap: readers see either the old or the new version, never a mix
+    pointer = root / f".CURRENT-{os.getpid()}"
+    pointer.write_text(version)
+    os.replace(pointer, root / "CURRENT")
+
+    versions = sorted(p for p in root.iterdir() if p.is_dir() and not p.name.startswith("."))
+    for old in versions[:-(keep + 1)]:
+        shutil.rmtree(old, ignore_errors=True)
+    logger.info("built artifact %s (%d documents)", version, len(documents))
+    return version
+
+
+def load_artifact(root: Optional[os.PathLike] = None, embeddings: Optional[Embeddings] = None,
+                  version: Optional[str] = None, verify: bool = True) -> Artifact:
+    """
+    Load an artifact version (the current one by default).
+
+    Raises:
+        ArtifactError: No artifact has been built, a checksum doesn't match, or the
+            artifact was built with a different embedding model
+    """
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.load import loads
+
+    root = artifact_root(root)
+    version = version or current_version(root)
+    if version is None:
+        raise ArtifactError(f"No artifact in {root}; run `python -m learning_ai.retriever_artifact build`.")
+    path = root / version
+    manifest = json.loads((path / MANIFEST).read_text())
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ArtifactError(f"Artifact {version} has format {manifest.get('format')}, expected {FORMAT_VERSION}.")
+    if verify:
+        for name, expected in manifest["files"].items():
+            if _sha256(path / name) != expected:
+                raise ArtifactError(f"Checksum mismatch for {path / name}; rebuild the artifact.")
+
+    model = manifest["embedding_model"]
+    if embeddings is None:
+        embeddings = default_embeddings(model)
+    elif getattr(embeddings, "model", model) != model:
+        raise ArtifactError(f"Artifact {version} was embedded with {model}, not {embeddings.model}.")
+
+    # The pickle was written by build_artifact and matched its checksum above
+    vectorstore = FAISS.load_local(str(path), embeddings, allow_dangerous_deserialization=True)
+    prompt_file = path / "prompt.json"
+    prompt = loads(prompt_file.read_text()) if prompt_file.exists() else None
+    return Artifact(version, path, vectorstore, prompt, manifest)
+
+
+def load_artifact_prompt(root: Optional[os.PathLike] = None) -> Any:
+    """Only the prompt of the current artifact (checksum-verified), or None if there is none."""
+    from langchain_core.load import loads
+
+    root = artifact_root(root)
+    version = current_version(root)
+    if version is None:
+        return None
+    path = root / version
+    expected = json.loads((path / MANIFEST).read_text())["files"].get("prompt.json")
+    if expected is None:
+        return None
+    if _sha256(path / "prompt.json") != expected:
+        raise ArtifactError(f"Checksum mismatch for {path / 'prompt.json'}; rebuild the artifact.")
+    return loads((path / "prompt.json").read_text())
+
+
+class ArtifactRetriever(BaseRetriever):
+    """
+    Retriever over the current artifact that can pick up new versions without a restart.
+
+    Create it with ArtifactRetriever.load(); start_refresh() polls CURRENT and, with
+    max_age_s, rebuilds the artifact in the background once it gets too old.
+    """
+
+    artifact: Artifact
+    k: int = 4
+    root: Optional[Path] = None
+    embeddings: Optional[Embeddings] = None
+
+    @classmethod
+    def load(cls, root: Optional[os.PathLike] = None, embeddings: Optional[Embeddings] = None,
+             k: int = 4) -> "ArtifactRetriever":
+        artifact = load_artifact(root, embeddings)
+        return cls(artifact=artifact, k=k, root=artifact_root(root), embeddings=embeddings)
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        # Read the attribute once so a concurrent swap can't mix two versions in one query
+        return self.artifact.vectorstore.similarity_search(query, k=self.k)
+
+    def reload_if_changed(self) -> bool:
+        """Switch to the version CURRENT points at; True if it changed."""
+        version = current_version(self.root)
+        if version is None or version == self.artifact.version:
+            return False
+        try:
+            self.artifact = load_artifact(self.root, self.embeddings, version)
+        except (ArtifactError, OSError) as e:
+            logger.warning("keeping artifact %s: could not load %s: %s", self.artifact.version, version, e)
+            return False
+        logger.info("switched to artifact %s", version)
+        return True
+
+    def start_refresh(self, interval_s: float = 300.0, max_age_s: Optional[float] = None,
+                      rebuild: Optional[Callable[[], str]] = None) -> threading.Event:
+        """
+        Poll for new versions in a daemon thread.
+
+        Args:
+            interval_s: Seconds between checks
+            max_age_s: Rebuild when the live artifact is older than this (None: only reload)
+            rebuild: Build function (defaults to build_artifact into the same root)
+
+        Returns:
+            An Event; set it to stop the thread
+        """
+        stop = threading.Event()
+        rebuild = rebuild or (lambda: build_artifact(self.root, embeddings=self.embeddings,
+                                                     embedding_model=self.artifact.manifest["embedding_model"]))
+
+        def loop():
+            while not stop.wait(interval_s):
+                try:
+                    if max_age_s is not None and time.time() - self.artifact.manifest["created_at"] > max_age_s:
+                        rebuild()
+                    self.reload_if_changed()
+                except Exception:
+                    logger.exception("artifact refresh failed; still serving %s", self.artifact.version)
+
+        threading.Thread(target=loop, name="artifact-refresh", daemon=True).start()
+        return stop
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m learning_ai.retriever_artifact",
+                                     description="Build or inspect the tools agent's retriever artifact.")
+    parser.add_argument("--root", help="Artifact directory (defaults to TOOLS_AGENT_ARTIFACT_DIR)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Crawl, embed and pull the prompt into a new version")
+    build.add_argument("--url", help="Site to crawl (defaults to the LangSmith docs)")
+    build.add_argument("--embedding-model", default=DEFAULT_EMBEDDING_MODEL)
+    build.add_argument("--keep", type=int, default=3, help="Old versions to keep")
+    commands.add_parser("show", help="Print the current manifest")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+    if args.command == "build":
+        print(build_artifact(args.root, url=args.url, embedding_model=args.embedding_model, keep=args.keep))
+        return 0
+    version = current_version(args.root)
+    if version is None:
+        print(f"No artifact in {artifact_root(args.root)}")
+        return 1
+    print((artifact_root(args.root) / version / MANIFEST).read_text())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,304 @@
+"""
+Command-line runner for the registered graphs and chains.
+
+Runs one workflow over every line of a JSONL file with bounded concurrency and
+appends one result line per input to an output JSONL file as soon as that input
+finishes. Each result records the input's line number, so a crashed or interrupted
+run picks up where it stopped: lines already in the output file are skipped.
+
+    python -m learning_ai list
+    python -m learning_ai run joke --input topics.jsonl --output jokes.jsonl --concurrency 16
+    python -m learning_ai run pet_rag --input questions.jsonl --output answers.jsonl
+
+An input line is either the workflow's full input (a JSON object, e.g.
+{"topic": "cats"}) or a bare JSON string, which is wrapped the way the workflow
+expects (see Workflow.text_input). Output lines look like:
+
+    {"line": 3, "input": ..., "output": ..., "error": null, "latency_s": 1.234}
+
+Inputs are read lazily and at most `concurrency` items are in flight, so input files
+of any size run in constant memory.
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Set, Tuple
+
+
+class Workflow(NamedTuple):
+    target: str
+    """"module:factory" that builds the graph or chain."""
+    text_input: Optional[str] = None
+    """How a bare string line is wrapped: a state key, "messages" for a user message, or None to pass it as-is."""
+    description: str = ""
+
+
+REGISTRY: Dict[str, Workflow] = {
+    "chatbot": Workflow("learning_ai.graphs.chatbot:build_chatbot_graph", "messages",
+                        "LangGraph/1-chatbot.py (one conversation per line)"),
+    "react_math": Workflow("learning_ai.graphs.react_math:build_react_graph", "messages",
+                           "LangGraph/3-Agent_simple_Math.py"),
+    "parallel": Workflow("learning_ai.graphs.parallel:build_parallel_graph", "topic",
+                         "LangGraph/4-Parallel_Workflow.py joke/story/poem"),
+    "map_reduce": Workflow("learning_ai.graphs.parallel:build_map_reduce_graph", None,
+                           "LangGraph/4-Parallel_Workflow.py map-reduce ({\"topics\": [...]})"),
+    "routing": Workflow("learning_ai.graphs.routing:build_routing_graph", "messages",
+                        "LangGraph/5-Routing_workflow.py --llm-only"),
+    "embedding_routing": Workflow("learning_ai.graphs.routing:build_embedding_routing_graph", "messages",
+                                  "LangGraph/5-Routing_workflow.py (embedding router, LLM fallback)"),
+    "orchestrator": Workflow("learning_ai.graphs.orchestrator:build_orchestrator_graph", "messages",
+                             "LangGraph/6-orchestrator.py --agent"),
+    "worker_pool": Workflow("learning_ai.graphs.orchestrator:build_worker_pool_graph", "request",
+                            "LangGraph/6-orchestrator.py (planner, process pool, synthesizer)"),
+    "joke": Workflow("learning_ai.graphs.joke:build_joke_graph", "topic", "LangGraph/tell_Joke.py"),
+    "joke_judge": Workflow("learning_ai.graphs.joke:build_joke_judge_graph", "topic",
+                           "LangGraph/tell_Joke.py --judge (evaluator-optimizer loop)"),
+    "json_prompt": Workflow("learning_ai.chains.json_prompt:build_json_chain", "input",
+                            "LangChain/1-Langchain_Prompt.py"),
+    "web_rag": Workflow("learning_ai.chains.web_rag:build_web_rag", "question", "LangChain/3-LangChain_RAG.py"),
+    "pet_rag": Workflow("learning_ai.chains.pet_search:build_pet_rag_chain", None,
+                        "ChatBots/5-Vector_retriever_Search.py"),
+}
+
+
+def register(name: str, target: str, text_input: Optional[str] = None, description: str = "") -> None:
+    """Add a workflow to the registry (e.g. from a notebook or another script)."""
+    REGISTRY[name] = Workflow(target, text_input, description)
+
+
+def load_workflow(name: str, **factory_kwargs):
+    """Build the registered graph or chain."""
+    if name not in REGISTRY:
+        raise KeyError(f"Unknown workflow {name!r}; available: {', '.join(sorted(REGISTRY))}")
+    module_name, _, factory_name = REGISTRY[name].target.partition(":")
+    factory = getattr(importlib.import_module(module_name), factory_name)
+    return factory(**factory_kwargs)
+
+
+def prepare_input(workflow: Workflow, value: Any) -> Any:
+    """Wrap a bare string input the way the workflow expects."""
+    if not isinstance(value, str) or workflow.text_input is None:
+        return value
+    if workflow.text_input == "messages":
+        return {"messages": [{"role": "user", "content": value}]}
+    return {workflow.text_input: value}
+
+
+def to_jsonable(value: Any) -> Any:
+    """Best-effort conversion of graph / chain outputs (messages, documents, models) to JSON types."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [to_jsonable(item) for item in value]
+    if hasattr(value, "type") and hasattr(value, "content"):  # messages
+        message = {"type": value.type, "content": to_jsonable(value.content)}
+        if getattr(value, "tool_calls", None):
+            message["tool_calls"] = to_jsonable(value.tool_calls)
+        return message
+    if hasattr(value, "page_content"):  # documents
+        return {"page_content": value.page_content, "metadata": to_jsonable(value.metadata)}
+    if hasattr(value, "model_dump"):
+        return to_jsonable(value.model_dump())
+    return str(value)
+
+
+# ========================
+# Resume bookkeeping
+# ========================
+
+def completed_lines(output_path: Path) -> Set[int]:
+    """
+    Line numbers already recorded in the output file.
+
+    A run killed mid-write can leave a truncated last line; it is dropped from the file
+    so the next result starts on a fresh line, and its input is run again.
+    """
+    done: Set[int] = set()
+    if not output_path.exists():
+        return done
+    with output_path.open("rb+") as f:
+        valid_end = 0
+        for raw in f:
+            try:
+                done.add(json.loads(raw)["line"])
+            except (ValueError, KeyError):
+                break
+            valid_end += len(raw)
+        f.truncate(valid_end)
+    return done
+
+
+def read_inputs(input_path: Path, skip: Set[int]) -> Iterator[Tuple[int, Any, Optional[str]]]:
+    """
+    Yield (line number, parsed value, error) for every non-empty input line not in `skip`.
+
+    A line that isn't valid JSON is yielded as its raw text with the parse error, so it
+    can be recorded like a failed run instead of aborting the batch.
+    """
+    with input_path.open(encoding="utf-8") as f:
+        for number, raw in enumerate(f, start=1):
+            if number in skip or not raw.strip():
+                continue
+            try:
+                yield number, json.loads(raw), None
+            except ValueError as e:
+                yield number, raw.strip(), f"{type(e).__name__}: {e}"
+
+
+# ========================
+# Batch execution
+# ========================
+
+async def _run_one(runnable, workflow: Workflow, number: int, value: Any, run_name: str,
+                   callbacks: Optional[list]) -> Dict[str, Any]:
+    config = {
+        "run_name": run_name,
+        "callbacks": callbacks,
+        # Graphs with a checkpointer keep each line's state in its own thread
+        "configurable": {"thread_id": f"{run_name}-{number}"},
+    }
+    start = time.perf_counter()
+    output, error = None, None
+    try:
+        output = await runnable.ainvoke(prepare_input(workflow, value), config=config)
+    except Exception as e:  # record the failure and keep going
+        error = f"{type(e).__name__}: {e}"
+    return {
+        "line": number,
+        "input": value,
+        "output": to_jsonable(output),
+        "error": error,
+        "latency_s": round(time.perf_counter() - start, 4),
+    }
+
+
+async def run_batch(name: str, input_path: Path, output_path: Path, concurrency: int = 8,
+                    limit: Optional[int] = None, runnable=None,
+                    callbacks: Optional[list] = None) -> Dict[str, Any]:
+    """
+    Run a registered workflow over a JSONL file.
+
+    Args:
+        name: Registered workflow name
+        input_path: JSONL file with one input per line
+        output_path: JSONL file results are appended to (and resumed from)
+        concurrency: Maximum number of inputs in flight at once
+        limit: Stop after this many new inputs
+        runnable: Use this graph/chain instead of building the registered one (a graph built
+            here has its worker pool, if any, shut down when the batch ends)
+        callbacks: Callback handlers for every run (e.g. an Instrumentation instance)
+
+    Returns:
+        Summary with counts and latency percentiles for this run
+    """
+    workflow = REGISTRY[name]
+    owned = runnable is None
+    runnable = runnable if runnable is not None else load_workflow(name)
+    try:
+        return await _run_batch(runnable, workflow, name, input_path, output_path, concurrency, limit, callbacks)
+    finally:
+        # Graphs built here own their worker pools (e.g. worker_pool's graph.pool); stop them
+        pool = getattr(runnable, "pool", None) if owned else None
+        if pool is not None:
+            pool.shutdown()
+
+
+async def _run_batch(runnable, workflow: Workflow, name: str, input_path: Path, output_path: Path,
+                     concurrency: int, limit: Optional[int], callbacks: Optional[list]) -> Dict[str, Any]:
+    skip = completed_lines(output_path)
+    if skip:
+        print(f"Resuming: {len(skip)} line(s) already in {output_path}", file=sys.stderr)
+
+    latencies = []
+    errors = 0
+    pending: Set[asyncio.Task] = set()
+    started = time.perf_counter()
+
+    with output_path.open("a", encoding="utf-8") as out:
+        def write(result: Dict[str, Any]) -> None:
+            nonlocal errors
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()  # each finished line survives a crash
+            latencies.append(result["latency_s"])
+            errors += result["error"] is not None
+
+        async def drain(wait_for) -> None:
+            done, _ = await asyncio.wait(pending, return_when=wait_for)
+            for task in done:
+                pending.discard(task)
+                write(task.result())
+
+        for count, (number, value, parse_error) in enumerate(read_inputs(input_path, skip)):
+            if limit is not None and count >= limit:
+                break
+            if parse_error is not None:
+                write({"line": number, "input": value, "output": None, "error": parse_error, "latency_s": 0.0})
+                continue
+            if len(pending) >= concurrency:
+                await drain(asyncio.FIRST_COMPLETED)
+            pending.add(asyncio.ensure_future(_run_one(runnable, workflow, number, value, name, callbacks)))
+        if pending:
+            await drain(asyncio.ALL_COMPLETED)
+
+    latencies.sort()
+
+    def percentile(p: float) -> Optional[float]:
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else None
+
+    return {
+        "workflow": name,
+        "processed": len(latencies),
+        "skipped": len(skip),
+        "errors": errors,
+        "wall_s": round(time.perf_counter() - started, 3),
+        "latency_p50_s": percentile(0.50),
+        "latency_p95_s": percentile(0.95),
+        "latency_max_s": latencies[-1] if latencies else None,
+    }
+
+
+# ========================
+# CLI
+# ========================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m learning_ai", description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Show the registered graphs and chains")
+    run = commands.add_parser("run", help="Run a workflow over a JSONL file")
+    run.add_argument("workflow", choices=sorted(REGISTRY))
+    run.add_argument("--input", "-i", type=Path, required=True, help="JSONL file, one input per line")
+    run.add_argument("--output", "-o", type=Path, required=True, help="JSONL results file (appended to / resumed)")
+    run.add_argument("--concurrency", "-c", type=int, default=8, help="Inputs in flight at once (default 8)")
+    run.add_argument("--limit", type=int, help="Process at most this many new inputs")
+    run.add_argument("--metrics", type=Path, help="Write per-node / per-LLM-call Prometheus metrics to this file")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for name in sorted(REGISTRY):
+            workflow = REGISTRY[name]
+            print(f"{name:<14} {workflow.target:<55} {workflow.description}")
+        return 0
+
+    metrics = None
+    if args.metrics:
+        from learning_ai.instrumentation import Instrumentation
+        metrics = Instrumentation()
+    summary = asyncio.run(run_batch(args.workflow, args.input, args.output,
+                                    concurrency=max(1, args.concurrency), limit=args.limit,
+                                    callbacks=[metrics] if metrics else None))
+    if metrics:
+        metrics.write_prometheus(args.metrics)
+    print(json.dumps(summary), file=sys.stderr)
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
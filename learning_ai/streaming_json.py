@@ -0,0 +1,287 @@
+"""
+Incremental JSON parsing for streamed LLM output.
+
+JsonOutputParser.stream() re-parses the whole accumulated text on every token, so
+parsing cost grows quadratically with the length of the answer. IncrementalJsonParser
+keeps its position and a stack of open containers between chunks; every character is
+looked at once.
+
+StreamingJsonOutputParser is a drop-in replacement for JsonOutputParser in
+`prompt | llm | parser` chains. chain.stream() yields a snapshot each time a value is
+completed. With completed_only=True, a snapshot only holds top-level fields whose
+values are complete, so a consumer can act on a field as soon as it shows up.
+
+Example:
+    parser = StreamingJsonOutputParser(completed_only=True)
+    for partial in (prompt | llm | parser).stream(inputs):
+        ...  # partial["title"] is final as soon as it appears
+"""
+
+import copy
+import json
+import re
+from typing import Any, AsyncIterator, Iterator, List, Optional, Set, Union
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import BaseMessage
+from langchain_core.output_parsers import JsonOutputParser
+
+# Parser states
+_VALUE = 0          # expecting a value
+_KEY_OR_END = 1     # just after "{"
+_KEY = 2            # after "," inside an object
+_COLON = 3          # after an object key
+_COMMA_OR_END = 4   # after a value inside a container
+_VALUE_OR_END = 5   # just after "["
+
+_WHITESPACE = " \t\n\r"
+_LITERAL_CHARS = set("-+.0123456789eEtruefalsn")
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class _Frame:
+    __slots__ = ("container", "key")
+
+    def __init__(self, container: Union[dict, list]):
+        self.container = container
+        self.key: Optional[str] = None
+
+
+class IncrementalJsonParser:
+    """
+    Push parser for a single JSON object or array arriving in pieces.
+
+    Text before the first "{" or "[" (e.g. a ```json fence or a preamble) and anything
+    after the root value closes is ignored.
+
+    Attributes:
+        value: The partial document; containers appear as soon as they open, scalars
+            once they are complete
+        completed_keys: Top-level object keys whose values are complete
+        done: True once the root value has closed
+    """
+
+    def __init__(self) -> None:
+        self.value: Any = None
+        self.completed_keys: Set[str] = set()
+        self.completed_order: List[str] = []
+        self.done = False
+        self._started = False
+        self._stack: List[_Frame] = []
+        self._state = _VALUE
+        self._in_string = False
+        self._escape = False
+        self._string: List[str] = []
+        self._literal: List[str] = []
+
+    # ---- helpers ----
+
+    def _error(self, char: str) -> ValueError:
+        return ValueError(f"Unexpected character {char!r} in JSON stream (state {self._state})")
+
+    def _attach(self, value: Any) -> None:
+        if not self._stack:
+            self.value = value
+            return
+        frame = self._stack[-1]
+        if isinstance(frame.container, dict):
+            frame.container[frame.key] = value
+        else:
+            frame.container.append(value)
+
+    def _value_completed(self) -> None:
+        # Called after a scalar is attached or a container closes
+        if len(self._stack) == 1 and isinstance(self._stack[0].container, dict):
+            key = self._stack[0].key
+            if key not in self.completed_keys:
+                self.completed_keys.add(key)
+                self.completed_order.append(key)
+        self._state = _COMMA_OR_END if self._stack else _VALUE
+        if not self._stack:
+            self.done = True
+
+    def _finish_string(self) -> bool:
+        # strict=False: models sometimes emit raw newlines inside strings
+        text = json.loads('"' + "".join(self._string) + '"', strict=False)
+        self._string = []
+        if self._state in (_KEY_OR_END, _KEY):
+            self._stack[-1].key = text
+            self._state = _COLON
+            return False
+        self._attach(text)
+        self._value_completed()
+        return True
+
+    def _finish_literal(self) -> bool:
+        raw = "".join(self._literal)
+        self._literal = []
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            raise ValueError(f"Invalid JSON literal {raw!r}") from None
+        self._attach(value)
+        self._value_completed()
+        return True
+
+    # ---- public API ----
+
+    def feed(self, text: str) -> bool:
+        """Consume the next chunk; return True if any value was completed or opened."""
+        changed = False
+        i, n = 0, len(text)
+        while i < n and not self.done:
+            if not self._started:
+                j = min((p for p in (text.find("{", i), text.find("[", i)) if p != -1), default=-1)
+                if j == -1:
+                    return changed
+                self._started = True
+                i = j
+
+            if self._in_string:
+                # Jump straight to the next quote or backslash
+                if self._escape:
+                    self._string.append(text[i])
+                    self._escape = False
+                    i += 1
+                    continue
+                match = _STRING_SPECIAL.search(text, i)
+                if match is None:
+                    self._string.append(text[i:])
+                    return changed
+                j = match.start()
+                self._string.append(text[i:j])
+                if text[j] == "\\":
+                    self._string.append("\\")
+                    self._escape = True
+                else:
+                    self._in_string = False
+                    changed = self._finish_string() or changed
+                i = j + 1
+                continue
+
+            char = text[i]
+            if self._literal:
+                if char in _LITERAL_CHARS:
+                    self._literal.append(char)
+                    i += 1
+                    continue
+                changed = self._finish_literal() or changed
+                # fall through: the delimiter is handled below
+
+            if char in _WHITESPACE:
+                pass
+            elif self._state in (_VALUE, _VALUE_OR_END):
+                if char == "]" and self._state == _VALUE_OR_END:
+                    self._stack.pop()
+                    self._value_completed()
+                    changed = True
+                elif char == "{" or char == "[":
+                    container: Union[dict, list] = {} if char == "{" else []
+                    self._attach(container)
+                    self._stack.append(_Frame(container))
+                    self._state = _KEY_OR_END if char == "{" else _VALUE_OR_END
+                    changed = True
+                elif char == '"':
+                    self._in_string = True
+                elif char in _LITERAL_CHARS:
+                    self._literal.append(char)
+                else:
+                    raise self._error(char)
+            elif self._state in (_KEY_OR_END, _KEY):
+                if char == '"':
+                    self._in_string = True
+                elif char == "}" and self._state == _KEY_OR_END:
+                    self._stack.pop()
+                    self._value_completed()
+                    changed = True
+                else:
+                    raise self._error(char)
+            elif self._state == _COLON:
+                if char != ":":
+                    raise self._error(char)
+                self._state = _VALUE
+            elif self._state == _COMMA_OR_END:
+                container = self._stack[-1].container
+                if char == ",":
+                    self._state = _KEY if isinstance(container, dict) else _VALUE
+                elif char == ("}" if isinstance(container, dict) else "]"):
+                    self._stack.pop()
+                    self._value_completed()
+                    changed = True
+                else:
+                    raise self._error(char)
+            i += 1
+        return changed
+
+    def finish(self) -> bool:
+        """Flush a trailing literal at end of stream; return True if that completed a value."""
+        if self._literal and not self.done:
+            return self._finish_literal()
+        return False
+
+    def snapshot(self, completed_only: bool = False) -> Any:
+        """Deep copy of the current value, optionally limited to completed top-level keys."""
+        if completed_only and isinstance(self.value, dict) and not self.done:
+            # Completed values are never touched again, so they can be shared, not copied
+            return {key: self.value[key] for key in self.completed_order}
+        return copy.deepcopy(self.value)
+
+
+class StreamingJsonOutputParser(JsonOutputParser):
+    """
+    JsonOutputParser that streams via IncrementalJsonParser.
+
+    invoke() behaves exactly like JsonOutputParser. stream() yields a snapshot each time
+    a value completes. If pydantic_object is set, every completed top-level field is
+    validated against that field's type as soon as it arrives.
+    """
+
+    completed_only: bool = False
+    """Only include top-level fields whose values are complete in streamed snapshots."""
+
+    def _check_fields(self, parser: IncrementalJsonParser, checked: Set[str]) -> None:
+        if self.pydantic_object is None or not hasattr(self.pydantic_object, "model_fields"):
+            return
+        from pydantic import TypeAdapter, ValidationError
+
+        fields = self.pydantic_object.model_fields
+        for key in parser.completed_order:
+            if key in checked or key not in fields:
+                continue
+            checked.add(key)
+            try:
+                TypeAdapter(fields[key].annotation).validate_python(parser.value[key])
+            except ValidationError as e:
+                raise OutputParserException(f"Field {key!r} failed validation: {e}") from e
+
+    def _feed(self, parser: IncrementalJsonParser, chunk: Union[str, BaseMessage]) -> bool:
+        text = chunk.content if isinstance(chunk, BaseMessage) else chunk
+        if not isinstance(text, str):
+            # Content blocks (e.g. Anthropic-style lists): keep only the text parts
+            text = "".join(block.get("text", "") if isinstance(block, dict) else str(block) for block in text)
+        try:
+            return parser.feed(text)
+        except ValueError as e:
+            raise OutputParserException(str(e)) from e
+
+    def _transform(self, input: Iterator[Union[str, BaseMessage]]) -> Iterator[Any]:
+        parser = IncrementalJsonParser()
+        checked: Set[str] = set()
+        for chunk in input:
+            if self._feed(parser, chunk) and parser.value is not None:
+                self._check_fields(parser, checked)
+                yield parser.snapshot(self.completed_only)
+        if parser.finish():
+            self._check_fields(parser, checked)
+            yield parser.snapshot(self.completed_only)
+
+    async def _atransform(self, input: AsyncIterator[Union[str, BaseMessage]]) -> AsyncIterator[Any]:
+        parser = IncrementalJsonParser()
+        checked: Set[str] = set()
+        async for chunk in input:
+            if self._feed(parser, chunk) and parser.value is not None:
+                self._check_fields(parser, checked)
+                yield parser.snapshot(self.completed_only)
+        if parser.finish():
+            self._check_fields(parser, checked)
+            yield parser.snapshot(self.completed_only)
@@ -0,0 +1,543 @@
+"""
+Durable task queue for distributing orchestrator work across processes and machines.
+
+A producer enqueues JSON tasks; any number of worker processes lease them, run the
+named handler and store the result, which the producer collects. Delivery is
+at-least-once:
+
+- a leased task is invisible to other workers until its lease expires
+- workers extend the lease with heartbeats while a handler runs
+- if a worker dies, the lease runs out and the task is handed to another worker
+- a task is retried up to `max_attempts` times before it is marked failed
+
+Handlers should therefore be idempotent. Two backends share the TaskQueue interface:
+
+- SQLiteTaskQueue: a single file; good for many processes on one machine
+- RedisTaskQueue: any redis-py compatible client (Redis, Valkey, or fakeredis as a
+  local stand-in); good for workers on several machines
+
+get_task_queue(url) picks one from a URL (TASK_QUEUE_URL by default):
+`sqlite:///path/to/tasks.sqlite` or `redis://host:6379/0`.
+
+Run a worker:
+    python -m learning_ai.task_queue worker --queue orchestrator --url redis://queue-host:6379/0
+
+Tasks name their handler ({"handler": "simulated_workload", "args": [...]}); workers only
+run handlers from HANDLERS (extend it with register_handler), never arbitrary code.
+"""
+
+import abc
+import argparse
+import importlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+DEFAULT_SQLITE_PATH = Path.home() / ".cache" / "learning_ai" / "tasks.sqlite"
+
+# Handler name -> "module:function" that workers are allowed to run
+HANDLERS: Dict[str, str] = {
+    "process_task": "learning_ai.graphs.orchestrator:process_task",
+    "report_status": "learning_ai.graphs.orchestrator:report_status",
+    "simulated_workload": "learning_ai.graphs.orchestrator:simulated_workload",
+}
+
+
+def register_handler(name: str, target: str) -> None:
+    """Allow workers to run `target` ("module:function") for tasks naming `name`."""
+    HANDLERS[name] = target
+
+
+def resolve_handler(name: str) -> Callable[..., Any]:
+    if name not in HANDLERS:
+        raise KeyError(f"Unknown task handler {name!r}; registered: {', '.join(sorted(HANDLERS))}")
+    module_name, _, function_name = HANDLERS[name].partition(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+class Task(NamedTuple):
+    id: str
+    queue: str
+    payload: Dict[str, Any]
+    attempts: int
+    lease_token: str
+
+
+class TaskRecord(NamedTuple):
+    id: str
+    status: str  # "queued", "leased", "done" or "failed"
+    result: Any
+    error: Optional[str]
+    attempts: int
+
+
+class TaskTimeout(TimeoutError):
+    pass
+
+
+STATS_KEYS = ("queued", "leased", "done", "failed")
+
+
+class TaskQueue(abc.ABC):
+    """Interface shared by the queue backends."""
+
+    max_attempts: int = 3
+
+    @abc.abstractmethod
+    def enqueue(self, queue: str, payload: Dict[str, Any], task_id: Optional[str] = None) -> str:
+        """Add a task; enqueueing an existing task_id again is a no-op (so producers can retry safely)."""
+
+    @abc.abstractmethod
+    def lease(self, queue: str, worker_id: str, lease_s: float) -> Optional[Task]:
+        """Take the oldest visible task for `lease_s` seconds, or None if the queue is empty."""
+
+    @abc.abstractmethod
+    def heartbeat(self, task: Task, lease_s: float) -> bool:
+        """Extend the lease; False if the lease was lost (expired and handed to another worker)."""
+
+    @abc.abstractmethod
+    def complete(self, task: Task, result: Any) -> None:
+        """Store the result and remove the task from the queue."""
+
+    @abc.abstractmethod
+    def fail(self, task: Task, error: str) -> None:
+        """Give the task back for a retry, or mark it failed once max_attempts is reached."""
+
+    @abc.abstractmethod
+    def get(self, task_id: str) -> Optional[TaskRecord]:
+        """Current state of a task."""
+
+    @abc.abstractmethod
+    def stats(self, queue: str) -> Dict[str, int]:
+        """
+        Task counts by status, with the same keys on every backend (see STATS_KEYS).
+
+        "queued" counts tasks a worker could lease now, including ones whose lease
+        expired; "leased" counts tasks under a live lease.
+        """
+
+    def wait(self, task_id: str, timeout: Optional[float] = None, poll_s: float = 0.05) -> TaskRecord:
+        """Block until the task is done or failed."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delay = poll_s
+        while True:
+            record = self.get(task_id)
+            if record is not None and record.status in ("done", "failed"):
+                return record
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TaskTimeout(f"Task {task_id} did not finish within {timeout}s")
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+
+
+# ========================
+# SQLite backend
+# ========================
+
+class SQLiteTaskQueue(TaskQueue):
+    """
+    Task queue in a SQLite file (WAL mode), shared by every process that opens it.
+
+    Leasing runs in a BEGIN IMMEDIATE transaction, so two workers never take the same
+    task. Don't put the file on a network filesystem; use RedisTaskQueue across machines.
+    """
+
+    def __init__(self, path: os.PathLike = DEFAULT_SQLITE_PATH, max_attempts: int = 3):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id TEXT PRIMARY KEY,
+                    queue TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    visible_at REAL NOT NULL,
+                    lease_token TEXT,
+                    worker TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (queue, status, visible_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, queue: str, payload: Dict[str, Any], task_id: Optional[str] = None) -> str:
+        task_id = task_id or uuid.uuid4().hex
+        now = time.time()
+        self._connect().execute(
+            "INSERT OR IGNORE INTO tasks (id, queue, payload, status, visible_at, created_at) "
+            "VALUES (?, ?, ?, 'queued', ?, ?)",
+            (task_id, queue, json.dumps(payload), now, now),
+        )
+        return task_id
+
+    def lease(self, queue: str, worker_id: str, lease_s: float) -> Optional[Task]:
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Expired leases are visible again: that is what makes delivery at-least-once
+            row = conn.execute(
+                "SELECT id, payload, attempts FROM tasks WHERE queue = ? AND status IN ('queued', 'leased') "
+                "AND visible_at <= ? ORDER BY created_at LIMIT 1",
+                (queue, now),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            task_id, payload, attempts = row
+            if attempts >= self.max_attempts:
+                conn.execute("UPDATE tasks SET status = 'failed', error = COALESCE(error, 'lease expired') "
+                             "WHERE id = ?", (task_id,))
+                conn.execute("COMMIT")
+                return self.lease(queue, worker_id, lease_s)
+            token = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE tasks SET status = 'leased', attempts = attempts + 1, visible_at = ?, "
+                "lease_token = ?, worker = ? WHERE id = ?",
+                (now + lease_s, token, worker_id, task_id),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return Task(task_id, queue, json.loads(payload), attempts + 1, token)
+
+    def heartbeat(self, task: Task, lease_s: float) -> bool:
+        cursor = self._connect().execute(
+            "UPDATE tasks SET visible_at = ? WHERE id = ? AND status = 'leased' AND lease_token = ?",
+            (time.time() + lease_s, task.id, task.lease_token),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, task: Task, result: Any) -> None:
+        # A worker whose lease ran out may still finish first; any one result is accepted
+        self._connect().execute(
+            "UPDATE tasks SET status = 'done', result = ?, error = NULL WHERE id = ? AND status != 'done'",
+            (json.dumps(result), task.id),
+        )
+
+    def fail(self, task: Task, error: str) -> None:
+        status = "failed" if task.attempts >= self.max_attempts else "queued"
+        self._connect().execute(
+            "UPDATE tasks SET status = ?, error = ?, visible_at = ? WHERE id = ? AND lease_token = ? "
+            "AND status = 'leased'",
+            (status, error, time.time(), task.id, task.lease_token),
+        )
+
+    def get(self, task_id: str) -> Optional[TaskRecord]:
+        row = self._connect().execute(
+            "SELECT id, status, result, error, attempts FROM tasks WHERE id = ?", (task_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return TaskRecord(row[0], row[1], json.loads(row[2]) if row[2] is not None else None, row[3], row[4])
+
+    def stats(self, queue: str) -> Dict[str, int]:
+        # An expired lease is leasable again, so it counts as queued (as on Redis)
+        rows = self._connect().execute(
+            "SELECT CASE WHEN status = 'leased' AND visible_at <= ? THEN 'queued' ELSE status END AS state, "
+            "COUNT(*) FROM tasks WHERE queue = ? GROUP BY state",
+            (time.time(), queue),
+        ).fetchall()
+        return {**dict.fromkeys(STATS_KEYS, 0), **dict(rows)}
+
+
+# ========================
+# Redis backend
+# ========================
+
+class RedisTaskQueue(TaskQueue):
+    """
+    Task queue on a Redis-compatible server.
+
+    Each queue is a sorted set of task ids scored by the time they become visible, so a
+    lease is just "move the score `lease_s` into the future" and an expired lease needs
+    no sweeper. Leasing uses WATCH/MULTI optimistic transactions (no Lua), so fakeredis
+    works as a local stand-in. Task fields live in a hash per task; completion pushes to
+    a per-task list that wait() blocks on.
+
+    Args:
+        client: redis.Redis (or compatible) client created with decode_responses=True
+        prefix: Key prefix
+        result_ttl_s: How long finished task records are kept
+    """
+
+    def __init__(self, client, prefix: str = "learning_ai:tasks", max_attempts: int = 3,
+                 result_ttl_s: int = 24 * 3600):
+        self.client = client
+        self.prefix = prefix
+        self.max_attempts = max_attempts
+        self.result_ttl_s = result_ttl_s
+
+    def _queue_key(self, queue: str) -> str:
+        return f"{self.prefix}:queue:{queue}"
+
+    def _task_key(self, task_id: str) -> str:
+        return f"{self.prefix}:task:{task_id}"
+
+    def _done_key(self, task_id: str) -> str:
+        return f"{self.prefix}:done:{task_id}"
+
+    def _counts_key(self, queue: str) -> str:
+        return f"{self.prefix}:counts:{queue}"
+
+    def enqueue(self, queue: str, payload: Dict[str, Any], task_id: Optional[str] = None) -> str:
+        from redis.exceptions import WatchError
+
+        task_id = task_id or uuid.uuid4().hex
+        task_key = self._task_key(task_id)
+        while True:
+            with self.client.pipeline() as pipe:
+                try:
+                    pipe.watch(task_key)
+                    if pipe.exists(task_key):
+                        pipe.unwatch()
+                        return task_id
+                    # The record and the queue entry are written together, so a task is never half-enqueued
+                    pipe.multi()
+                    pipe.hset(task_key, mapping={"queue": queue, "payload": json.dumps(payload),
+                                                 "status": "queued", "attempts": 0})
+                    pipe.zadd(self._queue_key(queue), {task_id: time.time()})
+                    pipe.execute()
+                    return task_id
+                except WatchError:
+                    continue
+
+    def lease(self, queue: str, worker_id: str, lease_s: float) -> Optional[Task]:
+        from redis.exceptions import WatchError
+
+        queue_key = self._queue_key(queue)
+        while True:
+            with self.client.pipeline() as pipe:
+                try:
+                    pipe.watch(queue_key)
+                    now = time.time()
+                    ids = pipe.zrangebyscore(queue_key, "-inf", now, start=0, num=1)
+                    if not ids:
+                        pipe.unwatch()
+                        return None
+                    task_id = ids[0]
+                    task_key = self._task_key(task_id)
+                    fields = pipe.hmget(task_key, "payload", "attempts")
+                    attempts = int(fields[1] or 0)
+                    token = uuid.uuid4().hex
+                    pipe.multi()
+                    if attempts >= self.max_attempts:
+                        self._finish_commands(pipe, task_id, queue, "failed", {"error": "lease expired"})
+                        pipe.execute()
+                        continue
+                    pipe.zadd(queue_key, {task_id: now + lease_s})
+                    pipe.hset(task_key, mapping={"status": "leased", "attempts": attempts + 1,
+                                                 "lease_token": token, "worker": worker_id})
+                    pipe.execute()
+                    return Task(task_id, queue, json.loads(fields[0]), attempts + 1, token)
+                except WatchError:
+                    continue  # another worker changed the queue first; try again
+
+    def heartbeat(self, task: Task, lease_s: float) -> bool:
+        task_key = self._task_key(task.id)
+        if self.client.hget(task_key, "lease_token") != task.lease_token:
+            return False
+        # xx=True: only move the score of a task that is still queued (not completed meanwhile)
+        return bool(self.client.zadd(self._queue_key(task.queue), {task.id: time.time() + lease_s}, xx=True, ch=True))
+
+    def _finish_commands(self, pipe, task_id: str, queue: str, status: str, fields: Dict[str, str]) -> None:
+        """Queue (inside MULTI) the commands that move a task to done / failed."""
+        task_key = self._task_key(task_id)
+        pipe.zrem(self._queue_key(queue), task_id)
+        pipe.hset(task_key, mapping={"status": status, **fields})
+        pipe.expire(task_key, self.result_ttl_s)
+        pipe.lpush(self._done_key(task_id), status)
+        pipe.expire(self._done_key(task_id), self.result_ttl_s)
+        pipe.hincrby(self._counts_key(queue), status, 1)
+
+    def _transact(self, task: Task, write) -> None:
+        """Run write(pipe, fields) in a WATCH/MULTI transaction on the task's hash; write returns False to skip."""
+        from redis.exceptions import WatchError
+
+        task_key = self._task_key(task.id)
+        while True:
+            with self.client.pipeline() as pipe:
+                try:
+                    pipe.watch(task_key)
+                    fields = pipe.hgetall(task_key)
+                    pipe.multi()
+                    if write(pipe, fields) is False:
+                        pipe.reset()
+                        return
+                    pipe.execute()
+                    return
+                except WatchError:
+                    continue  # the task changed between the check and the write; check again
+
+    def complete(self, task: Task, result: Any) -> None:
+        def write(pipe, fields):
+            if fields.get("status") == "done":
+                return False
+            if fields.get("status") == "failed":
+                # A slow worker finished after the lease ran out on the last attempt; like the
+                # SQLite backend, accept the result and count the task as done only
+                pipe.hincrby(self._counts_key(task.queue), "failed", -1)
+            self._finish_commands(pipe, task.id, task.queue, "done", {"result": json.dumps(result), "error": ""})
+
+        self._transact(task, write)
+
+    def fail(self, task: Task, error: str) -> None:
+        def write(pipe, fields):
+            if fields.get("lease_token") != task.lease_token or fields.get("status") != "leased":
+                return False
+            if task.attempts >= self.max_attempts:
+                self._finish_commands(pipe, task.id, task.queue, "failed", {"error": error})
+            else:
+                pipe.hset(self._task_key(task.id), mapping={"status": "queued", "error": error})
+                pipe.zadd(self._queue_key(task.queue), {task.id: time.time()})
+
+        self._transact(task, write)
+
+    def get(self, task_id: str) -> Optional[TaskRecord]:
+        fields = self.client.hgetall(self._task_key(task_id))
+        if not fields:
+            return None
+        result = json.loads(fields["result"]) if fields.get("result") else None
+        return TaskRecord(task_id, fields.get("status", "queued"), result, fields.get("error") or None,
+                          int(fields.get("attempts", 0)))
+
+    def wait(self, task_id: str, timeout: Optional[float] = None, poll_s: float = 0.05) -> TaskRecord:
+        record = self.get(task_id)
+        if record is not None and record.status in ("done", "failed"):
+            return record
+        # BLPOP returns as soon as the task finishes; re-push so other waiters see it too
+        popped = self.client.blpop([self._done_key(task_id)], timeout=0 if timeout is None else max(1, int(timeout)))
+        if popped is None:
+            raise TaskTimeout(f"Task {task_id} did not finish within {timeout}s")
+        self.client.lpush(self._done_key(task_id), popped[1])
+        return self.get(task_id)
+
+    def stats(self, queue: str) -> Dict[str, int]:
+        now = time.time()
+        queue_key = self._queue_key(queue)
+        # done / failed are running totals: finished task records expire after result_ttl_s
+        finished = self.client.hgetall(self._counts_key(queue))
+        return {
+            "queued": self.client.zcount(queue_key, "-inf", now),
+            "leased": self.client.zcount(queue_key, f"({now}", "+inf"),
+            "done": int(finished.get("done", 0)),
+            "failed": int(finished.get("failed", 0)),
+        }
+
+
+def get_task_queue(url: Optional[str] = None) -> TaskQueue:
+    """
+    Open a queue backend from a URL.
+
+    Args:
+        url: "sqlite:///path/to/file" or "redis://host:port/db" (defaults to TASK_QUEUE_URL,
+            then a SQLite file under ~/.cache/learning_ai)
+    """
+    url = url or os.getenv("TASK_QUEUE_URL") or f"sqlite:///{DEFAULT_SQLITE_PATH}"
+    if url.startswith("sqlite:///"):
+        return SQLiteTaskQueue(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        import redis
+        return RedisTaskQueue(redis.Redis.from_url(url, decode_responses=True))
+    raise ValueError(f"Unsupported task queue URL: {url!r}")
+
+
+# ========================
+# Worker
+# ========================
+
+def run_worker(task_queue: TaskQueue, queue: str, worker_id: Optional[str] = None, lease_s: float = 30.0,
+               heartbeat_s: float = 10.0, idle_sleep_s: float = 0.2, max_tasks: Optional[int] = None,
+               stop: Optional[threading.Event] = None) -> int:
+    """
+    Lease and run tasks until `stop` is set or `max_tasks` have been handled.
+
+    The handler runs in this thread; a background thread renews the lease every
+    `heartbeat_s`. The stored result is {"output", "elapsed_s", "worker"}.
+
+    Returns:
+        Number of tasks handled
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    stop = stop or threading.Event()
+    handled = 0
+    while not stop.is_set() and (max_tasks is None or handled < max_tasks):
+        task = task_queue.lease(queue, worker_id, lease_s)
+        if task is None:
+            stop.wait(idle_sleep_s)
+            continue
+
+        finished = threading.Event()
+
+        def keep_alive(task=task, finished=finished):
+            while not finished.wait(heartbeat_s):
+                if not task_queue.heartbeat(task, lease_s):
+                    return  # lease lost; another worker will (or did) run it
+
+        heartbeat = threading.Thread(target=keep_alive, daemon=True)
+        heartbeat.start()
+        started = time.perf_counter()
+        try:
+            handler = resolve_handler(task.payload["handler"])
+            output = handler(*task.payload.get("args", []), **task.payload.get("kwargs", {}))
+            task_queue.complete(task, {"output": output, "elapsed_s": round(time.perf_counter() - started, 4),
+                                       "worker": worker_id})
+        except Exception as e:
+            task_queue.fail(task, f"{type(e).__name__}: {e}")
+        finally:
+            finished.set()
+            heartbeat.join()
+        handled += 1
+    return handled
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m learning_ai.task_queue",
+                                     description="Run a task queue worker or show queue stats.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    worker = commands.add_parser("worker", help="Lease and run tasks until interrupted")
+    worker.add_argument("--queue", default="orchestrator")
+    worker.add_argument("--url", help="Queue URL (defaults to TASK_QUEUE_URL or a local SQLite file)")
+    worker.add_argument("--lease", type=float, default=30.0, help="Lease length in seconds")
+    worker.add_argument("--max-tasks", type=int)
+    stats = commands.add_parser("stats", help="Show task counts")
+    stats.add_argument("--queue", default="orchestrator")
+    stats.add_argument("--url")
+    args = parser.parse_args(argv)
+
+    task_queue = get_task_queue(args.url)
+    if args.command == "stats":
+        print(json.dumps(task_queue.stats(args.queue)))
+        return 0
+    try:
+        handled = run_worker(task_queue, args.queue, lease_s=args.lease, heartbeat_s=args.lease / 3,
+                             max_tasks=args.max_tasks)
+    except KeyboardInterrupt:
+        return 0
+    print(f"Handled {handled} task(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1 @@
+"""Local stand-ins for remote services, used to exercise the examples offline."""
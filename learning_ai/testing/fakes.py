@@ -0,0 +1,198 @@
+"""
+Deterministic fake chat model and embeddings for offline runs and benchmarks.
+
+ScriptedChatModel answers from a script instead of a provider. The reply is chosen
+by how many assistant messages the conversation already has, so one model instance
+can serve many concurrent conversations and each one still follows the script from
+the start. Script steps can be plain text, an AIMessage, a tool call (tool_call_step)
+or any function of the input messages. Latency and generation speed are configurable,
+so the model behaves like a slow remote service without any network.
+
+HashingEmbeddings maps text to a fixed-size vector by feature-hashing its words:
+the same text always gets the same vector and texts sharing words are close, which
+is enough to exercise vector stores and retrievers realistically.
+
+Example:
+    llm = ScriptedChatModel(script=[tool_call_step("add", a=10, b=14), "The answer is 24"],
+                            latency_s=0.05, tokens_per_s=200)
+    graph = build_react_graph(llm=llm)
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import re
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Sequence, Union
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+ScriptStep = Union[str, AIMessage, Callable[[List[BaseMessage]], Union[str, AIMessage]]]
+
+_WORD = re.compile(r"\w+")
+
+
+def tool_call_step(name: str, **args: Any) -> Callable[[List[BaseMessage]], AIMessage]:
+    """Script step that asks for one tool call (with a fresh call id every time)."""
+    def step(messages: List[BaseMessage]) -> AIMessage:
+        return AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": f"call_{uuid.uuid4().hex[:12]}"}])
+    return step
+
+
+def _approx_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Chat model that replays a script, with simulated latency and token rate.
+
+    Attributes:
+        script: Replies in order; the reply for a call is step N where N is the number of
+            AI messages already in the input (the last step repeats)
+        latency_s: Fixed delay before the first token (time to first token)
+        tokens_per_s: Generation speed; 0 means the whole reply arrives at once
+    """
+
+    script: List[Any] = []
+    latency_s: float = 0.0
+    tokens_per_s: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        from langchain_core.utils.function_calling import convert_to_openai_tool
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _reply(self, messages: List[BaseMessage]) -> AIMessage:
+        if not self.script:
+            last = messages[-1].content if messages else ""
+            step: ScriptStep = f"Echo: {last}"
+        else:
+            turn = sum(1 for m in messages if isinstance(m, AIMessage))
+            step = self.script[min(turn, len(self.script) - 1)]
+        if callable(step):
+            step = step(messages)
+        message = AIMessage(content=step) if isinstance(step, str) else step.model_copy()
+
+        prompt_tokens = sum(_approx_tokens(str(m.content)) for m in messages)
+        completion_tokens = _approx_tokens(str(message.content)) if message.content else 1
+        message.usage_metadata = {
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        return message
+
+    def _delay(self, message: AIMessage) -> float:
+        tokens = message.usage_metadata["output_tokens"]
+        return self.latency_s + (tokens / self.tokens_per_s if self.tokens_per_s else 0.0)
+
+    @staticmethod
+    def _result(message: AIMessage) -> ChatResult:
+        usage = message.usage_metadata
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output={"token_usage": {"prompt_tokens": usage["input_tokens"],
+                                        "completion_tokens": usage["output_tokens"]}},
+        )
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        message = self._reply(messages)
+        time.sleep(self._delay(message))
+        return self._result(message)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        message = self._reply(messages)
+        await asyncio.sleep(self._delay(message))
+        return self._result(message)
+
+    def _chunks(self, message: AIMessage) -> List[AIMessageChunk]:
+        if message.tool_calls or not message.content:
+            chunks = [AIMessageChunk(content=message.content, tool_call_chunks=[
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": i}
+                for i, call in enumerate(message.tool_calls)
+            ])]
+        else:
+            chunks = [AIMessageChunk(content=word) for word in re.findall(r"\S+\s*", str(message.content))]
+        # Usage arrives with the last chunk, as with OpenAI's stream_options={"include_usage": True}
+        chunks[-1].usage_metadata = message.usage_metadata
+        return chunks
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        message = self._reply(messages)
+        chunks = self._chunks(message)
+        per_chunk = (self._delay(message) - self.latency_s) / len(chunks)
+        time.sleep(self.latency_s)
+        for chunk in chunks:
+            time.sleep(per_chunk)
+            if run_manager:
+                run_manager.on_llm_new_token(str(chunk.content), chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        message = self._reply(messages)
+        chunks = self._chunks(message)
+        per_chunk = (self._delay(message) - self.latency_s) / len(chunks)
+        await asyncio.sleep(self.latency_s)
+        for chunk in chunks:
+            await asyncio.sleep(per_chunk)
+            if run_manager:
+                await run_manager.on_llm_new_token(str(chunk.content), chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Deterministic bag-of-words embeddings (feature hashing, L2-normalised).
+
+    Args:
+        size: Vector dimension
+        latency_s: Simulated delay per embed call
+    """
+
+    def __init__(self, size: int = 384, latency_s: float = 0.0):
+        self.size = size
+        self.latency_s = latency_s
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.size
+        for word in _WORD.findall(text.lower()):
+            digest = hashlib.blake2b(word.encode(), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.size
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return self._embed(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        return [self._embed(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        return self._embed(text)
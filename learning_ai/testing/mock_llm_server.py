@@ -0,0 +1,188 @@
+"""
+Local OpenAI-compatible chat server that can be told to throttle.
+
+Used to check the rate limiting and retry behaviour in learning_ai.llm_clients
+without touching a real provider. It answers POST .../chat/completions (both the
+OpenAI "/v1" and Groq "/openai/v1" paths), with or without "stream": true.
+
+Example:
+    with MockLLMServer(fail_first=3, retry_after=0.5) as server:
+        llm = get_chat_model("openai", "mock-model", base_url=server.base_url, api_key="test")
+        llm.invoke("hello")
+        print(server.requests, server.throttled)
+
+Or from a shell:
+    python -m learning_ai.testing.mock_llm_server --port 8765 --fail-every 3
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+class MockLLMServer:
+    """
+    Threaded mock chat-completions server.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free one)
+        fail_first: Answer the first N requests with 429
+        fail_every: After that, answer every Nth request with 429 (0 disables)
+        retry_after: Value of the Retry-After header sent with 429s (seconds)
+        latency: Seconds to sleep before answering successfully
+        reply: Content of every successful completion
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, fail_first: int = 0,
+                 fail_every: int = 0, retry_after: float = 1.0, latency: float = 0.0,
+                 reply: str = "This is a mock completion."):
+        self.fail_first = fail_first
+        self.fail_every = fail_every
+        self.retry_after = retry_after
+        self.latency = latency
+        self.reply = reply
+        self.requests = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _should_throttle(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            n = self.requests
+            throttle = n <= self.fail_first or (
+                self.fail_every and (n - self.fail_first) % self.fail_every == 0
+            )
+            if throttle:
+                self.throttled += 1
+            return bool(throttle)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass  # keep test output quiet
+
+            def _send_json(self, status: int, body: dict, headers: Optional[dict] = None):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                if not self.path.endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+
+                if server._should_throttle():
+                    self._send_json(
+                        429,
+                        {"error": {"message": "Rate limit reached", "type": "requests",
+                                   "code": "rate_limit_exceeded"}},
+                        {"Retry-After": str(server.retry_after)},
+                    )
+                    return
+
+                time.sleep(server.latency)
+                model = request.get("model", "mock-model")
+                prompt_tokens = sum(len(str(m.get("content", ""))) // 4 for m in request.get("messages", []))
+                completion_tokens = max(1, len(server.reply) // 4)
+                if request.get("stream"):
+                    self._stream(model, prompt_tokens, completion_tokens)
+                    return
+                self._send_json(200, {
+                    "id": f"chatcmpl-mock-{server.requests}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": server.reply},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens,
+                    },
+                })
+
+            def _stream(self, model: str, prompt_tokens: int, completion_tokens: int):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                words = server.reply.split(" ")
+                for i, word in enumerate(words):
+                    delta = {"content": word if i == 0 else " " + word}
+                    if i == 0:
+                        delta["role"] = "assistant"
+                    self._event({
+                        "id": f"chatcmpl-mock-{server.requests}", "object": "chat.completion.chunk",
+                        "created": int(time.time()), "model": model,
+                        "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+                    })
+                self._event({
+                    "id": f"chatcmpl-mock-{server.requests}", "object": "chat.completion.chunk",
+                    "created": int(time.time()), "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                              "total_tokens": prompt_tokens + completion_tokens},
+                })
+                self.wfile.write(b"data: [DONE]\n\n")
+
+            def _event(self, body: dict):
+                self.wfile.write(f"data: {json.dumps(body)}\n\n".encode())
+                self.wfile.flush()
+
+        return Handler
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a mock OpenAI-compatible chat server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-first", type=int, default=0)
+    parser.add_argument("--fail-every", type=int, default=0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = MockLLMServer(args.host, args.port, args.fail_first, args.fail_every,
+                           args.retry_after, args.latency)
+    print(f"Mock LLM server listening on {server.base_url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
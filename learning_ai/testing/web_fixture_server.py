@@ -0,0 +1,183 @@
+"""
+Local HTTP server of generated HTML pages with ETag / Last-Modified validators.
+
+Used to exercise learning_ai.web_crawler without the network. Every page has an
+ETag and a Last-Modified header; a request carrying a matching If-None-Match (or,
+without one, an If-Modified-Since not older than the page) gets an empty 304. The
+server counts requests, 304s and the peak number of requests in flight per client
+address, so conditional re-crawls and per-host limits can be checked.
+
+Example:
+    with WebFixtureServer(pages=100, latency=0.02) as server:
+        AsyncWebCrawler(server.urls).load()
+        server.touch(3)                      # page 3 changes: new ETag and Last-Modified
+        AsyncWebCrawler(server.urls).load()  # 99 x 304, one 200
+        print(server.requests, server.not_modified, server.max_in_flight)
+
+Or from a shell:
+    python -m learning_ai.testing.web_fixture_server --port 8766 --pages 500
+"""
+
+import argparse
+import hashlib
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+class WebFixtureServer:
+    """
+    Threaded server for /page/<n> (n < pages) and an index page linking to all of them.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free one)
+        pages: Number of generated pages
+        words: Approximate words of body text per page
+        latency: Seconds to wait before answering each request
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, pages: int = 50, words: int = 400,
+                 latency: float = 0.0):
+        self.pages = pages
+        self.words = words
+        self.latency = latency
+        self.requests = 0
+        self.not_modified = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._versions: Dict[int, int] = {}
+        self._modified: Dict[int, float] = {}
+        self._started = time.time()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def urls(self) -> List[str]:
+        return [f"{self.base_url}/page/{n}" for n in range(self.pages)]
+
+    def touch(self, page: int) -> None:
+        """Change a page's content, so its validators no longer match."""
+        with self._lock:
+            self._versions[page] = self._versions.get(page, 0) + 1
+            # Last-Modified has one-second resolution; make sure it moves forward
+            self._modified[page] = max(time.time(), self._modified.get(page, self._started) + 1)
+
+    def render(self, page: int) -> bytes:
+        version = self._versions.get(page, 0)
+        words = " ".join(f"word{(page * 31 + i) % 997}" for i in range(self.words))
+        return (f"<!doctype html><html><head><title>Page {page}</title>"
+                f"<style>body {{ font-family: sans-serif; }}</style><script>var page = {page};</script></head>"
+                f"<body><nav><a href='/'>Home</a></nav><h1>Page {page} (version {version})</h1>"
+                f"<p>{words}</p><footer>Fixture footer</footer></body></html>").encode()
+
+    def _index(self) -> bytes:
+        links = "".join(f"<li><a href='/page/{n}'>Page {n}</a></li>" for n in range(self.pages))
+        return f"<!doctype html><html><head><title>Index</title></head><body><ul>{links}</ul></body></html>".encode()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, so client connection pooling is exercised
+
+            def log_message(self, format, *args):
+                pass  # keep test output quiet
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    time.sleep(server.latency)
+                    self._answer()
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+            def _answer(self):
+                if self.path == "/":
+                    self._send(200, server._index(), {})
+                    return
+                prefix, _, number = self.path.rpartition("/")
+                if prefix != "/page" or not number.isdigit() or int(number) >= server.pages:
+                    self._send(404, b"Not found", {})
+                    return
+                page = int(number)
+                with server._lock:
+                    body = server.render(page)
+                    modified = int(server._modified.get(page, server._started))
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                validators = {"ETag": etag, "Last-Modified": formatdate(modified, usegmt=True)}
+                if self._not_modified(etag, modified):
+                    with server._lock:
+                        server.not_modified += 1
+                    self._send(304, b"", validators)
+                    return
+                self._send(200, body, validators)
+
+            def _not_modified(self, etag: str, modified: int) -> bool:
+                if_none_match = self.headers.get("If-None-Match")
+                if if_none_match is not None:
+                    # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+                    return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+                if_modified_since = self.headers.get("If-Modified-Since")
+                if if_modified_since:
+                    try:
+                        return modified <= parsedate_to_datetime(if_modified_since).timestamp()
+                    except (TypeError, ValueError):
+                        return False
+                return False
+
+            def _send(self, status: int, body: bytes, headers: dict):
+                self.send_response(status)
+                if status != 304:
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                if status != 304:
+                    self.wfile.write(body)
+
+        return Handler
+
+    def start(self) -> "WebFixtureServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "WebFixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve generated HTML pages with ETag / Last-Modified.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = WebFixtureServer(args.host, args.port, pages=args.pages, latency=args.latency)
+    print(f"Web fixture server listening on {server.base_url}/ ({args.pages} pages)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,248 @@
+"""
+Memoizing wrapper for agent tools.
+
+Agents often call the same tool with the same arguments, both across turns and
+across conversation threads: the same Wikipedia / Arxiv lookup, or `add(10, 14)`.
+memoize_tool() wraps a tool so the result is cached on
+(tool name, canonical arguments), following a per-tool ToolPolicy:
+
+- pure=True: the result depends only on the arguments (math tools), so it is cached
+  until evicted
+- ttl_s=N: the result is cached for N seconds (external lookups whose answer
+  changes slowly)
+- neither: nothing is cached and every call runs (side effects), even when identical
+  calls are in flight
+
+Concurrent calls to a cacheable tool with the same key are collapsed into one
+("singleflight"). The first caller runs the tool and the others wait for its result,
+so ten threads asking Wikipedia the same question make one request. Errors are
+passed to every waiter and are never cached.
+
+The cache is an in-process LRU that every wrapped tool and agent thread shares by
+default (get_tool_cache()). Keys are canonical: argument order doesn't matter, and
+surrounding whitespace in string arguments is ignored.
+
+Example:
+    tools = memoize_tools(build_tools(), {"wikipedia": ToolPolicy(ttl_s=86400)})
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional, Sequence, Tuple, Union
+
+from langchain_core.tools import BaseTool, StructuredTool
+
+
+class ToolPolicy(NamedTuple):
+    pure: bool = False
+    ttl_s: Optional[float] = None
+
+    @property
+    def cacheable(self) -> bool:
+        return self.pure or bool(self.ttl_s)
+
+
+PURE = ToolPolicy(pure=True)
+UNCACHED = ToolPolicy()
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def tool_cache_key(name: str, args: Dict[str, Any]) -> str:
+    payload = json.dumps(_canonical(args), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{name}\x00{payload}".encode()).hexdigest()
+
+
+class _Flight:
+    """One in-progress sync call other threads can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class ToolCache:
+    """
+    Thread-safe LRU of tool results with per-entry expiry, plus singleflight.
+
+    Args:
+        max_entries: Evict least recently used results beyond this
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._aflights: Dict[Tuple[int, str], "asyncio.Future"] = {}
+        self.hits = 0
+        self.misses = 0
+        self.collapsed = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def set(self, key: str, value: Any, policy: ToolPolicy) -> None:
+        if not policy.cacheable:
+            return
+        expires_at = float("inf") if policy.pure else time.monotonic() + policy.ttl_s
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def call(self, key: str, policy: ToolPolicy, fn: Callable[[], Any]) -> Any:
+        """Return the cached result for `key`, or run fn() once for all concurrent callers."""
+        if not policy.cacheable:
+            # Side effects: every call runs, and no caller gets another's result
+            return fn()
+        hit, value = self.get(key)
+        if hit:
+            return value
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+            else:
+                self.collapsed += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = fn()
+            self.set(key, flight.result, policy)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    async def acall(self, key: str, policy: ToolPolicy, fn: Callable[[], Any]) -> Any:
+        """Async call(); duplicates are collapsed per event loop."""
+        if not policy.cacheable:
+            return await fn()
+        hit, value = self.get(key)
+        if hit:
+            return value
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        future = self._aflights.get(flight_key)
+        if future is not None:
+            with self._lock:
+                self.collapsed += 1
+            # shield: a cancelled waiter must not cancel the leader's call
+            return await asyncio.shield(future)
+        future = self._aflights[flight_key] = loop.create_future()
+        with self._lock:
+            self.misses += 1
+        try:
+            result = await fn()
+            self.set(key, result, policy)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved so an unawaited future doesn't log a warning
+            raise
+        finally:
+            self._aflights.pop(flight_key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "collapsed": self.collapsed}
+
+
+_default_cache: Optional[ToolCache] = None
+_default_lock = threading.Lock()
+
+
+def get_tool_cache() -> ToolCache:
+    """Process-wide tool cache shared by every memoized tool unless one is passed explicitly."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ToolCache()
+        return _default_cache
+
+
+class MemoizedTool(BaseTool):
+    """A tool that answers from ToolCache before delegating to the wrapped tool."""
+
+    inner: BaseTool
+    policy: ToolPolicy = UNCACHED
+    cache: ToolCache
+
+    def _run(self, run_manager=None, **kwargs: Any) -> Any:
+        config = {"callbacks": run_manager.get_child()} if run_manager else None
+        return self.cache.call(tool_cache_key(self.name, kwargs), self.policy,
+                               lambda: self.inner.invoke(kwargs, config))
+
+    async def _arun(self, run_manager=None, **kwargs: Any) -> Any:
+        config = {"callbacks": run_manager.get_child()} if run_manager else None
+        return await self.cache.acall(tool_cache_key(self.name, kwargs), self.policy,
+                                      lambda: self.inner.ainvoke(kwargs, config))
+
+
+def memoize_tool(tool: Union[BaseTool, Callable], policy: ToolPolicy = PURE,
+                 cache: Optional[ToolCache] = None) -> BaseTool:
+    """
+    Wrap a tool with result caching and duplicate-call collapsing.
+
+    Args:
+        tool: A BaseTool or a plain function (converted like ToolNode does)
+        policy: Caching policy for this tool
+        cache: Cache to use (defaults to the process-wide get_tool_cache())
+
+    Returns:
+        A BaseTool with the same name, description and argument schema
+    """
+    if not isinstance(tool, BaseTool):
+        tool = StructuredTool.from_function(tool)
+    return MemoizedTool(name=tool.name, description=tool.description, args_schema=tool.args_schema,
+                        inner=tool, policy=policy, cache=cache or get_tool_cache())
+
+
+def memoize_tools(tools: Sequence[Union[BaseTool, Callable]], policies: Dict[str, ToolPolicy],
+                  default: ToolPolicy = UNCACHED, cache: Optional[ToolCache] = None) -> list:
+    """Wrap every tool, taking its policy from `policies` by tool name (else `default`)."""
+    wrapped = []
+    for tool in tools:
+        name = tool.name if isinstance(tool, BaseTool) else tool.__name__
+        wrapped.append(memoize_tool(tool, policies.get(name, default), cache))
+    return wrapped
@@ -0,0 +1,169 @@
+"""
+Vector store backends and a size-based selector.
+
+The examples used FAISS (or Chroma) for every store, including the five pet
+documents. For small corpora, an ANN index adds build cost, an extra native
+dependency and per-query overhead for no benefit. A single float32 matrix product
+over all vectors is exact and faster up to tens of thousands of vectors.
+
+Backends, all LangChain VectorStores (so .as_retriever() and relevance scores work):
+
+- "numpy": NumpyVectorStore, exact cosine search over one contiguous matrix
+- "faiss": langchain_community FAISS (flat index, exact L2)
+- "chroma": langchain_chroma Chroma (in-memory HNSW, approximate)
+
+build_vectorstore(documents, embeddings, backend="auto") picks the backend with
+select_backend(): NumPy up to NUMPY_MAX_VECTORS vectors, FAISS above that if it is
+installed, then Chroma. VECTOR_BACKEND=numpy|faiss|chroma overrides the choice.
+benchmarks/vector_backends.py measures build time, latency at several k, memory and
+recall on synthetic corpora, so the threshold can be re-checked on a given machine.
+"""
+
+import importlib.util
+import os
+import uuid
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+# Up to this many vectors a full matrix product beats building and querying an index
+NUMPY_MAX_VECTORS = 50_000
+
+BACKENDS = ("numpy", "faiss", "chroma")
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Exact cosine-similarity search over a float32 matrix of unit vectors.
+
+    Scores from similarity_search_with_score are cosine similarities (higher is better).
+
+    Args:
+        embedding: Embedding model for texts and queries
+    """
+
+    def __init__(self, embedding: Embeddings):
+        self.embedding = embedding
+        self._documents: List[Document] = []
+        self._ids: List[str] = []
+        self._chunks: List[np.ndarray] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    def _vectors(self) -> np.ndarray:
+        # Added batches are concatenated once, on the first search after an add
+        if self._matrix is None or len(self._matrix) != len(self._documents):
+            self._matrix = np.concatenate(self._chunks) if self._chunks else np.empty((0, 0), dtype=np.float32)
+            self._chunks = [self._matrix] if len(self._matrix) else []
+        return self._matrix
+
+    def add_vectors(self, vectors: Sequence[Sequence[float]], documents: Sequence[Document],
+                    ids: Optional[Sequence[str]] = None) -> List[str]:
+        """Add precomputed embeddings (no embedding call)."""
+        ids = list(ids) if ids is not None else [str(uuid.uuid4()) for _ in documents]
+        self._chunks.append(self._normalize(np.asarray(vectors, dtype=np.float32)))
+        for doc_id, doc in zip(ids, documents):
+            self._documents.append(Document(page_content=doc.page_content, metadata=dict(doc.metadata), id=doc_id))
+        self._ids.extend(ids)
+        return ids
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None,
+                  ids: Optional[List[str]] = None, **kwargs: Any) -> List[str]:
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        documents = [Document(page_content=text, metadata=metadata) for text, metadata in zip(texts, metadatas)]
+        return self.add_vectors(self.embedding.embed_documents(texts), documents, ids)
+
+    def get_by_ids(self, ids: Sequence[str]) -> List[Document]:
+        wanted = set(ids)
+        return [doc for doc in self._documents if doc.id in wanted]
+
+    def similarity_search_with_score_by_vector(self, embedding: List[float], k: int = 4,
+                                               filter: Optional[dict] = None, **kwargs: Any) -> List[Tuple[Document, float]]:
+        matrix = self._vectors()
+        if len(matrix) == 0:
+            return []
+        scores = matrix @ self._normalize(np.asarray(embedding, dtype=np.float32))
+        if filter:
+            allowed = np.fromiter((all(doc.metadata.get(key) == value for key, value in filter.items())
+                                   for doc in self._documents), dtype=bool, count=len(self._documents))
+            scores = np.where(allowed, scores, -np.inf)
+        k = min(k, len(scores))
+        # argpartition finds the top k in O(n); only those k are sorted
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._documents[i], float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k, **kwargs)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k, **kwargs)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        return lambda score: (score + 1.0) / 2.0  # cosine [-1, 1] -> [0, 1]
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embedding: Embeddings, metadatas: Optional[List[dict]] = None,
+                   ids: Optional[List[str]] = None, **kwargs: Any) -> "NumpyVectorStore":
+        store = cls(embedding)
+        store.add_texts(texts, metadatas, ids)
+        return store
+
+
+def available_backends() -> List[str]:
+    modules = {"numpy": "numpy", "faiss": "faiss", "chroma": "langchain_chroma"}
+    return [name for name in BACKENDS if importlib.util.find_spec(modules[name]) is not None]
+
+
+def select_backend(num_vectors: int) -> str:
+    """Backend for a corpus of `num_vectors` (VECTOR_BACKEND overrides)."""
+    forced = os.getenv("VECTOR_BACKEND")
+    if forced:
+        if forced not in BACKENDS:
+            raise ValueError(f"VECTOR_BACKEND must be one of {', '.join(BACKENDS)}, not {forced!r}")
+        return forced
+    if num_vectors <= NUMPY_MAX_VECTORS:
+        return "numpy"
+    installed = available_backends()
+    for backend in ("faiss", "chroma"):
+        if backend in installed:
+            return backend
+    return "numpy"
+
+
+def build_vectorstore(documents: Sequence[Document], embeddings: Embeddings, backend: str = "auto") -> VectorStore:
+    """
+    Index documents with the given (or auto-selected) backend.
+
+    Args:
+        documents: Documents to embed and index
+        embeddings: Embedding model
+        backend: "auto", "numpy", "faiss" or "chroma"
+    """
+    if backend == "auto":
+        backend = select_backend(len(documents))
+    if backend == "numpy":
+        return NumpyVectorStore.from_documents(list(documents), embeddings)
+    if backend == "faiss":
+        from langchain_community.vectorstores import FAISS
+        return FAISS.from_documents(list(documents), embeddings)
+    if backend == "chroma":
+        from langchain_chroma import Chroma
+        # A fresh in-memory collection per store, so stores never share state
+        return Chroma.from_documents(list(documents), embeddings, collection_name=f"store-{uuid.uuid4().hex}")
+    raise ValueError(f"Unknown vector backend {backend!r}; expected auto or one of {', '.join(BACKENDS)}")
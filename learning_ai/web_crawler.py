@@ -0,0 +1,347 @@
+"""
+Concurrent web page loader with connection pooling, conditional GETs and an on-disk cache.
+
+WebBaseLoader fetches URLs one at a time over a fresh connection each, re-downloads
+pages that haven't changed, and parses them with BeautifulSoup on the event-loop
+thread. AsyncWebCrawler is a drop-in LangChain loader that instead:
+
+- fetches all URLs concurrently over one pooled aiohttp session (keep-alive), capped
+  at `concurrency` requests overall and `per_host` per host
+- stores every 200 response (body plus ETag / Last-Modified) under
+  ~/.cache/learning_ai/http (WEB_CACHE_DIR overrides), and re-fetches with
+  If-None-Match / If-Modified-Since, so a re-crawl of unchanged pages is a run of
+  empty 304s served from the cache; pages fetched less than `max_age_s` ago are not
+  requested at all
+- turns HTML into text with lxml in a process pool, off the event loop (BeautifulSoup's
+  html.parser when lxml isn't installed)
+
+Documents carry "source", "title", "status" (200 or 304) and "cached" metadata, like
+WebBaseLoader's "source" / "title". crawler.stats counts the outcomes.
+
+Example:
+    docs = AsyncWebCrawler(urls, per_host=4).load()
+
+learning_ai/testing/web_fixture_server.py serves pages with validators for offline runs:
+
+    python -m learning_ai.web_crawler --fixture 200
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents import Document
+
+logger = logging.getLogger("learning_ai.web_crawler")
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "learning_ai" / "http"
+DEFAULT_USER_AGENT = "Neel_Learn/1.0.0"
+
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+def html_to_text(html: bytes, encoding: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Title and visible text of an HTML page (scripts, styles and comments removed).
+
+    A module-level function so it can run in a process pool.
+    """
+    try:
+        import lxml.html
+    except ImportError:
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, "html.parser", from_encoding=encoding)
+        for element in soup(["script", "style", "noscript", "template"]):
+            element.decompose()
+        title = soup.title.get_text(strip=True) if soup.title else ""
+        return title, _tidy(soup.get_text("\n"))
+
+    parser = lxml.html.HTMLParser(encoding=encoding, remove_comments=True)
+    root = lxml.html.fromstring(html, parser=parser) if html.strip() else None
+    if root is None:
+        return "", ""
+    for element in root.xpath("//script | //style | //noscript | //template"):
+        element.drop_tree()
+    title = root.findtext(".//title") or ""
+    return title.strip(), _tidy("\n".join(root.itertext()))
+
+
+def _tidy(text: str) -> str:
+    lines = (_SPACES.sub(" ", line).strip() for line in text.splitlines())
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+class CachedResponse(NamedTuple):
+    url: str
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    encoding: Optional[str]
+    fetched_at: float
+
+
+class HttpCache:
+    """
+    Raw response bodies and their validators on disk, one pair of files per URL.
+
+    Args:
+        cache_dir: Directory (defaults to WEB_CACHE_DIR or ~/.cache/learning_ai/http)
+    """
+
+    def __init__(self, cache_dir: Optional[os.PathLike] = None):
+        self.cache_dir = Path(cache_dir or os.getenv("WEB_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        digest = hashlib.sha256(url.encode()).hexdigest()
+        directory = self.cache_dir / digest[:2]
+        return directory / f"{digest}.json", directory / f"{digest}.body"
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text())
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        return CachedResponse(url, body, meta.get("etag"), meta.get("last_modified"), meta.get("encoding"),
+                              meta.get("fetched_at", 0.0))
+
+    def put(self, response: CachedResponse) -> None:
+        meta_path, body_path = self._paths(response.url)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {"url": response.url, "etag": response.etag, "last_modified": response.last_modified,
+                "encoding": response.encoding, "fetched_at": response.fetched_at}
+        # Body first, metadata last (both via rename): a reader never sees new metadata with an old body
+        for path, data in ((body_path, response.body), (meta_path, json.dumps(meta).encode())):
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+
+    def touch(self, response: CachedResponse) -> None:
+        """Record a successful revalidation (304) without rewriting the body."""
+        meta_path, _ = self._paths(response.url)
+        meta = {"url": response.url, "etag": response.etag, "last_modified": response.last_modified,
+                "encoding": response.encoding, "fetched_at": time.time()}
+        tmp = meta_path.with_name(f"{meta_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, meta_path)
+
+
+class FetchResult(NamedTuple):
+    url: str
+    status: Optional[int]
+    """200, 304 (revalidated from the cache), 0 (fresh cache hit, not requested) or the error status."""
+    body: Optional[bytes]
+    encoding: Optional[str]
+    error: Optional[str]
+
+
+class AsyncWebCrawler(BaseLoader):
+    """
+    Load many URLs concurrently, revalidating cached copies with conditional GETs.
+
+    Args:
+        urls: Pages to load
+        concurrency: Requests in flight overall (the connection pool size)
+        per_host: Requests in flight per host
+        timeout_s: Total time allowed per request
+        max_age_s: Serve cached pages younger than this without any request (0 always revalidates)
+        cache_dir: Response cache location; False disables caching
+        parse_workers: Processes parsing HTML (None: one per CPU, at most one per URL; 0 parses on
+            threads instead)
+        headers: Extra request headers (User-Agent defaults to USER_AGENT)
+        raise_for_errors: Raise on the first failed URL instead of logging and skipping it
+    """
+
+    def __init__(self, urls: Sequence[str], concurrency: int = 32, per_host: int = 4, timeout_s: float = 30.0,
+                 max_age_s: float = 0.0, cache_dir=None, parse_workers: Optional[int] = None,
+                 headers: Optional[Dict[str, str]] = None, raise_for_errors: bool = False):
+        self.urls = list(dict.fromkeys(urls))
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout_s = timeout_s
+        self.max_age_s = max_age_s
+        self.cache = None if cache_dir is False else HttpCache(cache_dir)
+        self.parse_workers = parse_workers
+        self.headers = {"User-Agent": os.getenv("USER_AGENT", DEFAULT_USER_AGENT), **(headers or {})}
+        self.raise_for_errors = raise_for_errors
+        self.stats = {"fetched": 0, "not_modified": 0, "fresh": 0, "errors": 0, "bytes": 0}
+
+    async def _fetch(self, session, url: str) -> FetchResult:
+        import aiohttp
+
+        cached = await asyncio.to_thread(self.cache.get, url) if self.cache else None
+        if cached is not None and self.max_age_s and time.time() - cached.fetched_at < self.max_age_s:
+            self.stats["fresh"] += 1
+            return FetchResult(url, 0, cached.body, cached.encoding, None)
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        try:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304 and cached is not None:
+                    self.stats["not_modified"] += 1
+                    await asyncio.to_thread(self.cache.touch, cached)
+                    return FetchResult(url, 304, cached.body, cached.encoding, None)
+                if response.status != 200:
+                    raise aiohttp.ClientResponseError(response.request_info, response.history,
+                                                      status=response.status, message=response.reason or "")
+                body = await response.read()
+                encoding = response.charset
+                self.stats["fetched"] += 1
+                self.stats["bytes"] += len(body)
+                if self.cache is not None:
+                    await asyncio.to_thread(self.cache.put, CachedResponse(
+                        url, body, response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                        encoding, time.time()))
+                return FetchResult(url, 200, body, encoding, None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if self.raise_for_errors:
+                raise
+            self.stats["errors"] += 1
+            logger.warning("failed to fetch %s: %s", url, e)
+            return FetchResult(url, getattr(e, "status", None), None, None, f"{type(e).__name__}: {e}")
+
+    async def afetch_all(self) -> AsyncIterator[FetchResult]:
+        """Fetch every URL, yielding results as they complete."""
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host)
+        timeout = aiohttp.ClientTimeout(total=self.timeout_s)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=self.headers) as session:
+            tasks = [asyncio.ensure_future(self._fetch(session, url)) for url in self.urls]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    async def alazy_load(self) -> AsyncIterator[Document]:
+        loop = asyncio.get_running_loop()
+        workers = self.parse_workers or min(os.cpu_count() or 1, max(len(self.urls), 1))
+        pool = ProcessPoolExecutor(workers) if self.parse_workers != 0 else None
+        try:
+            pending: Deque[Tuple[FetchResult, asyncio.Future]] = deque()
+            async for result in self.afetch_all():
+                if result.body is None:
+                    continue
+                pending.append((result, loop.run_in_executor(pool, html_to_text, result.body, result.encoding)))
+                # Yield whatever has been parsed so far, keeping fetches and parsing overlapped
+                while pending and pending[0][1].done():
+                    done, parsed = pending.popleft()
+                    yield self._document(done, parsed.result())
+            for result, parsed in pending:
+                yield self._document(result, await parsed)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _document(result: FetchResult, parsed: Tuple[str, str]) -> Document:
+        title, text = parsed
+        return Document(page_content=text, metadata={"source": result.url, "title": title,
+                                                     "status": result.status, "cached": result.status != 200})
+
+    def lazy_load(self) -> Iterator[Document]:
+        """
+        Crawl from sync code, yielding documents in completion order as they are parsed.
+
+        The crawl runs on its own event loop in a worker thread, so this also works when
+        the caller is already inside a running loop (notebooks, async applications).
+        """
+        documents: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        stop = threading.Event()
+
+        async def produce():
+            async for doc in self.alazy_load():
+                documents.put(("doc", doc))
+                if stop.is_set():
+                    break
+
+        def run():
+            try:
+                asyncio.run(produce())
+                documents.put(("done", None))
+            except BaseException as e:
+                documents.put(("error", e))
+
+        worker = threading.Thread(target=run, name="web-crawler", daemon=True)
+        worker.start()
+        try:
+            while True:
+                kind, value = documents.get()
+                if kind == "doc":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    return
+        finally:
+            # The consumer stopped early (or failed): let the crawl wind down after its current document
+            stop.set()
+
+    def load(self) -> List[Document]:
+        """Crawl synchronously; documents come back in completion order."""
+        return list(self.lazy_load())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m learning_ai.web_crawler",
+                                     description="Crawl URLs concurrently with conditional re-fetches.")
+    parser.add_argument("urls", nargs="*")
+    parser.add_argument("--fixture", type=int, metavar="PAGES",
+                        help="Crawl a local fixture server with this many pages twice (second run: 304s)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--per-host", type=int, default=4)
+    parser.add_argument("--cache-dir")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+
+    def crawl(urls, cache_dir):
+        crawler = AsyncWebCrawler(urls, concurrency=args.concurrency, per_host=args.per_host, cache_dir=cache_dir)
+        started = time.perf_counter()
+        documents = crawler.load()
+        print(f"{len(documents)} documents in {time.perf_counter() - started:.2f}s: {crawler.stats}")
+        return documents
+
+    if args.fixture:
+        import tempfile
+
+        from learning_ai.testing.web_fixture_server import WebFixtureServer
+
+        with tempfile.TemporaryDirectory() as cache_dir, WebFixtureServer(pages=args.fixture, latency=0.02) as server:
+            crawl(server.urls, args.cache_dir or cache_dir)
+            server.touch(0)
+            crawl(server.urls, args.cache_dir or cache_dir)
+            print(f"server: {server.requests} requests, {server.not_modified} x 304, "
+                  f"at most {server.max_in_flight} in flight")
+        return 0
+    if not args.urls:
+        parser.error("give URLs to crawl or --fixture PAGES")
+    for doc in crawl(args.urls, args.cache_dir):
+        print(doc.metadata["status"], doc.metadata["source"], doc.metadata["title"][:60])
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())